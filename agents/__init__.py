@@ -1,5 +1,6 @@
 """Agents module."""
 from .coding_agent import CodingAgent
+from .memory import ConversationMemory
 from .planner import TaskPlanner, Plan, Task, TaskStatus, planner
 from .error_fixer import (
     AutoErrorFixer,
@@ -22,6 +23,7 @@ from .prompts import *
 
 __all__ = [
     "CodingAgent",
+    "ConversationMemory",
     "TaskPlanner",
     "Plan",
     "Task",
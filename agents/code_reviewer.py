@@ -58,7 +58,8 @@ class CodeReviewer:
         self,
         file_path: str,
         code: Optional[str] = None,
-        focus: Optional[List[str]] = None
+        focus: Optional[List[str]] = None,
+        task: str = "review"
     ) -> CodeReview:
         """코드 리뷰
 
@@ -66,6 +67,7 @@ class CodeReviewer:
             file_path: 파일 경로
             code: 코드 내용 (None이면 파일에서 읽음)
             focus: 집중 검토 항목 (예: ["security", "performance"])
+            task: 모델 라우팅용 작업 태그 (예: "quick_review"는 빠른 모델 사용)
 
         Returns:
             CodeReview: 리뷰 결과
@@ -75,24 +77,73 @@ class CodeReviewer:
             with open(file_path, 'r') as f:
                 code = f.read()
 
-        # 리뷰 프롬프트 생성
-        prompt = self._build_review_prompt(code, focus)
-
         # LLM 호출
-        from llm.models import Message
-
-        messages = [
-            Message(role="system", content=self._get_system_prompt()),
-            Message(role="user", content=prompt)
-        ]
-
-        response = await self.llm.generate(messages)
+        messages = self._build_review_messages(code, focus)
+        response = await self.llm.generate(messages, task=task)
 
         # 응답 파싱
         review = self._parse_review_response(response.content, file_path)
 
         return review
 
+    async def review_files(
+        self,
+        file_paths: List[str],
+        focus: Optional[List[str]] = None,
+        concurrency: int = 4,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """여러 파일 병렬 리뷰
+
+        LLMManager.generate_many로 파일들을 동시에 리뷰합니다.
+        실패한 파일은 전체를 중단하지 않고 errors에 기록됩니다.
+
+        Args:
+            file_paths: 리뷰할 파일 경로 목록
+            focus: 집중 검토 항목
+            concurrency: 동시 LLM 요청 수
+            timeout: 전체 제한 시간 (초)
+
+        Returns:
+            {"reviews": {경로: CodeReview}, "errors": {경로: 에러 메시지}}
+        """
+        reviews: Dict[str, CodeReview] = {}
+        errors: Dict[str, str] = {}
+
+        # 코드 읽기
+        targets = []
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    targets.append((file_path, f.read()))
+            except Exception as e:
+                errors[file_path] = str(e)
+
+        message_lists = [self._build_review_messages(code, focus) for _, code in targets]
+        responses = await self.llm.generate_many(
+            message_lists,
+            concurrency=concurrency,
+            timeout=timeout,
+            task="review"
+        )
+
+        for (file_path, _), response in zip(targets, responses):
+            if isinstance(response, Exception):
+                errors[file_path] = str(response) or type(response).__name__
+            else:
+                reviews[file_path] = self._parse_review_response(response.content, file_path)
+
+        return {"reviews": reviews, "errors": errors}
+
+    def _build_review_messages(self, code: str, focus: Optional[List[str]] = None) -> list:
+        """리뷰 요청 메시지 생성"""
+        from llm import Message
+
+        return [
+            Message(role="system", content=self._get_system_prompt()),
+            Message(role="user", content=self._build_review_prompt(code, focus))
+        ]
+
     def _get_system_prompt(self) -> str:
         """시스템 프롬프트"""
         return """당신은 전문 코드 리뷰어입니다.
@@ -349,14 +400,14 @@ class CodeReviewer:
 간결하게 답변해주세요.
 """
 
-        from llm.models import Message
+        from llm import Message
 
         messages = [
             Message(role="system", content="당신은 코드 리뷰어입니다. 변경사항을 빠르게 검토합니다."),
             Message(role="user", content=prompt)
         ]
 
-        response = await self.llm.generate(messages)
+        response = await self.llm.generate(messages, task="diff_review")
 
         return {
             "diff": diff_text,
@@ -400,14 +451,14 @@ class CodeReviewer:
    **효과**: [개선 효과]
 """
 
-        from llm.models import Message
+        from llm import Message
 
         messages = [
             Message(role="system", content="당신은 코드 개선 전문가입니다."),
             Message(role="user", content=prompt)
         ]
 
-        response = await self.llm.generate(messages)
+        response = await self.llm.generate(messages, task="review")
 
         # 개선 제안 파싱
         suggestions = []
@@ -435,5 +486,5 @@ async def review_file(file_path: str, llm_manager, **kwargs) -> CodeReview:
 async def quick_review(code: str, llm_manager) -> str:
     """편의 함수: 빠른 리뷰"""
     reviewer = CodeReviewer(llm_manager)
-    review = await reviewer.review_code("temp.py", code)
+    review = await reviewer.review_code("temp.py", code, task="quick_review")
     return review.summary
@@ -1,13 +1,19 @@
 """Main coding agent implementation."""
+import asyncio
 import os
 from typing import List, Dict, Optional, AsyncGenerator
 from pathlib import Path
 
+from config import settings
 from llm import LLMManager, Message
-from tools import FileAnalyzer, CodebaseParser, CodeExecutor
+from tools import FileAnalyzer, CodebaseParser, CodeExecutor, GitOperations
+from utils.context_budget import ContextBudgeter
+from utils.request_context import RequestContext, run_in_context
+from .memory import ConversationMemory
 from .prompts import (
     SYSTEM_PROMPT,
     USER_PROMPT_TEMPLATE,
+    PROJECT_CONTEXT_TEMPLATE,
     CONTEXT_TEMPLATE,
     ANALYSIS_PROMPT,
 )
@@ -36,8 +42,18 @@ class CodingAgent:
         self.code_executor = CodeExecutor()
         self.retriever = Retriever() if Retriever is not None else None
 
-        self.conversation_history: List[Message] = []
+        self.memory = ConversationMemory(
+            self.llm_manager,
+            max_recent_turns=settings.memory_recent_turns,
+            summary_max_tokens=settings.memory_summary_tokens,
+        )
         self.project_path = Path(project_path) if project_path else Path.cwd()
+        # Commit messages are written by the LLM (routed to the fast tier)
+        self.git_ops = GitOperations(str(self.project_path), llm_manager=self.llm_manager)
+
+        # Stable project context, sent as a cacheable prefix on every turn
+        self.project_info: Optional[str] = None
+        self.repo_summary: Optional[str] = None
 
     async def process_message(
         self,
@@ -46,69 +62,117 @@ class CodingAgent:
         use_rag: bool = True,
         use_web: bool = False,
         analyze_project: bool = False,
+        request_context: Optional[RequestContext] = None,
     ) -> AsyncGenerator[str, None]:
-        """Process a user message and generate a response."""
+        """Process a user message and generate a response.
+
+        With a ``request_context`` every stage (file search, RAG, web search,
+        LLM stream) stops at cancellation or the deadline by raising
+        RequestAborted; the turn is then not added to memory.
+        """
 
         # Build context
         context_parts = {}
 
-        # Project info if requested
-        if analyze_project:
-            project_info = await self._get_project_info()
-            context_parts["project_info"] = project_info
-        else:
-            context_parts["project_info"] = ""
+        # Project info if requested (kept for later turns so the prefix stays stable)
+        if analyze_project and self.project_info is None:
+            self.project_info = await self._get_project_info(request_context)
 
         # Get relevant files based on message
-        relevant_files = await self._get_relevant_files(user_message)
+        relevant_files = await self._get_relevant_files(user_message, request_context=request_context)
         context_parts["relevant_files"] = relevant_files
 
-        # RAG context
+        # RAG context (off the event loop: embedding, the first BM25 build and reranking block)
         if use_rag and self.retriever is not None:
-            rag_context = self.retriever.get_context(user_message, n_results=3)
+            rag_context = await run_in_context(request_context, asyncio.to_thread(
+                self.retriever.get_context, user_message, n_results=3, request_context=request_context
+            ))
             context_parts["rag_context"] = rag_context if rag_context else "No relevant documentation found."
         else:
             context_parts["rag_context"] = ""
 
         # Web search if requested
         if use_web and self.web_search is not None:
-            web_results = await self._web_search(user_message)
+            web_results = await self._web_search(user_message, request_context)
             context_parts["web_results"] = web_results
         else:
             context_parts["web_results"] = ""
 
+        # Stable prefix first (system prompt, project context), volatile context last
+        prefix = self._build_prefix_messages()
+
+        # Fit history and context sections into the model's context window
+        budgeter = ContextBudgeter.for_provider(self.llm_manager.get_current_provider())
+        prompt_skeleton = USER_PROMPT_TEMPLATE.format(
+            user_message=user_message,
+            context=CONTEXT_TEMPLATE.format(**{name: "" for name in context_parts})
+        )
+        plan = budgeter.allocate(
+            fixed=[msg.content for msg in prefix] + [prompt_skeleton],
+            sections=context_parts,
+            history=self.conversation_history
+        )
+
         # Build full context
-        context = CONTEXT_TEMPLATE.format(**context_parts)
+        context = CONTEXT_TEMPLATE.format(**plan.sections)
 
         # Create messages
-        system_message = Message(role="system", content=SYSTEM_PROMPT)
         user_prompt = USER_PROMPT_TEMPLATE.format(
             user_message=user_message,
             context=context
         )
 
-        messages = [system_message] + self.conversation_history + [
+        history = list(plan.history)
+        if history:
+            # Earlier turns are unchanged between requests; cache up to the last one
+            history[-1] = history[-1].model_copy(update={"cache": True})
+
+        messages = prefix + history + [
             Message(role="user", content=user_prompt)
         ]
 
         # Generate response
         if stream:
-            async for chunk in self.llm_manager.stream_generate(messages):
+            chunks = []
+            async for chunk in self.llm_manager.stream_generate(
+                messages, priority="interactive", task="chat", request_context=request_context
+            ):
+                chunks.append(chunk)
                 yield chunk
 
-            # Store in history (we need to accumulate the streamed response)
-            # For simplicity, we'll just store the user message
-            self.conversation_history.append(Message(role="user", content=user_message))
+            self.memory.add_turn(user_message, "".join(chunks))
         else:
-            response = await self.llm_manager.generate(messages)
-            self.conversation_history.append(Message(role="user", content=user_message))
-            self.conversation_history.append(Message(role="assistant", content=response.content))
+            response = await self.llm_manager.generate(
+                messages, priority="interactive", task="chat", request_context=request_context
+            )
+            self.memory.add_turn(user_message, response.content)
             yield response.content
 
-    async def _get_project_info(self) -> str:
+    @property
+    def conversation_history(self) -> List[Message]:
+        """Conversation context: rolling summary plus the most recent turns."""
+        return self.memory.get_messages()
+
+    def _build_prefix_messages(self) -> List[Message]:
+        """Build the stable, cacheable leading messages for a request."""
+        messages = [Message(role="system", content=SYSTEM_PROMPT, cache=True)]
+
+        if self.project_info or self.repo_summary:
+            messages.append(Message(
+                role="system",
+                content=PROJECT_CONTEXT_TEMPLATE.format(
+                    project_info=self.project_info or "Not analyzed.",
+                    repo_summary=self.repo_summary or "Not available."
+                ),
+                cache=True
+            ))
+
+        return messages
+
+    async def _get_project_info(self, request_context: Optional[RequestContext] = None) -> str:
         """Get project information and structure."""
         try:
-            stats = await self.file_analyzer.analyze_codebase()
+            stats = await self.file_analyzer.analyze_codebase(request_context=request_context)
             structure = await self.file_analyzer.get_file_structure(max_depth=2)
 
             info = f"""Project Statistics:
@@ -124,11 +188,18 @@ File breakdown by extension:
         except Exception as e:
             return f"Error analyzing project: {e}"
 
-    async def _get_relevant_files(self, query: str, max_files: int = 5) -> str:
+    async def _get_relevant_files(
+        self,
+        query: str,
+        max_files: int = 5,
+        request_context: Optional[RequestContext] = None
+    ) -> str:
         """Get relevant files based on query."""
         try:
             # Search for files mentioning keywords from query
-            results = await self.file_analyzer.search_in_files(query, case_sensitive=False)
+            results = await self.file_analyzer.search_in_files(
+                query, case_sensitive=False, request_context=request_context
+            )
 
             if not results:
                 return "No directly relevant files found."
@@ -143,10 +214,10 @@ File breakdown by extension:
         except Exception as e:
             return f"Error searching files: {e}"
 
-    async def _web_search(self, query: str) -> str:
+    async def _web_search(self, query: str, request_context: Optional[RequestContext] = None) -> str:
         """Perform web search and return formatted results."""
         try:
-            results = await self.web_search.search_documentation(query)
+            results = await self.web_search.search_documentation(query, request_context=request_context)
 
             if not results:
                 return "No web search results found."
@@ -169,15 +240,18 @@ File breakdown by extension:
     async def analyze_project(self) -> str:
         """Analyze the entire project."""
         messages = [
-            Message(role="system", content=SYSTEM_PROMPT),
+            Message(role="system", content=SYSTEM_PROMPT, cache=True),
             Message(role="user", content=ANALYSIS_PROMPT)
         ]
 
         # Get project context
-        project_info = await self._get_project_info()
-        messages.append(Message(role="user", content=f"Project Info:\n{project_info}"))
+        self.project_info = await self._get_project_info()
+        messages.append(Message(role="user", content=f"Project Info:\n{self.project_info}"))
 
-        response = await self.llm_manager.generate(messages)
+        response = await self.llm_manager.generate(messages, priority="interactive", task="analysis")
+
+        # Reuse the summary as stable context for later turns
+        self.repo_summary = response.content
         return response.content
 
     async def execute_code(self, code: str, language: str) -> Dict:
@@ -188,9 +262,20 @@ File breakdown by extension:
         """Add a document to RAG knowledge base."""
         return await self.retriever.add_document(file_path)
 
+    async def add_documents_to_rag(self, file_paths: List[str], progress=None, sources=None) -> Dict:
+        """Add documents to RAG knowledge base in parallel; progress is called per file.
+
+        ``sources`` maps a path to the name it is indexed under (default: the path).
+        """
+        return await self.retriever.ingest(file_paths, progress=progress, sources=sources)
+
+    async def sync_directory_to_rag(self, path: str, progress=None) -> Dict:
+        """Index new and changed files in a directory and drop deleted ones."""
+        return await self.retriever.sync_directory(path, progress=progress)
+
     async def search_rag(self, query: str, n_results: int = 5) -> List[Dict]:
         """Search RAG knowledge base."""
-        return self.retriever.retrieve(query, n_results)
+        return await asyncio.to_thread(self.retriever.retrieve, query, n_results)
 
     def switch_llm(self, provider: str) -> str:
         """Switch LLM provider."""
@@ -206,7 +291,7 @@ File breakdown by extension:
 
     def clear_conversation(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        self.memory.clear()
 
     def get_rag_stats(self) -> Dict:
         """Get RAG statistics."""
@@ -6,7 +6,7 @@ Python 코드 실행 중 발생하는 에러를 자동으로 분석하고 수정
 import re
 import traceback
 import subprocess
-from typing import Dict, Optional, List, Any
+from typing import Callable, Dict, Optional, List, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -172,16 +172,106 @@ class AutoErrorFixer:
 
         return prompt
 
-    async def generate_fix(self, error_info: ErrorInfo, code: str) -> Dict[str, Any]:
+    async def generate_fix(
+        self,
+        error_info: ErrorInfo,
+        code: str,
+        validator: Optional[Callable[[str], Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """LLM을 사용하여 수정 방법 생성
 
+        LLM 관리자가 스트리밍을 지원하면 응답을 스트리밍으로 받아, 수정된 코드
+        블록이 닫히는 즉시 validator로 검증합니다. 문법 오류가 있으면 나머지
+        응답을 기다리지 않고 스트림을 중단합니다.
+
         Args:
             error_info: 에러 정보
             code: 원본 코드
+            validator: 수정된 코드 검증 함수 (예: CodeExecutor.validate_code)
+
+        Returns:
+            수정 제안 (원인, 방법, 수정된 코드, 추가 작업, 검증 결과)
+        """
+        messages = self._build_fix_messages(error_info, code)
+
+        if not hasattr(self.llm, "stream_generate"):
+            response = await self.llm.generate(messages, **self._routing_options())
+            fix = self._parse_fix_response(response.content)
+            if validator and fix["fixed_code"]:
+                fix["validation"] = validator(fix["fixed_code"])
+            return fix
+
+        from utils.markdown_stream import CodeBlock, MarkdownStreamParser
+
+        parser = MarkdownStreamParser()
+        chunks = []
+        validation = None
+        stream = self.llm.stream_generate(messages, **self._routing_options())
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                for event in parser.feed(chunk):
+                    if (
+                        validator
+                        and validation is None
+                        and isinstance(event, CodeBlock)
+                        and "수정된 코드" in (event.section or "")
+                    ):
+                        validation = validator(event.code)
+                if validation is not None and not validation["valid"]:
+                    print(f"   ⚠️  수정 코드 문법 오류, 응답 중단: {validation['error']}")
+                    break
+        finally:
+            await stream.aclose()
+
+        # 응답 파싱
+        fix = self._parse_fix_response("".join(chunks))
+        if validator and validation is None and fix["fixed_code"]:
+            validation = validator(fix["fixed_code"])
+        if validation is not None:
+            fix["validation"] = validation
+        return fix
+
+    async def generate_fixes(
+        self,
+        items: List[Tuple[ErrorInfo, str]],
+        concurrency: int = 4,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """여러 에러의 수정 방법을 병렬로 생성
+
+        Args:
+            items: (에러 정보, 원본 코드) 목록
+            concurrency: 동시 LLM 요청 수
+            timeout: 전체 제한 시간 (초)
 
         Returns:
-            수정 제안 (원인, 방법, 수정된 코드, 추가 작업)
+            입력 순서대로 수정 제안 목록 (실패한 항목은 {"error": 메시지})
         """
+        message_lists = [self._build_fix_messages(info, code) for info, code in items]
+        responses = await self.llm.generate_many(
+            message_lists,
+            concurrency=concurrency,
+            timeout=timeout,
+            **self._routing_options()
+        )
+
+        fixes = []
+        for response in responses:
+            if isinstance(response, Exception):
+                fixes.append({"error": str(response) or type(response).__name__})
+            else:
+                fixes.append(self._parse_fix_response(response.content))
+        return fixes
+
+    def _routing_options(self) -> Dict[str, str]:
+        """LLMManager에만 붙이는 라우팅 태그 (다른 LLM은 generate(messages)만 받음)"""
+        from llm import LLMManager
+
+        return {"task": "error_fix"} if isinstance(self.llm, LLMManager) else {}
+
+    def _build_fix_messages(self, error_info: ErrorInfo, code: str) -> list:
+        """수정 요청 메시지 생성"""
         from llm import Message
 
         # 시스템 프롬프트
@@ -203,16 +293,13 @@ class AutoErrorFixer:
         # 사용자 프롬프트
         user_prompt = self._build_fix_prompt(error_info, code)
 
-        # LLM 호출
+        # 메시지 구성
         messages = [
             Message(role="system", content=system_prompt),
             Message(role="user", content=user_prompt)
         ]
 
-        response = await self.llm.generate(messages)
-
-        # 응답 파싱
-        return self._parse_fix_response(response.content)
+        return messages
 
     def _parse_fix_response(self, response: str) -> Dict[str, Any]:
         """LLM 응답에서 수정 정보 추출"""
@@ -415,7 +502,10 @@ class AutoErrorFixer:
 
             # 2. 수정 방법 생성
             print(f"\n2️⃣ 수정 방법 생성 중...")
-            fix_suggestion = await self.generate_fix(error_info, code)
+            validator = None
+            if hasattr(executor, "validate_code"):
+                validator = lambda fixed: executor.validate_code(fixed, "python")
+            fix_suggestion = await self.generate_fix(error_info, code, validator=validator)
 
             print(f"   💡 원인: {fix_suggestion['cause'][:100]}...")
             print(f"   🔧 방법: {fix_suggestion['method'][:100]}...")
@@ -429,6 +519,17 @@ class AutoErrorFixer:
                 })
                 continue
 
+            # 문법 오류가 있는 수정안은 적용하지 않음
+            validation = fix_suggestion.get("validation")
+            if validation and not validation["valid"]:
+                print(f"   ❌ 수정 코드 문법 오류: {validation['error']}")
+                attempt_history.append({
+                    "attempt": attempt + 1,
+                    "error": f"Syntax error in fixed code: {validation['error']}",
+                    "success": False
+                })
+                continue
+
             # 3. 수정 적용
             print(f"\n3️⃣ 수정 적용 중...")
             apply_result = await self.apply_fix(
@@ -0,0 +1,147 @@
+"""Bounded conversation memory with a rolling summary."""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from llm import LLMManager, Message
+from utils.tokenizer import count_tokens, get_tokenizer
+from .prompts import SUMMARY_PROMPT
+
+
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+
+
+class ConversationMemory:
+    """Keep the last N turns verbatim and fold older turns into a summary.
+
+    Turns that fall out of the recent window are summarized in the
+    background, incrementally (the existing summary plus the new turns), and
+    the summary is kept within ``summary_max_tokens``. Until a fold finishes
+    the evicted turns are still returned verbatim, so nothing is lost while
+    the summary catches up.
+    """
+
+    def __init__(
+        self,
+        llm_manager: Optional[LLMManager] = None,
+        max_recent_turns: int = 6,
+        summary_max_tokens: int = 1000,
+    ):
+        self.llm_manager = llm_manager
+        self.max_recent_turns = max_recent_turns
+        self.summary_max_tokens = summary_max_tokens
+
+        self.summary = ""
+        self.recent: List[Message] = []
+        self._pending: List[Message] = []
+        self._summary_task: Optional[asyncio.Task] = None
+
+    def add(self, role: str, content: str) -> None:
+        """Append a message and fold turns beyond the recent window."""
+        self.recent.append(Message(role=role, content=content))
+
+        # A turn is a user message plus the assistant reply
+        overflow = len(self.recent) - self.max_recent_turns * 2
+        if overflow > 0:
+            self._pending.extend(self.recent[:overflow])
+            self.recent = self.recent[overflow:]
+            self._schedule_summary()
+
+    def add_turn(self, user_message: str, assistant_message: str) -> None:
+        """Append a user/assistant exchange."""
+        self.add("user", user_message)
+        self.add("assistant", assistant_message)
+
+    def get_messages(self) -> List[Message]:
+        """Messages to send: summary, not-yet-folded turns, recent turns."""
+        messages = []
+        if self.summary:
+            messages.append(Message(role="system", content=SUMMARY_HEADER + self.summary))
+        return messages + self._pending + self.recent
+
+    def token_count(self, provider: str = "", model: str = "") -> int:
+        """Approximate prompt tokens taken by the memory."""
+        return sum(count_tokens(msg.content, provider, model) for msg in self.get_messages())
+
+    def _schedule_summary(self) -> None:
+        if self._summary_task is not None and not self._summary_task.done():
+            return  # the running fold picks up newly pending turns
+        try:
+            self._summary_task = asyncio.get_running_loop().create_task(self._fold_pending())
+        except RuntimeError:
+            # No event loop (e.g. restoring state synchronously); fold without the LLM
+            self._fold_extractive(self._pending)
+            self._pending = []
+
+    async def _fold_pending(self) -> None:
+        """Fold pending turns into the summary until none are left."""
+        while self._pending:
+            batch = list(self._pending)
+            try:
+                self.summary = await self._summarize(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._fold_extractive(batch)
+            self._pending = self._pending[len(batch):]
+
+    async def _summarize(self, batch: List[Message]) -> str:
+        if self.llm_manager is None:
+            raise RuntimeError("No LLM manager for summarization")
+
+        turns = "\n\n".join(f"{msg.role}: {msg.content}" for msg in batch)
+        prompt = SUMMARY_PROMPT.format(
+            summary=self.summary or "(none)",
+            turns=turns,
+            max_words=int(self.summary_max_tokens * 0.7),
+        )
+        response = await self.llm_manager.generate(
+            [Message(role="user", content=prompt)],
+            temperature=0.0,
+            max_tokens=self.summary_max_tokens,
+            task="summary",
+        )
+        return self._fit(response.content.strip())
+
+    def _fold_extractive(self, batch: List[Message]) -> None:
+        """Fallback fold without the LLM: keep the most recent text that fits."""
+        lines = f"{self.summary}\n".splitlines() + [f"{msg.role}: {msg.content}" for msg in batch]
+        tokenizer = get_tokenizer()
+
+        # Drop from the front: the newest turns matter most
+        kept: List[str] = []
+        used = 0
+        for line in reversed([line for line in lines if line.strip()]):
+            tokens = tokenizer.count(line) + 1
+            if used + tokens > self.summary_max_tokens:
+                break
+            kept.append(line)
+            used += tokens
+        self.summary = "\n".join(reversed(kept))
+
+    def _fit(self, summary: str) -> str:
+        return get_tokenizer().truncate(summary, self.summary_max_tokens)
+
+    async def wait_idle(self) -> None:
+        """Wait for any background summarization to finish."""
+        while self._summary_task is not None and not self._summary_task.done():
+            await asyncio.shield(self._summary_task)
+
+    def clear(self) -> None:
+        """Forget the whole conversation."""
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
+        self._summary_task = None
+        self.summary = ""
+        self.recent = []
+        self._pending = []
+
+    def to_history(self) -> List[Dict[str, Any]]:
+        """Serialize unsummarized messages for SessionManager."""
+        return [{"role": msg.role, "content": msg.content} for msg in self._pending + self.recent]
+
+    def restore(self, history: List[Dict[str, Any]], summary: str = "") -> None:
+        """Restore memory saved with ``to_history``/``summary``."""
+        self.clear()
+        self.summary = summary or ""
+        for item in history:
+            self.add(item["role"], item["content"])
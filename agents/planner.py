@@ -3,6 +3,7 @@ from typing import List, Dict, Optional, Callable, Any
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
+import asyncio
 import json
 
 
@@ -76,6 +77,13 @@ class Plan:
                 return task
         return None
 
+    def get_ready_tasks(self) -> List[Task]:
+        """Get all pending tasks whose dependencies are completed."""
+        return [
+            task for task in self.tasks
+            if task.status == TaskStatus.PENDING and self._dependencies_completed(task)
+        ]
+
     def get_next_task(self) -> Optional[Task]:
         """Get next task that can be executed."""
         for task in self.tasks:
@@ -266,43 +274,75 @@ class TaskPlanner:
         plan: Plan,
         task_executor: Callable,
         on_task_start: Optional[Callable] = None,
-        on_task_complete: Optional[Callable] = None
+        on_task_complete: Optional[Callable] = None,
+        concurrency: int = 1
     ) -> Dict[str, Any]:
         """
-        Execute a plan sequentially.
+        Execute a plan, running independent tasks concurrently.
+
+        A new task starts as soon as a slot frees up and its dependencies
+        are done, so one slow task does not hold back the others.
 
         Args:
             plan: Plan to execute
             task_executor: Async function to execute each task
             on_task_start: Optional callback when task starts
             on_task_complete: Optional callback when task completes
+            concurrency: Maximum number of tasks to run at once (default 1:
+                sequential, since plans may rely on an order they never
+                declared as dependencies)
 
         Returns:
             Plan execution result
         """
         results = []
 
-        while True:
-            # Get next task
-            task = plan.get_next_task()
-            if not task:
-                break
-
+        async def run(task: Task) -> Dict[str, Any]:
             # Callback
             if on_task_start:
                 await on_task_start(task)
 
             # Execute task
             result = await self.execute_task(task, task_executor)
-            results.append(result)
 
             # Callback
             if on_task_complete:
                 await on_task_complete(task, result)
 
-            # Stop on failure if critical
-            if not result["success"] and task.metadata.get("critical", False):
-                break
+            return result
+
+        running: Dict[asyncio.Future, Task] = {}
+        started = set()
+        stop = False
+
+        try:
+            while True:
+                # Fill free slots with tasks whose dependencies are done
+                if not stop:
+                    for task in plan.get_ready_tasks():
+                        if len(running) >= max(1, concurrency):
+                            break
+                        if task.id not in started:
+                            started.add(task.id)
+                            running[asyncio.ensure_future(run(task))] = task
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    result = future.result()
+                    results.append(result)
+
+                    # Stop starting new tasks on failure if critical
+                    if not result["success"] and task.metadata.get("critical", False):
+                        stop = True
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
 
         progress = plan.get_progress()
 
@@ -27,7 +27,7 @@ Guidelines:
 - Ask clarifying questions when needed
 
 Available commands:
-- /switch <provider>: Switch LLM provider (claude, openai, groq, deepinfra)
+- /switch <provider>: Switch LLM provider (claude, openai, groq, deepinfra, mock)
 - /analyze: Analyze current project structure
 - /search <query>: Search the web for documentation
 - /upload: Upload documentation for RAG
@@ -41,10 +41,14 @@ USER_PROMPT_TEMPLATE = """User Request: {user_message}
 
 Please help with this request. Consider the project context and available resources."""
 
-CONTEXT_TEMPLATE = """
---- Project Context ---
+PROJECT_CONTEXT_TEMPLATE = """--- Project Context ---
 {project_info}
 
+--- Repository Summary ---
+{repo_summary}
+"""
+
+CONTEXT_TEMPLATE = """
 --- Relevant Files ---
 {relevant_files}
 
@@ -125,3 +129,15 @@ Provide:
 3. Benefits of refactoring
 4. Any trade-offs made
 """
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and a coding assistant.
+
+Current summary:
+{summary}
+
+New turns to fold in:
+{turns}
+
+Write the updated summary in at most {max_words} words. Keep decisions, requirements,
+file names, code identifiers and open questions; drop pleasantries and repeated content.
+Reply with the summary only."""
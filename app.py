@@ -1,4 +1,5 @@
 """Chainlit application for the coding agent."""
+import asyncio
 import chainlit as cl
 from pathlib import Path
 from typing import Optional
@@ -7,12 +8,25 @@ import os
 from agents import CodingAgent
 from config import settings
 from utils import get_session_manager
+from utils.request_context import RequestContext, RequestCancelled, DeadlineExceeded
 
 
 # Global agent instance
 agent: Optional[CodingAgent] = None
 session_manager = get_session_manager()
 
+# Failing tests sent to the LLM for fix suggestions at once
+MAX_TEST_FIXES = 5
+
+
+# Load RAG models once at server start (in the background), not on the first query
+if settings.embedding_warmup_on_start:
+    try:
+        from rag import start_warmup
+        start_warmup()
+    except ImportError:
+        pass  # RAG dependencies not installed
+
 
 def get_quick_actions():
     """매 응답마다 표시할 핵심 버튼 반환"""
@@ -97,8 +111,15 @@ async def start():
     # CodingAgent 초기화
     agent = CodingAgent(project_path=project_path)
 
+    # 첫 요청의 연결 지연을 줄이기 위해 LLM 연결을 미리 열어둠
+    if settings.llm_warmup_on_start:
+        asyncio.create_task(agent.llm_manager.warmup())
+
     # 세션 데이터가 있으면 복원
     if session_data:
+        # 대화 메모리 복원 (요약 + 최근 대화)
+        agent.memory.restore(session_data.get("history", []), session_data.get("summary", ""))
+
         # RAG 인덱스 경로 설정
         rag_index_path = session_data.get("rag_index_path")
         if rag_index_path and os.path.exists(rag_index_path):
@@ -236,7 +257,9 @@ async def save_current_session(project_path: str, agent: CodingAgent):
             settings={
                 "llm_provider": agent.get_llm_info()["provider"],
                 "project_loaded": True
-            }
+            },
+            history=agent.memory.to_history(),
+            summary=agent.memory.summary
         )
 
         # 마지막 액세스 시간 업데이트
@@ -369,19 +392,24 @@ async def on_action_run_tests(action: cl.Action):
             result_msg += f"- **📈 커버리지**: {summary.coverage:.1f}%\n"
 
         # 실패한 테스트 상세 정보
-        if summary.failed > 0 or summary.error > 0:
+        failures = [result for result in summary.results if result.status.value in ["failed", "error"]]
+        if failures:
             result_msg += "\n## ❌ 실패한 테스트\n\n"
-            for result in summary.results:
-                if result.status.value in ["failed", "error"]:
-                    result_msg += f"### {result.test_name}\n"
-                    result_msg += f"- **파일**: `{result.file_path}`\n"
-                    if result.line_number:
-                        result_msg += f"- **라인**: {result.line_number}\n"
-                    if result.error_message:
-                        result_msg += f"- **에러**: {result.error_message}\n"
-                    result_msg += "\n"
-
-        await cl.Message(content=result_msg).send()
+            for result in failures:
+                result_msg += f"### {result.test_name}\n"
+                result_msg += f"- **파일**: `{result.file_path}`\n"
+                if result.line_number:
+                    result_msg += f"- **라인**: {result.line_number}\n"
+                if result.error_message:
+                    result_msg += f"- **에러**: {result.error_message}\n"
+                result_msg += "\n"
+
+        # 실패한 테스트가 있으면 수정 제안 버튼 표시
+        cl.user_session.set("test_failures", failures)
+        actions = [
+            cl.Action(name="suggest_test_fixes", value="suggest_test_fixes", label="🔧 수정 제안", payload={})
+        ] if failures else []
+        await cl.Message(content=result_msg, actions=actions).send()
 
     except FileNotFoundError:
         await cl.Message(
@@ -392,6 +420,56 @@ async def on_action_run_tests(action: cl.Action):
         await cl.Message(content=f"❌ 테스트 실행 중 오류: {e}").send()
 
 
+@cl.action_callback("suggest_test_fixes")
+async def on_action_suggest_test_fixes(action: cl.Action):
+    """실패한 테스트들의 수정 방법을 병렬로 생성"""
+    global agent
+
+    failures = (cl.user_session.get("test_failures") or [])[:MAX_TEST_FIXES]
+    if not failures:
+        await cl.Message(content="수정할 실패 테스트가 없습니다.").send()
+        return
+
+    await cl.Message(content=f"🔧 실패한 테스트 {len(failures)}개의 수정 방법을 생성 중...").send()
+
+    try:
+        from agents import AutoErrorFixer, ErrorInfo
+
+        items = []
+        for result in failures:
+            path = Path(result.file_path)
+            if not path.is_absolute():
+                path = Path(agent.project_path) / path
+            code = path.read_text(encoding="utf-8") if path.is_file() else ""
+            message = result.error_message or result.test_name
+            items.append((ErrorInfo(
+                error_type=message.split(":", 1)[0] if ":" in message else "TestFailure",
+                error_message=message,
+                traceback_text=result.traceback or "",
+                file_path=result.file_path,
+                line_number=result.line_number,
+                code_snippet=None,
+                problematic_line=None
+            ), code))
+
+        fixer = AutoErrorFixer(agent.llm_manager, None)
+        fixes = await fixer.generate_fixes(items)
+
+        for result, fix in zip(failures, fixes):
+            if "error" in fix:
+                await cl.Message(content=f"❌ `{result.test_name}` 수정 제안 실패: {fix['error']}").send()
+                continue
+
+            fix_msg = f"# 🔧 {result.test_name}\n\n"
+            fix_msg += f"**원인**: {fix['cause']}\n\n**방법**: {fix['method']}\n"
+            if fix["fixed_code"]:
+                fix_msg += f"\n```python\n{fix['fixed_code']}\n```\n"
+            await cl.Message(content=fix_msg).send()
+
+    except Exception as e:
+        await cl.Message(content=f"❌ 수정 제안 생성 중 오류: {e}").send()
+
+
 @cl.action_callback("check_quality")
 async def on_action_check_quality(action: cl.Action):
     """코드 품질 검사 버튼 클릭"""
@@ -532,64 +610,64 @@ async def on_action_review_code(action: cl.Action):
 
     # 파일 선택 안내
     files = await cl.AskFileMessage(
-        content="📝 리뷰할 Python 파일을 선택하거나 업로드하세요",
+        content="📝 리뷰할 Python 파일을 선택하거나 업로드하세요 (여러 개 가능)",
         accept=[".py"],
         max_size_mb=5,
-        max_files=1
+        max_files=10
     ).send()
 
     if not files:
         await cl.Message(content="파일이 선택되지 않았습니다.").send()
         return
 
-    file = files[0]
-    await cl.Message(content=f"📝 `{file.name}` 파일을 리뷰 중...").send()
+    names = ", ".join(f"`{file.name}`" for file in files)
+    await cl.Message(content=f"📝 {names} 파일을 리뷰 중...").send()
 
     try:
         from agents import CodeReviewer
         from llm import LLMManager
 
-        # 파일 읽기
-        with open(file.path, 'r', encoding='utf-8') as f:
-            code = f.read()
-
-        # 코드 리뷰 실행
-        llm_manager = LLMManager()
-        reviewer = CodeReviewer(llm_manager)
-
-        review = await reviewer.review_code(
-            file_path=file.name,
-            code=code,
+        # 코드 리뷰 실행 (여러 파일은 병렬로)
+        reviewer = CodeReviewer(agent.llm_manager if agent else LLMManager())
+        result = await reviewer.review_files(
+            [file.path for file in files],
             focus=["security", "performance", "readability"]
         )
 
-        # 결과 포맷팅
-        result_msg = f"""# 📝 코드 리뷰 결과
+        for file in files:
+            if file.path in result["errors"]:
+                await cl.Message(content=f"❌ `{file.name}` 리뷰 실패: {result['errors'][file.path]}").send()
+                continue
+
+            review = result["reviews"][file.path]
+
+            # 결과 포맷팅
+            result_msg = f"""# 📝 코드 리뷰 결과: `{file.name}`
 
 ## 📊 전체 점수: {review.overall_score:.1f}/10
 
 ### ✅ 강점
 """
-        for strength in review.strengths:
-            result_msg += f"- {strength}\n"
+            for strength in review.strengths:
+                result_msg += f"- {strength}\n"
 
-        result_msg += "\n### ⚠️ 개선점\n"
-        for weakness in review.weaknesses:
-            result_msg += f"- {weakness}\n"
+            result_msg += "\n### ⚠️ 개선점\n"
+            for weakness in review.weaknesses:
+                result_msg += f"- {weakness}\n"
 
-        result_msg += "\n### 📌 상세 코멘트\n\n"
-        for comment in review.comments[:5]:  # 최대 5개만 표시
-            icon = "🔴" if comment.level.value == "critical" else "🟠" if comment.level.value == "major" else "🟡" if comment.level.value == "minor" else "💡"
-            result_msg += f"{icon} **{comment.level.value.upper()}**"
-            if comment.line_number:
-                result_msg += f" (Line {comment.line_number})"
-            result_msg += f"\n- **이슈**: {comment.issue}\n"
-            result_msg += f"- **제안**: {comment.suggestion}\n\n"
+            result_msg += "\n### 📌 상세 코멘트\n\n"
+            for comment in review.comments[:5]:  # 최대 5개만 표시
+                icon = "🔴" if comment.level.value == "critical" else "🟠" if comment.level.value == "major" else "🟡" if comment.level.value == "minor" else "💡"
+                result_msg += f"{icon} **{comment.level.value.upper()}**"
+                if comment.line_number:
+                    result_msg += f" (Line {comment.line_number})"
+                result_msg += f"\n- **이슈**: {comment.issue}\n"
+                result_msg += f"- **제안**: {comment.suggestion}\n\n"
 
-        if len(review.comments) > 5:
-            result_msg += f"... 그 외 {len(review.comments) - 5}개 코멘트\n"
+            if len(review.comments) > 5:
+                result_msg += f"... 그 외 {len(review.comments) - 5}개 코멘트\n"
 
-        await cl.Message(content=result_msg).send()
+            await cl.Message(content=result_msg).send()
 
     except Exception as e:
         await cl.Message(content=f"❌ 코드 리뷰 중 오류: {e}").send()
@@ -748,21 +826,59 @@ async def main(message: cl.Message):
     msg = cl.Message(content="")
     await msg.send()
 
-    async for chunk in agent.process_message(
-        user_message,
-        stream=True,
-        use_rag=True,
-        use_web=use_web,
-        analyze_project=analyze_project
-    ):
-        await msg.stream_token(chunk)
+    # Request in progress for this chat session (cancelled when the user presses stop)
+    request_context = RequestContext(timeout=settings.request_timeout)
+    cl.user_session.set("active_request", request_context)
+    try:
+        async for chunk in agent.process_message(
+            user_message,
+            stream=True,
+            use_rag=True,
+            use_web=use_web,
+            analyze_project=analyze_project,
+            request_context=request_context
+        ):
+            await msg.stream_token(chunk)
+    except RequestCancelled:
+        await msg.stream_token("\n\n⏹️ 요청이 취소되었습니다.")
+        await msg.update()
+        return
+    except DeadlineExceeded:
+        await msg.stream_token(f"\n\n⏱️ 제한 시간({settings.request_timeout:.0f}초)을 초과하여 중단했습니다.")
+        await msg.update()
+        return
+    finally:
+        if cl.user_session.get("active_request") is request_context:
+            cl.user_session.set("active_request", None)
 
     await msg.update()
 
+    # 대화 메모리 저장
+    await save_current_session(str(agent.project_path), agent)
+
     # 매 응답마다 핵심 버튼 표시
     await cl.Message(content="", actions=get_quick_actions()).send()
 
 
+@cl.on_stop
+async def on_stop():
+    """Abort this session's request in progress when the user presses stop."""
+    active_request = cl.user_session.get("active_request")
+    if active_request is not None:
+        active_request.cancel("stopped by user")
+
+
+def ingest_progress(message: cl.Message, label: str):
+    """Progress callback that updates a message as documents are indexed."""
+    async def update(progress):
+        message.content = (
+            f"{label} {progress.done}/{progress.total} files, "
+            f"{progress.chunks_added} chunks ({Path(progress.source).name})"
+        )
+        await message.update()
+    return update
+
+
 async def handle_command(command: str):
     """Handle special commands."""
     global agent
@@ -782,7 +898,7 @@ async def handle_command(command: str):
 
 ## LLM 관리
 - `/switch <provider>` - Switch LLM provider
-  - Available: claude, openai, groq, deepinfra
+  - Available: claude, openai, groq, deepinfra, mock
   - Example: `/switch openai`
 - `/current-llm` - Show current LLM provider
 
@@ -790,6 +906,7 @@ async def handle_command(command: str):
 - `/search <query>` - Search web for documentation
   - Example: `/search python asyncio tutorial`
 - `/upload` - Upload documentation for RAG
+- `/sync <path>` - Index a directory incrementally (changed files only)
 - `/stats` - Show RAG statistics
 - `/clear-docs` - Clear all uploaded documentation
 
@@ -806,7 +923,7 @@ async def handle_command(command: str):
 
     elif cmd == "/switch":
         if not args:
-            await cl.Message(content="Please specify a provider: claude, openai, groq, or deepinfra").send()
+            await cl.Message(content="Please specify a provider: claude, openai, groq, deepinfra, or mock").send()
             return
 
         try:
@@ -862,17 +979,43 @@ async def handle_command(command: str):
         ).send()
 
         if files:
-            await cl.Message(content=f"📤 Uploading {len(files)} file(s)...").send()
-            total_added = 0
-
-            for file in files:
-                try:
-                    count = await agent.add_document_to_rag(file.path)
-                    total_added += count
-                except Exception as e:
-                    await cl.Message(content=f"❌ Error processing {file.name}: {e}").send()
+            status_msg = cl.Message(content=f"📤 Uploading {len(files)} file(s)...")
+            await status_msg.send()
+
+            # Uploads land on a new temp path each time; index them by file name
+            # so re-uploading a file replaces its chunks instead of adding a copy.
+            # The prefix keeps them apart from synced files, which are keyed by path.
+            summary = await agent.add_documents_to_rag(
+                [file.path for file in files],
+                progress=ingest_progress(status_msg, "📤 Indexing"),
+                sources={file.path: f"upload:{file.name}" for file in files}
+            )
+            for error in summary["errors"]:
+                await cl.Message(content=f"❌ Error processing {error}").send()
+
+            await cl.Message(content=f"✅ Added {summary['chunks_added']} document chunks to knowledge base").send()
+
+    elif cmd == "/sync":
+        if not args:
+            await cl.Message(content="Please provide a directory path").send()
+            return
 
-            await cl.Message(content=f"✅ Added {total_added} document chunks to knowledge base").send()
+        status_msg = cl.Message(content=f"🔄 Syncing: {args}...")
+        await status_msg.send()
+        try:
+            summary = await agent.sync_directory_to_rag(
+                args, progress=ingest_progress(status_msg, "🔄 Syncing")
+            )
+            msg = (
+                f"✅ Sync complete: {summary['added']} added, {summary['updated']} updated, "
+                f"{summary['unchanged']} unchanged, {summary['removed']} removed "
+                f"({summary['chunks_added']} chunks indexed)"
+            )
+            if summary["errors"]:
+                msg += "\n\n**Errors:**\n" + "\n".join(f"- {e}" for e in summary["errors"])
+            await cl.Message(content=msg).send()
+        except Exception as e:
+            await cl.Message(content=f"❌ Error syncing directory: {e}").send()
 
     elif cmd == "/stats":
         stats = agent.get_rag_stats()
@@ -887,6 +1030,13 @@ async def handle_command(command: str):
         for source in stats['sources'][:10]:
             msg += f"- {source}\n"
 
+        if stats.get('models'):
+            msg += "\n**Models:**\n"
+            for name, model_stats in stats['models'].items():
+                size = model_stats['parameter_bytes']
+                msg += f"- {name}: loaded in {model_stats['load_seconds']:.2f}s"
+                msg += f", {size / 1e6:.0f} MB\n" if size else "\n"
+
         await cl.Message(content=msg).send()
 
     elif cmd == "/clear-docs":
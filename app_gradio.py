@@ -3,10 +3,13 @@ import gradio as gr
 from pathlib import Path
 from typing import Optional, List, Tuple
 import asyncio
+import atexit
+import threading
 
 from agents import CodingAgent
 from config import settings
 from utils import get_session_manager
+from utils.request_context import RequestContext, RequestCancelled, DeadlineExceeded
 from tools import TestRunner, CodeQuality, ProjectTemplates
 
 # Global instances
@@ -14,6 +17,47 @@ agent: Optional[CodingAgent] = None
 session_manager = get_session_manager()
 current_project_path = str(Path.cwd())
 
+# Chat request in progress (cancelled by the stop button)
+active_request: Optional[RequestContext] = None
+
+# 모든 핸들러를 하나의 이벤트 루프에서 실행: 풀링된 HTTP 연결과
+# 백그라운드 작업(워밍업 등)이 핸들러 호출 사이에도 유지됨
+event_loop = asyncio.new_event_loop()
+threading.Thread(target=event_loop.run_forever, name="gradio-event-loop", daemon=True).start()
+background_tasks: set = set()
+
+
+def run_async(coro):
+    """코루틴을 공유 이벤트 루프에서 실행하고 결과를 반환"""
+    return asyncio.run_coroutine_threadsafe(coro, event_loop).result()
+
+
+def run_in_background(coro) -> None:
+    """공유 이벤트 루프에서 작업을 시작 (완료될 때까지 참조 유지)"""
+    task = event_loop.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+@atexit.register
+def shutdown() -> None:
+    """종료 시 LLM 연결을 닫고 이벤트 루프를 멈춤"""
+    if agent is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(agent.llm_manager.close(), event_loop).result(timeout=5)
+        except Exception:
+            pass
+    event_loop.call_soon_threadsafe(event_loop.stop)
+
+
+# Load RAG models once at server start (in the background), not on the first query
+if settings.embedding_warmup_on_start:
+    try:
+        from rag import start_warmup
+        start_warmup()
+    except ImportError:
+        pass  # RAG dependencies not installed
+
 
 async def initialize_agent(project_path: str, auto_analyze: bool):
     """에이전트 초기화"""
@@ -23,6 +67,10 @@ async def initialize_agent(project_path: str, auto_analyze: bool):
         current_project_path = project_path
         agent = CodingAgent(project_path=project_path)
 
+        # 첫 요청의 연결 지연을 줄이기 위해 LLM 연결을 미리 열어둠
+        if settings.llm_warmup_on_start:
+            run_in_background(agent.llm_manager.warmup())
+
         msg = f"✅ 에이전트 초기화 완료!\n\n**프로젝트**: `{project_path}`"
 
         if auto_analyze and Path(project_path).exists():
@@ -47,17 +95,28 @@ async def chat(message: str, history: List[Tuple[str, str]]):
         return history, ""
 
     # 스트리밍 응답
+    global active_request
+    request_context = RequestContext(timeout=settings.request_timeout)
+    active_request = request_context
     response = ""
     try:
         async for chunk in agent.process_message(
             message,
             stream=True,
             use_rag=True,
-            use_web=False
+            use_web=False,
+            request_context=request_context
         ):
             response += chunk
+    except RequestCancelled:
+        response += "\n\n⏹️ 요청이 취소되었습니다."
+    except DeadlineExceeded:
+        response += f"\n\n⏱️ 제한 시간({settings.request_timeout:.0f}초)을 초과하여 중단했습니다."
     except Exception as e:
         response = f"❌ 오류 발생: {e}"
+    finally:
+        if active_request is request_context:
+            active_request = None
 
     history.append((message, response))
     return history, ""
@@ -275,6 +334,7 @@ def create_ui():
                         container=False
                     )
                     send_btn = gr.Button("전송", scale=1, variant="primary")
+                    stop_btn = gr.Button("⏹️ 중지", scale=1, variant="stop")
 
             # 오른쪽: 고정 버튼 패널 (35%)
             with gr.Column(scale=35):
@@ -319,7 +379,7 @@ def create_ui():
                 # 설정
                 with gr.Accordion("⚙️ 설정", open=False):
                     llm_dropdown = gr.Dropdown(
-                        choices=["claude", "openai", "groq", "deepinfra"],
+                        choices=["claude", "openai", "groq", "deepinfra", "mock"],
                         value="claude",
                         label="🤖 LLM 선택",
                         interactive=True
@@ -334,14 +394,14 @@ def create_ui():
 
         # 프로젝트 로드
         load_btn.click(
-            fn=lambda p, a: asyncio.run(initialize_agent(p, a)),
+            fn=lambda p, a: run_async(initialize_agent(p, a)),
             inputs=[project_path, auto_analyze],
             outputs=[init_status]
         )
 
         # 채팅
         def chat_wrapper(msg, history):
-            return asyncio.run(chat(msg, history))
+            return run_async(chat(msg, history))
 
         send_btn.click(
             fn=chat_wrapper,
@@ -355,9 +415,16 @@ def create_ui():
             outputs=[chatbot, msg_input]
         )
 
+        # 진행 중인 요청 중지 (다른 스레드에서 호출되어도 안전)
+        def stop_request():
+            if active_request is not None:
+                active_request.cancel("stopped by user")
+
+        stop_btn.click(fn=stop_request)
+
         # 테스트 실행
         def test_wrapper():
-            result = asyncio.run(run_tests())
+            result = run_async(run_tests())
             return gr.Markdown(value=result, visible=True)
 
         test_btn.click(
@@ -367,30 +434,30 @@ def create_ui():
 
         # 코드 품질
         format_btn.click(
-            fn=lambda: gr.Markdown(value=asyncio.run(check_quality_format()), visible=True),
+            fn=lambda: gr.Markdown(value=run_async(check_quality_format()), visible=True),
             outputs=[output_display]
         )
 
         lint_btn.click(
-            fn=lambda: gr.Markdown(value=asyncio.run(check_quality_lint()), visible=True),
+            fn=lambda: gr.Markdown(value=run_async(check_quality_lint()), visible=True),
             outputs=[output_display]
         )
 
         quality_all_btn.click(
-            fn=lambda: gr.Markdown(value=asyncio.run(check_quality_all()), visible=True),
+            fn=lambda: gr.Markdown(value=run_async(check_quality_all()), visible=True),
             outputs=[output_display]
         )
 
         # 코드 리뷰
         review_btn.click(
-            fn=lambda f: gr.Markdown(value=asyncio.run(review_code_file(f)), visible=True),
+            fn=lambda f: gr.Markdown(value=run_async(review_code_file(f)), visible=True),
             inputs=[review_file],
             outputs=[output_display]
         )
 
         # 프로젝트 생성
         create_btn.click(
-            fn=lambda t, n, o: gr.Markdown(value=asyncio.run(create_new_project(t, n, o)), visible=True),
+            fn=lambda t, n, o: gr.Markdown(value=run_async(create_new_project(t, n, o)), visible=True),
             inputs=[template_radio, project_name, output_dir],
             outputs=[output_display]
         )
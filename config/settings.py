@@ -1,6 +1,6 @@
 """Application settings and configuration."""
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 from pathlib import Path
 
 
@@ -21,17 +21,128 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4-turbo-preview"
     groq_model: str = "mixtral-8x7b-32768"
     deepinfra_model: str = "meta-llama/Meta-Llama-3.1-70B-Instruct"
+    mock_model: str = "mock-model"
+
+    # Mock LLM (offline load testing / benchmarks)
+    mock_ttft: float = 0.05  # seconds to first token
+    mock_tokens_per_second: float = 50.0
+    mock_error_rate: float = 0.0  # fraction of calls that raise a transient error
+    mock_seed: int = 0
+
+    # LLM Response Cache
+    llm_cache_enabled: bool = True
+    llm_cache_path: Path = Path("./data/llm_cache.sqlite3")
+    llm_cache_max_entries: int = 1000
+    llm_cache_max_bytes: int = 52428800  # 50MB
+    llm_cache_ttl: int = 86400  # seconds
+    llm_cache_nonzero_temperature: bool = False  # Cache sampled (temperature > 0) responses too
+
+    # LLM Request Coalescing (identical in-flight requests share one call)
+    llm_coalesce_enabled: bool = True
+
+    # LLM Record/Replay (reproducible offline runs)
+    llm_record_mode: str = "off"  # off, record, replay
+    llm_record_path: Path = Path("./data/llm_recordings.jsonl")  # .jsonl.gz for compressed
+    llm_replay_time_scale: float = 1.0  # 0 = replay without delays
+
+    # LLM Routing (failover / hedging)
+    llm_fallback_chain: str = "claude,openai,groq,deepinfra"
+    llm_failover_enabled: bool = True
+    llm_hedging_enabled: bool = False
+    llm_hedge_delay: float = 8.0  # seconds, used until enough latency samples exist
+    llm_hedge_ttft_delay: float = 3.0  # seconds to first token for streams
+    llm_hedge_percentile: float = 0.95
+
+    # LLM Model Routing (tagged tasks are sent to a tier; "standard" = current provider)
+    llm_model_routing_enabled: bool = True
+    llm_model_tiers: Dict[str, List[str]] = {
+        "fast": ["groq:llama-3.1-8b-instant", "openai:gpt-4o-mini", "claude:claude-3-5-haiku-20241022"],
+        "strong": ["claude", "openai"],
+    }  # "provider" or "provider:model", in order of preference
+    llm_task_tiers: Dict[str, str] = {
+        "commit_message": "fast",
+        "quick_review": "fast",
+        "diff_review": "fast",
+        "summary": "fast",
+        "chat": "standard",
+        "review": "standard",
+        "analysis": "strong",
+        "error_fix": "strong",
+    }
+    llm_fast_tier_max_prompt_tokens: int = 4000  # larger prompts are promoted to "standard"
+    llm_routing_min_samples: int = 5  # latency samples before a model is ranked by speed
+
+    # LLM Retries and Circuit Breakers
+    llm_retry_enabled: bool = True
+    llm_retry_max_attempts: int = 3  # per provider, before failing over
+    llm_retry_base_delay: float = 0.5  # seconds; backoff is uniform in [0, base * 2^attempt]
+    llm_retry_max_delay: float = 20.0  # longer Retry-After requests fail over instead of waiting
+    llm_breaker_failure_threshold: int = 5  # consecutive transient failures that open the breaker
+    llm_breaker_recovery_timeout: float = 30.0  # seconds before a trial call is let through
+
+    # LLM Rate Limits (per provider; 0 or missing = unlimited)
+    llm_rpm_limits: Dict[str, int] = {"claude": 50, "openai": 500, "groq": 30, "deepinfra": 200}
+    llm_tpm_limits: Dict[str, int] = {"claude": 40000, "openai": 30000, "groq": 6000, "deepinfra": 100000}
+    llm_max_concurrency: int = 8  # in-flight requests per provider
+
+    # LLM HTTP Transport (shared by OpenAI-compatible providers)
+    llm_http2: bool = True  # used when the h2 package is installed
+    llm_http_max_connections: int = 20
+    llm_http_max_keepalive: int = 10
+    llm_http_keepalive_expiry: float = 60.0  # seconds an idle connection is kept
+    llm_http_timeout: float = 600.0
+    llm_http_connect_timeout: float = 10.0
+    llm_warmup_on_start: bool = True  # open provider connections when a session starts
+
+    # LLM Telemetry
+    llm_telemetry_window: int = 1000  # recent samples kept per histogram for percentiles
+    llm_metrics_port: int = 0  # serve Prometheus /metrics and JSON /stats (0 = disabled)
+    llm_metrics_host: str = "127.0.0.1"
+
+    # Context Budget
+    max_context_tokens: int = 0  # Cap on prompt window (0 = model's full context window)
+    reserved_output_tokens: int = 4096
+
+    # Conversation Memory
+    memory_recent_turns: int = 6  # turns kept verbatim; older ones are summarized
+    memory_summary_tokens: int = 1000
 
     # RAG Settings
     vector_store_path: Path = Path("./data/vectorstore")
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_warmup_on_start: bool = True  # load embedding/rerank models when the server starts
     chunk_size: int = 1000
     chunk_overlap: int = 200
 
+    # Embedding Cache
+    embedding_cache_enabled: bool = True  # reuse embeddings of unchanged chunks across uploads
+    embedding_cache_path: Path = Path("./data/embedding_cache")
+
+    # Ingestion
+    ingest_workers: int = 0  # processes parsing documents in parallel (0 = CPU count)
+    ingest_queue_size: int = 16  # files buffered between ingestion stages
+    embedding_batch_size: int = 256  # chunks embedded and stored per batch
+
+    # Hybrid Search
+    hybrid_search_enabled: bool = True  # fuse BM25 keyword search with vector search
+    hybrid_vector_weight: float = 1.0  # RRF weight of the embedding ranking
+    hybrid_lexical_weight: float = 1.0  # RRF weight of the BM25 ranking
+    hybrid_rrf_k: int = 60
+    hybrid_candidate_multiplier: int = 4  # each retriever fetches n_results x this before fusion
+
+    # Reranking
+    rerank_enabled: bool = False  # rescore retrieved chunks with a local cross-encoder
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_candidates: int = 20  # chunks retrieved for reranking; the best n_results are kept
+    rerank_batch_size: int = 16
+    rerank_budget_ms: float = 300.0  # past this, keep the retrieval order
+    rerank_cache_size: int = 10000  # cached (query, chunk) scores
+
     # Application Settings
     max_file_size: int = 10485760  # 10MB
     supported_file_extensions: str = ".py,.js,.ts,.jsx,.tsx,.java,.cpp,.c,.go,.rs,.md,.txt"
     max_context_files: int = 20
+    request_timeout: float = 300.0  # seconds per chat request, then it is aborted (0 = no deadline)
 
     # Web Search
     enable_web_search: bool = True
@@ -47,6 +158,11 @@ class Settings(BaseSettings):
         """Get list of supported file extensions."""
         return [ext.strip() for ext in self.supported_file_extensions.split(",")]
 
+    @property
+    def fallback_providers(self) -> List[str]:
+        """Get ordered list of fallback providers."""
+        return [p.strip() for p in self.llm_fallback_chain.split(",") if p.strip()]
+
     def get_api_key(self, provider: str) -> str:
         """Get API key for specified provider."""
         key_map = {
@@ -64,6 +180,7 @@ class Settings(BaseSettings):
             "openai": self.openai_model,
             "groq": self.groq_model,
             "deepinfra": self.deepinfra_model,
+            "mock": self.mock_model,
         }
         return model_map.get(provider, "")
 
@@ -1,31 +1,27 @@
 """LLM module for managing multiple LLM providers."""
+import importlib
+
 from .base import BaseLLM, Message, LLMResponse
-from .claude import ClaudeLLM
-from .openai_llm import OpenAILLM
 from .manager import LLMManager
+from .providers import PROVIDERS, is_installed
 
-# Optional: Groq provider
-try:
-    from .groq import GroqLLM
-except ImportError:
-    GroqLLM = None
-
-# Optional: DeepInfra provider
-try:
-    from .deepinfra import DeepInfraLLM
-except ImportError:
-    DeepInfraLLM = None
+# Provider classes are loaded lazily so that importing ``llm`` does not
+# import every provider SDK (anthropic, openai, groq)
+_PROVIDER_CLASSES = {class_name: provider for provider, (_, class_name, _) in PROVIDERS.items()}
 
 __all__ = [
     "BaseLLM",
     "Message",
     "LLMResponse",
-    "ClaudeLLM",
-    "OpenAILLM",
     "LLMManager",
-]
+] + [class_name for class_name, provider in _PROVIDER_CLASSES.items() if is_installed(provider)]
+
 
-if GroqLLM is not None:
-    __all__.append("GroqLLM")
-if DeepInfraLLM is not None:
-    __all__.append("DeepInfraLLM")
+def __getattr__(name: str):
+    if name in _PROVIDER_CLASSES:
+        module_name, class_name, _ = PROVIDERS[_PROVIDER_CLASSES[name]]
+        # ImportError propagates when the provider's SDK is not installed
+        value = getattr(importlib.import_module(module_name), class_name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,6 @@
 """Base LLM interface."""
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, Union
 from pydantic import BaseModel
 
 
@@ -8,6 +8,7 @@ class Message(BaseModel):
     """Chat message model."""
     role: str  # "user", "assistant", "system"
     content: str
+    cache: bool = False  # Marks the end of a stable prefix the provider may cache
 
 
 class LLMResponse(BaseModel):
@@ -21,6 +22,13 @@ class LLMResponse(BaseModel):
 class BaseLLM(ABC):
     """Base class for LLM providers."""
 
+    # Providers with an asynchronous batch job API override generate_batch
+    supports_batch: bool = False
+    # Providers whose stream_generate accepts an ``on_usage`` callback
+    reports_stream_usage: bool = False
+    # Local providers (e.g. the mock) can be created without an API key
+    requires_api_key: bool = True
+
     def __init__(self, api_key: str, model: str):
         self.api_key = api_key
         self.model = model
@@ -47,6 +55,24 @@ class BaseLLM(ABC):
         """Stream generate a response from the LLM."""
         pass
 
+    async def generate_batch(
+        self,
+        batch: List[List[Message]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> List[Union[LLMResponse, Exception]]:
+        """Generate responses for many requests through a provider batch API.
+
+        Results are returned in input order; failed items are returned as
+        exceptions instead of raising.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support batch generation")
+
+    async def warmup(self) -> bool:
+        """Pre-open the provider connection. Returns False if not supported or it fails."""
+        return False
+
     def format_messages(self, messages: List[Message]) -> Any:
         """Format messages for the specific LLM API."""
         return [{"role": msg.role, "content": msg.content} for msg in messages]
@@ -0,0 +1,180 @@
+"""Persistent response cache for LLM generations."""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .base import Message, LLMResponse
+
+
+def normalize_messages(messages: List[Message]) -> List[Dict[str, str]]:
+    """Normalize messages so that cosmetic differences do not change the key."""
+    normalized = []
+    for msg in messages:
+        content = msg.content.replace("\r\n", "\n")
+        content = "\n".join(line.rstrip() for line in content.split("\n")).strip()
+        normalized.append({"role": msg.role.strip().lower(), "content": content})
+    return normalized
+
+
+def make_request_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    messages: List[Message],
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Build a stable hash key for a generation request."""
+    payload = {
+        "provider": provider,
+        "model": model,
+        "temperature": round(float(temperature), 4),
+        "max_tokens": max_tokens,
+        "messages": normalize_messages(messages),
+        "extra": extra or {},
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Disk-backed LRU cache with TTL for LLM responses (SQLite)."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 1000,
+        max_bytes: int = 50 * 1024 * 1024,
+        ttl_seconds: int = 86400,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "evictions": 0, "expired": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database lazily on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Return a cached response, or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self._stats["hits"] += 1
+
+        response = LLMResponse.model_validate_json(value)
+        response.metadata = {**response.metadata, "cached": True}
+        return response
+
+    def set(self, key: str, response: LLMResponse) -> None:
+        """Store a response and evict entries beyond the configured bounds."""
+        value = response.model_dump_json()
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache."""
+        self._stats["bypassed"] += 1
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones over the limits."""
+        if self.ttl_seconds:
+            cursor = conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._stats["expired"] += max(cursor.rowcount, 0)
+
+        count, total_size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+
+        rows = conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+
+        victims = []
+        for key, size in rows:
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total_size -= size
+
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._stats["evictions"] += len(victims)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters and current size."""
+        with self._lock:
+            conn = self._connect()
+            count, total_size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": count,
+            "size_bytes": total_size,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+        }
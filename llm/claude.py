@@ -1,5 +1,6 @@
 """Claude (Anthropic) LLM implementation."""
-from typing import List, Optional, AsyncGenerator
+import asyncio
+from typing import Any, List, Optional, AsyncGenerator, Dict, Tuple, Union
 from anthropic import AsyncAnthropic
 from .base import BaseLLM, Message, LLMResponse
 
@@ -7,10 +8,65 @@ from .base import BaseLLM, Message, LLMResponse
 class ClaudeLLM(BaseLLM):
     """Claude LLM implementation using Anthropic API."""
 
+    supports_batch = True
+    reports_stream_usage = True
+    batch_poll_interval = 10.0  # seconds between Message Batches status checks
+    max_cache_breakpoints = 4  # Anthropic limit per request
+
     def __init__(self, api_key: str, model: str = "claude-3-5-sonnet-20241022"):
         super().__init__(api_key, model)
         self.client = AsyncAnthropic(api_key=api_key)
 
+    def _split_messages(self, messages: List[Message]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Separate system blocks from chat messages.
+
+        Messages flagged with ``cache=True`` get a cache-control breakpoint,
+        so the prefix up to and including them is served from Anthropic's
+        prompt cache on later requests. Only the last few breakpoints are
+        kept, as the API allows at most four.
+        """
+        cached_ids = [id(msg) for msg in messages if msg.cache][-self.max_cache_breakpoints:]
+        system_blocks = []
+        chat_messages = []
+
+        for msg in messages:
+            if msg.role == "system":
+                block = {"type": "text", "text": msg.content}
+                if id(msg) in cached_ids:
+                    block["cache_control"] = {"type": "ephemeral"}
+                system_blocks.append(block)
+            elif id(msg) in cached_ids:
+                chat_messages.append({
+                    "role": msg.role,
+                    "content": [{
+                        "type": "text",
+                        "text": msg.content,
+                        "cache_control": {"type": "ephemeral"},
+                    }],
+                })
+            else:
+                chat_messages.append({"role": msg.role, "content": msg.content})
+
+        return system_blocks, chat_messages
+
+    def _usage(self, usage) -> Dict[str, int]:
+        """Convert Anthropic usage, including prompt cache reads/writes."""
+        return {
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+        }
+
+    def _to_response(self, message) -> LLMResponse:
+        """Convert an Anthropic message object to LLMResponse."""
+        return LLMResponse(
+            content=message.content[0].text,
+            model=message.model,
+            usage=self._usage(message.usage),
+            metadata={"stop_reason": message.stop_reason}
+        )
+
     async def generate(
         self,
         messages: List[Message],
@@ -19,35 +75,69 @@ class ClaudeLLM(BaseLLM):
         **kwargs
     ) -> LLMResponse:
         """Generate a response from Claude."""
-        # Separate system messages
-        system_message = None
-        chat_messages = []
-
-        for msg in messages:
-            if msg.role == "system":
-                system_message = msg.content
-            else:
-                chat_messages.append({"role": msg.role, "content": msg.content})
+        system_blocks, chat_messages = self._split_messages(messages)
+        if system_blocks:
+            kwargs["system"] = system_blocks
 
         # Call Claude API
         response = await self.client.messages.create(
             model=self.model,
             max_tokens=max_tokens,
             temperature=temperature,
-            system=system_message if system_message else None,
             messages=chat_messages,
             **kwargs
         )
 
-        return LLMResponse(
-            content=response.content[0].text,
-            model=response.model,
-            usage={
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens,
-            },
-            metadata={"stop_reason": response.stop_reason}
-        )
+        return self._to_response(response)
+
+    async def generate_batch(
+        self,
+        batch: List[List[Message]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 4096,
+        **kwargs
+    ) -> List[Union[LLMResponse, Exception]]:
+        """Generate responses with the Message Batches API.
+
+        The batch is polled until it ends; if the caller cancels (e.g. on a
+        deadline) the remote batch is cancelled as well.
+        """
+        requests = []
+        for i, messages in enumerate(batch):
+            system_blocks, chat_messages = self._split_messages(messages)
+            params = {
+                "model": self.model,
+                "max_tokens": max_tokens or 4096,
+                "temperature": temperature,
+                "messages": chat_messages,
+                **kwargs
+            }
+            if system_blocks:
+                params["system"] = system_blocks
+            requests.append({"custom_id": str(i), "params": params})
+
+        message_batch = await self.client.messages.batches.create(requests=requests)
+
+        try:
+            while message_batch.processing_status != "ended":
+                await asyncio.sleep(self.batch_poll_interval)
+                message_batch = await self.client.messages.batches.retrieve(message_batch.id)
+        except asyncio.CancelledError:
+            await asyncio.shield(self.client.messages.batches.cancel(message_batch.id))
+            raise
+
+        results: List[Union[LLMResponse, Exception]] = [
+            RuntimeError("No result returned for batch item") for _ in batch
+        ]
+        async for entry in await self.client.messages.batches.results(message_batch.id):
+            index = int(entry.custom_id)
+            if entry.result.type == "succeeded":
+                results[index] = self._to_response(entry.result.message)
+            else:
+                error = getattr(entry.result, "error", None)
+                results[index] = RuntimeError(f"Batch item {entry.result.type}: {error}")
+
+        return results
 
     async def stream_generate(
         self,
@@ -56,25 +146,27 @@ class ClaudeLLM(BaseLLM):
         max_tokens: Optional[int] = 4096,
         **kwargs
     ) -> AsyncGenerator[str, None]:
-        """Stream generate a response from Claude."""
-        # Separate system messages
-        system_message = None
-        chat_messages = []
+        """Stream generate a response from Claude.
 
-        for msg in messages:
-            if msg.role == "system":
-                system_message = msg.content
-            else:
-                chat_messages.append({"role": msg.role, "content": msg.content})
+        Pass ``on_usage`` to receive the final usage dict (including prompt
+        cache reads/writes) once the stream completes.
+        """
+        on_usage = kwargs.pop("on_usage", None)
+        system_blocks, chat_messages = self._split_messages(messages)
+        if system_blocks:
+            kwargs["system"] = system_blocks
 
         # Stream from Claude API
         async with self.client.messages.stream(
             model=self.model,
             max_tokens=max_tokens,
             temperature=temperature,
-            system=system_message if system_message else None,
             messages=chat_messages,
             **kwargs
         ) as stream:
             async for text in stream.text_stream:
                 yield text
+
+            if on_usage is not None:
+                final_message = await stream.get_final_message()
+                on_usage(self._usage(final_message.usage))
@@ -0,0 +1,143 @@
+"""Single-flight coalescing of identical in-flight LLM requests."""
+import asyncio
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class _Flight:
+    """One shared in-flight call and the number of callers awaiting it."""
+    task: asyncio.Future
+    waiters: int = 0
+
+
+class _Broadcast:
+    """Fan one stream out to many subscribers.
+
+    A pump task reads the source and buffers chunks; every subscriber
+    replays the buffer from the start, so late joiners see the full
+    response. The source is cancelled when the last subscriber leaves.
+    """
+
+    def __init__(self, source: AsyncIterator[str]):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._changed = asyncio.Condition()
+        self.task = asyncio.ensure_future(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in source:
+                async with self._changed:
+                    self.chunks.append(chunk)
+                    self._changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            if hasattr(source, "aclose"):
+                await source.aclose()
+            self.done = True
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        self.subscribers += 1
+        index = 0
+        try:
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                    pending = self.chunks[index:]
+                    finished = self.done
+
+                for chunk in pending:
+                    yield chunk
+                index += len(pending)
+
+                if finished and index >= len(self.chunks):
+                    if self.error is not None:
+                        raise self.error
+                    return
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.task.done():
+                self.task.cancel()
+
+
+class Coalescer:
+    """Process-wide registry of in-flight requests keyed by request key.
+
+    Concurrent ``run`` calls with the same key share one call; concurrent
+    ``stream`` calls share one upstream stream. A shared call is cancelled
+    only when every caller waiting on it has gone away.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+        self._stats = {"calls": 0, "coalesced": 0, "streams": 0, "stream_subscribers_joined": 0}
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run ``factory()`` once per key; returns (result, shared)."""
+        flight = self._flights.get(key)
+        shared = flight is not None
+
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(self._flights, key, flight))
+            self._stats["calls"] += 1
+        else:
+            self._stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    async def stream(self, key: str, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """Stream ``factory()`` once per key, fanned out to every subscriber."""
+        broadcast = self._streams.get(key)
+
+        if broadcast is None:
+            broadcast = _Broadcast(factory())
+            self._streams[key] = broadcast
+            broadcast.task.add_done_callback(lambda _: self._forget(self._streams, key, broadcast))
+            self._stats["streams"] += 1
+        else:
+            self._stats["stream_subscribers_joined"] += 1
+
+        # Close the subscription promptly so an abandoned stream is cancelled
+        async with aclosing(broadcast.subscribe()) as subscription:
+            async for chunk in subscription:
+                yield chunk
+
+    @staticmethod
+    def _forget(registry: Dict[str, Any], key: str, entry: Any) -> None:
+        if registry.get(key) is entry:
+            del registry[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing statistics."""
+        return {
+            **self._stats,
+            "in_flight": len(self._flights),
+            "streams_in_flight": len(self._streams),
+        }
+
+
+_coalescer: Optional[Coalescer] = None
+
+
+def get_coalescer() -> Coalescer:
+    """Get the process-wide Coalescer shared by all LLMManager instances."""
+    global _coalescer
+    if _coalescer is None:
+        _coalescer = Coalescer()
+    return _coalescer
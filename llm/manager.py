@@ -1,20 +1,20 @@
 """LLM Manager for handling multiple LLM providers."""
-from typing import Optional, List, AsyncGenerator
+import asyncio
+import sys
+from typing import Dict, Optional, List, AsyncGenerator, Union
 from config import settings
 from .base import BaseLLM, Message, LLMResponse
-from .claude import ClaudeLLM
-from .openai_llm import OpenAILLM
-
-# Optional providers
-try:
-    from .groq import GroqLLM
-except ImportError:
-    GroqLLM = None
-
-try:
-    from .deepinfra import DeepInfraLLM
-except ImportError:
-    DeepInfraLLM = None
+from .cache import ResponseCache, make_request_key
+from .coalesce import get_coalescer
+from .model_router import ModelRoute, ModelRouter
+from .routing import LatencyTracker, RoutingPolicy, route_generate, route_stream
+from .scheduler import estimate_prompt_tokens, get_scheduler, usage_tokens
+from .telemetry import get_telemetry
+from .providers import PROVIDERS, installed_providers, load_provider_class
+from .recorder import RECORD_MODES, RecordingLLM, ReplayLLM, get_recording
+from .resilience import ResilientLLM, RetryPolicy, get_breaker
+from utils.request_context import RequestContext, run_in_context
+from utils.tokenizer import count_tokens
 
 
 class LLMManager:
@@ -24,40 +24,120 @@ class LLMManager:
         self.current_provider = settings.default_llm_provider
         self._llm_cache = {}
 
-    def _get_llm(self, provider: str) -> BaseLLM:
-        """Get or create LLM instance for the specified provider."""
-        if provider in self._llm_cache:
-            return self._llm_cache[provider]
+        if settings.llm_record_mode not in RECORD_MODES:
+            raise ValueError(f"Invalid llm_record_mode: {settings.llm_record_mode} (expected one of {RECORD_MODES})")
+        self.record_mode = settings.llm_record_mode
+        self.recording = get_recording() if self.record_mode != "off" else None
+        # While recording or replaying every call must reach the provider: cached or
+        # shared responses would skip recording, replay timing, and leak replayed
+        # answers into the production cache
+        live_calls_only = self.record_mode != "off"
+
+        self.response_cache = ResponseCache(
+            path=settings.llm_cache_path,
+            max_entries=settings.llm_cache_max_entries,
+            max_bytes=settings.llm_cache_max_bytes,
+            ttl_seconds=settings.llm_cache_ttl,
+        ) if settings.llm_cache_enabled and not live_calls_only else None
+        self.routing_policy = RoutingPolicy.from_settings()
+        self.model_router = ModelRouter.from_settings()
+        self.retry_policy = RetryPolicy.from_settings() if settings.llm_retry_enabled else None
+        self.latency_tracker = LatencyTracker()
+        self.scheduler = get_scheduler()
+        self.coalescer = get_coalescer() if settings.llm_coalesce_enabled and not live_calls_only else None
+        self.telemetry = get_telemetry()
+
+    def _get_llm(self, provider: str, model: Optional[str] = None) -> BaseLLM:
+        """Get or create LLM instance for the specified provider (and model override)."""
+        cache_key = f"{provider}:{model}" if model else provider
+        if cache_key in self._llm_cache:
+            return self._llm_cache[cache_key]
 
         api_key = settings.get_api_key(provider)
-        model = settings.get_model_name(provider)
+        model = model or settings.get_model_name(provider)
 
-        if not api_key:
-            raise ValueError(f"API key not found for provider: {provider}")
+        if self.record_mode == "replay":
+            llm = ReplayLLM(provider, model, self.recording, settings.llm_replay_time_scale)
+            self._llm_cache[cache_key] = llm
+            return llm
 
-        llm_classes = {
-            "claude": ClaudeLLM,
-            "openai": OpenAILLM,
-        }
+        # Provider SDKs are imported here, on first use
+        llm_class = load_provider_class(provider)
 
-        # Add optional providers if available
-        if GroqLLM is not None:
-            llm_classes["groq"] = GroqLLM
-        if DeepInfraLLM is not None:
-            llm_classes["deepinfra"] = DeepInfraLLM
+        if llm_class.requires_api_key and not api_key:
+            raise ValueError(f"API key not found for provider: {provider}")
 
-        llm_class = llm_classes.get(provider)
-        if not llm_class:
-            available = ", ".join(llm_classes.keys())
-            raise ValueError(f"Provider '{provider}' not available. Available providers: {available}")
+        if provider == "mock":
+            llm = llm_class(
+                model=model,
+                ttft=settings.mock_ttft,
+                tokens_per_second=settings.mock_tokens_per_second,
+                error_rate=settings.mock_error_rate,
+                seed=settings.mock_seed,
+            )
+        else:
+            llm = llm_class(api_key=api_key, model=model)
 
-        llm = llm_class(api_key=api_key, model=model)
-        self._llm_cache[provider] = llm
+        if self.record_mode == "record":
+            llm = RecordingLLM(llm, provider, self.recording)
+        if self.retry_policy is not None:
+            llm = ResilientLLM(llm, get_breaker(provider), self.retry_policy)
+        self._llm_cache[cache_key] = llm
         return llm
 
+    def _is_available(self, provider: str) -> bool:
+        """Check whether a provider can be used as a fallback (or routed to)."""
+        if not get_breaker(provider).available:
+            return False
+        if provider in self._llm_cache or provider == "mock":
+            return True
+        if self.record_mode == "replay":
+            return provider in PROVIDERS
+        return provider in self.list_providers() and bool(settings.get_api_key(provider))
+
+    def _candidates(self, provider: str) -> List[str]:
+        """Providers to try for a call, in order.
+
+        A mock primary never fails over: injected errors must not reach paid providers.
+        """
+        if provider == "mock":
+            return [provider]
+        candidates = self.routing_policy.candidates(provider, self._is_available)
+        if len(candidates) > 1 and not get_breaker(provider).available:
+            # The primary's breaker is open: try healthy fallbacks first
+            candidates = candidates[1:] + candidates[:1]
+        return candidates
+
+    def _route(
+        self,
+        messages: List[Message],
+        provider: Optional[str],
+        model: Optional[str],
+        task: Optional[str],
+    ) -> ModelRoute:
+        """Resolve where a call goes; an explicit provider or model bypasses the model router.
+
+        Mock sessions are offline by design and are never routed to real providers.
+        """
+        if provider is not None or model is not None or self.current_provider == "mock":
+            return ModelRoute(provider or self.current_provider, model)
+        return self.model_router.choose(
+            task,
+            estimate_prompt_tokens(messages, self.current_provider),
+            self.current_provider,
+            self._is_available,
+            self.telemetry,
+            self._model_name,
+        )
+
+    def _model_name(self, provider: str, model: Optional[str]) -> str:
+        """The model a call would use, without creating a client (or importing its SDK)."""
+        llm = self._llm_cache.get(f"{provider}:{model}" if model else provider)
+        return llm.model if llm is not None else model or settings.get_model_name(provider)
+
     def switch_provider(self, provider: str) -> str:
         """Switch to a different LLM provider."""
-        if provider not in ["claude", "openai", "groq", "deepinfra"]:
+        if provider not in PROVIDERS:
             raise ValueError(f"Invalid provider: {provider}")
 
         self.current_provider = provider
@@ -73,12 +153,164 @@ class LLMManager:
         provider: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        use_cache: Optional[bool] = None,
+        priority: str = "background",
+        task: Optional[str] = None,
+        model: Optional[str] = None,
+        request_context: Optional[RequestContext] = None,
         **kwargs
     ) -> LLMResponse:
-        """Generate a response using the specified or current provider."""
-        provider = provider or self.current_provider
-        llm = self._get_llm(provider)
-        return await llm.generate(messages, temperature, max_tokens, **kwargs)
+        """Generate a response using the specified or current provider.
+
+        Responses are served from the persistent cache when caching applies:
+        deterministic requests (temperature 0) by default, sampled ones only
+        when opted in via ``use_cache=True`` or ``llm_cache_nonzero_temperature``.
+        Calls go through the shared rate scheduler; ``priority="interactive"``
+        is admitted ahead of background work. Identical requests already in
+        flight (from any LLMManager in the process) share that call.
+        Without an explicit provider or model, the ``task`` tag (e.g.
+        "commit_message", "analysis") picks a model tier via the model router.
+        With a ``request_context`` the call is aborted on cancellation or at
+        its deadline.
+        """
+        model_route = self._route(messages, provider, model, task)
+        provider, model = model_route.provider, model_route.model
+        llm = self._get_llm(provider, model)
+
+        key = None
+        if self._should_cache(temperature, use_cache):
+            key = make_request_key(provider, llm.model, temperature, max_tokens, messages, kwargs)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+        elif self.response_cache is not None:
+            self.response_cache.record_bypass()
+
+        async def call(candidate: str) -> LLMResponse:
+            llm = self._get_llm(candidate, model if candidate == provider else None)
+
+            async def attempt(target: BaseLLM) -> LLMResponse:
+                async with self.scheduler.slot(candidate, messages, max_tokens, priority) as reservation:
+                    with self.telemetry.span(candidate, llm.model, reservation.queue_time) as span:
+                        response = await target.generate(messages, temperature, max_tokens, **kwargs)
+                        span.set_usage(response.usage)
+                    reservation.actual_tokens = usage_tokens(response.usage)
+                    return response
+
+            if isinstance(llm, ResilientLLM):
+                # Retry outside the slot: every attempt pays rate budget, backoff holds no slot
+                return await llm.call(lambda: attempt(llm.llm))
+            return await attempt(llm)
+
+        async def route() -> LLMResponse:
+            served_by, response = await route_generate(
+                self._candidates(provider),
+                call,
+                self.routing_policy,
+                self.latency_tracker,
+            )
+            response.metadata = {**response.metadata, "provider": served_by, "tier": model_route.tier}
+
+            # Only cache answers from the requested provider under its key
+            if key is not None and served_by == provider:
+                self.response_cache.set(key, response)
+            return response
+
+        if self.coalescer is None:
+            return await run_in_context(request_context, route())
+
+        flight_key = key or make_request_key(provider, llm.model, temperature, max_tokens, messages, kwargs)
+        response, shared = await run_in_context(request_context, self.coalescer.run(flight_key, route))
+        # Each caller gets its own copy of the shared response
+        response = response.model_copy(deep=True)
+        if shared:
+            response.metadata["coalesced"] = True
+        return response
+
+    async def generate_many(
+        self,
+        message_lists: List[List[Message]],
+        concurrency: int = 4,
+        timeout: Optional[float] = None,
+        provider: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        use_batch_api: bool = False,
+        task: Optional[str] = None,
+        **kwargs
+    ) -> List[Union[LLMResponse, Exception]]:
+        """Generate responses for many requests with bounded concurrency.
+
+        Results are returned in input order. A failed item is returned as its
+        exception instead of failing the whole batch; items still running
+        when ``timeout`` expires are cancelled and returned as
+        ``asyncio.TimeoutError``. Cancelling the caller cancels every item.
+        With ``use_batch_api`` the provider's asynchronous batch job API is
+        used when it has one (cheaper, but results may take minutes); a batch
+        still running at ``timeout`` is cancelled and every item is returned
+        as ``asyncio.TimeoutError``.
+        ``task`` routes each item as in ``generate``; batch jobs ignore it
+        and go to ``provider`` (or the current one).
+        """
+        if not message_lists:
+            return []
+
+        llm = self._get_llm(provider or self.current_provider)
+
+        if use_batch_api and llm.supports_batch:
+            try:
+                # On timeout the job is cancelled, which cancels the remote batch too
+                return await asyncio.wait_for(
+                    llm.generate_batch(message_lists, temperature, max_tokens, **kwargs),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                return [asyncio.TimeoutError("generate_many deadline exceeded") for _ in message_lists]
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(messages: List[Message]) -> LLMResponse:
+            async with semaphore:
+                return await self.generate(
+                    messages,
+                    provider=provider,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    task=task,
+                    **kwargs
+                )
+
+        futures = [asyncio.ensure_future(run_one(messages)) for messages in message_lists]
+        try:
+            await asyncio.wait(futures, timeout=timeout)
+        finally:
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+            await asyncio.gather(*futures, return_exceptions=True)
+
+        results: List[Union[LLMResponse, Exception]] = []
+        for future in futures:
+            if future.cancelled():
+                results.append(asyncio.TimeoutError("generate_many deadline exceeded"))
+            elif future.exception() is not None:
+                results.append(future.exception())
+            else:
+                results.append(future.result())
+        return results
+
+    def _should_cache(self, temperature: float, use_cache: Optional[bool]) -> bool:
+        """Decide whether a generate call may use the response cache."""
+        if self.response_cache is None or use_cache is False:
+            return False
+        if use_cache:
+            return True
+        return temperature <= 0 or settings.llm_cache_nonzero_temperature
+
+    def clear_cache(self):
+        """Clear the persistent response cache."""
+        if self.response_cache is not None:
+            self.response_cache.clear()
 
     async def stream_generate(
         self,
@@ -86,22 +318,105 @@ class LLMManager:
         provider: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        priority: str = "background",
+        task: Optional[str] = None,
+        model: Optional[str] = None,
+        request_context: Optional[RequestContext] = None,
         **kwargs
     ) -> AsyncGenerator[str, None]:
-        """Stream generate a response using the specified or current provider."""
-        provider = provider or self.current_provider
-        llm = self._get_llm(provider)
-        async for chunk in llm.stream_generate(messages, temperature, max_tokens, **kwargs):
+        """Stream generate a response using the specified or current provider.
+
+        Falls back to the next provider in the routing chain if the stream
+        fails before its first token, and hedges on time-to-first-token.
+        Identical streams already in flight are shared: late subscribers
+        replay the chunks received so far, then follow the live stream.
+        ``task`` and ``model`` route the stream as in ``generate``. With a
+        ``request_context`` the stream is closed (releasing its connection
+        and rate-limit slot) on cancellation or at the deadline.
+        """
+        model_route = self._route(messages, provider, model, task)
+        provider, model = model_route.provider, model_route.model
+        llm = self._get_llm(provider, model)
+
+        def open_stream(candidate: str) -> AsyncGenerator[str, None]:
+            llm = self._get_llm(candidate, model if candidate == provider else None)
+
+            async def attempt(target: BaseLLM) -> AsyncGenerator[str, None]:
+                async with self.scheduler.slot(candidate, messages, max_tokens, priority) as reservation:
+                    with self.telemetry.span(candidate, llm.model, reservation.queue_time, stream=True) as span:
+                        def on_usage(usage: Dict[str, int]) -> None:
+                            reservation.actual_tokens = usage_tokens(usage)
+                            span.set_usage(usage)
+
+                        stream_kwargs = dict(kwargs)
+                        if target.reports_stream_usage:
+                            stream_kwargs["on_usage"] = on_usage
+                        text = []
+                        async for chunk in target.stream_generate(
+                            messages, temperature, max_tokens, **stream_kwargs
+                        ):
+                            span.chunk()
+                            text.append(chunk)
+                            yield chunk
+
+                        if not span.usage:
+                            # Provider reported no usage; estimate it for throughput stats
+                            span.set_usage({
+                                "input_tokens": estimate_prompt_tokens(messages, candidate),
+                                "output_tokens": count_tokens("".join(text), candidate, llm.model),
+                            })
+
+            if isinstance(llm, ResilientLLM):
+                # Reopen failed streams outside the slot, as in generate()
+                return llm.stream(lambda: attempt(llm.llm))
+            return attempt(llm)
+
+        def routed_stream() -> AsyncGenerator[str, None]:
+            return route_stream(
+                self._candidates(provider),
+                open_stream,
+                self.routing_policy,
+                self.latency_tracker,
+            )
+
+        if self.coalescer is None:
+            stream = routed_stream()
+        else:
+            flight_key = make_request_key(provider, llm.model, temperature, max_tokens, messages, kwargs)
+            stream = self.coalescer.stream(flight_key, routed_stream)
+
+        if request_context is not None:
+            stream = request_context.iterate(stream)
+
+        async for chunk in stream:
             yield chunk
 
+    async def warmup(self, providers: Optional[List[str]] = None, timeout: float = 10.0) -> Dict[str, bool]:
+        """Pre-open connections so the first request skips DNS/TCP/TLS setup.
+
+        Warms the current provider by default. Failures (missing API key,
+        network errors) are reported as False rather than raised.
+        """
+        providers = providers or [self.current_provider]
+
+        async def warm(provider: str) -> bool:
+            try:
+                return await asyncio.wait_for(self._get_llm(provider).warmup(), timeout)
+            except Exception:
+                return False
+
+        results = await asyncio.gather(*(warm(provider) for provider in providers))
+        return dict(zip(providers, results))
+
+    async def close(self) -> None:
+        """Close the running loop's pooled provider connections (e.g. on application shutdown)."""
+        openai_compat = sys.modules.get(f"{__package__}.openai_compat")
+        if openai_compat is not None:  # only loaded once an OpenAI-compatible provider was used
+            await openai_compat.close_http_client()
+
     def list_providers(self) -> List[str]:
         """List all available LLM providers."""
-        providers = ["claude", "openai"]
-        if GroqLLM is not None:
-            providers.append("groq")
-        if DeepInfraLLM is not None:
-            providers.append("deepinfra")
-        return providers
+        return installed_providers()
 
     def get_provider_info(self, provider: Optional[str] = None) -> dict:
         """Get information about the specified or current provider."""
@@ -109,5 +424,27 @@ class LLMManager:
         return {
             "provider": provider,
             "model": settings.get_model_name(provider),
-            "has_api_key": bool(settings.get_api_key(provider))
+            "has_api_key": bool(settings.get_api_key(provider)),
+            "cache": self.response_cache.stats() if self.response_cache is not None else None,
+            "fallback_chain": self._candidates(provider),
+            "hedging": self.routing_policy.hedging,
+            "rate_limits": self.scheduler.for_provider(provider).stats(),
+            "circuit_breaker": get_breaker(provider).stats(),
+            "coalescing": self.coalescer.stats() if self.coalescer is not None else None,
+            "recording": {"mode": self.record_mode, **self.recording.stats()} if self.recording is not None else None,
+            "model_tiers": self.model_router.tiers if self.model_router.enabled else None,
+            "telemetry": self.telemetry.stats(provider),
         }
+
+    def get_stats(self, provider: Optional[str] = None) -> Dict[str, dict]:
+        """Get latency, throughput and error stats per provider/model.
+
+        Covers every call made in this process: queue time, time to first
+        token, inter-token latency and duration (p50/p95/p99), tokens in/out
+        and errors by type.
+        """
+        return self.telemetry.stats(provider)
+
+    def get_metrics_text(self) -> str:
+        """Get all telemetry in the Prometheus text exposition format."""
+        return self.telemetry.prometheus_text()
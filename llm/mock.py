@@ -0,0 +1,157 @@
+"""Local mock LLM for offline load testing and benchmarks."""
+import asyncio
+import random
+import re
+from typing import AsyncGenerator, Dict, List, Optional
+
+from utils.tokenizer import count_tokens
+from .base import BaseLLM, Message, LLMResponse
+
+
+# Same section layout ErrorFixer asks for, so its parser can extract the fix
+ERROR_FIX_TEMPLATE = """### 1. 원인 분석
+Mock analysis of the reported error (call #{n}).
+
+### 2. 수정 방법
+Return the code unchanged; this response was generated by the mock provider.
+
+### 3. 수정된 코드
+```python
+{code}
+```
+
+### 4. 추가 작업
+없음
+"""
+
+DEFAULT_CODE = "print('mock response')"
+
+_CODE_BLOCK_PATTERN = re.compile(r"```python\s*\n(.+?)\n```", re.DOTALL)
+_STREAM_PIECE_PATTERN = re.compile(r"\s*\S+|\s+")
+
+
+class MockLLMError(Exception):
+    """Injected provider error; ``status_code`` makes it look transient to routing."""
+
+    def __init__(self, message: str, status_code: int = 529):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class MockLLM(BaseLLM):
+    """Deterministic, keyless LLM that simulates latency, streaming and errors.
+
+    Responses come from ``responses`` (cycled in order) or from ``template``,
+    formatted with ``{prompt}`` (last user message), ``{code}`` (last python
+    code block in the prompt, skipping ``[...]`` placeholders) and ``{n}``
+    (call number). Timing follows ``ttft``
+    and ``tokens_per_second``; ``error_rate`` injects errors from a seeded RNG
+    so runs are reproducible.
+    """
+
+    requires_api_key = False
+    reports_stream_usage = True
+
+    def __init__(
+        self,
+        api_key: str = "",
+        model: str = "mock-model",
+        ttft: float = 0.05,
+        tokens_per_second: float = 50.0,
+        error_rate: float = 0.0,
+        error_status_code: int = 529,
+        responses: Optional[List[str]] = None,
+        template: str = ERROR_FIX_TEMPLATE,
+        seed: Optional[int] = 0,
+    ):
+        super().__init__(api_key, model)
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_status_code = error_status_code
+        self.responses = list(responses) if responses else []
+        self.template = template
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    def _next_response(self, messages: List[Message]) -> str:
+        """Pick the scripted response or render the template for this call."""
+        self.calls += 1
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise MockLLMError(
+                f"Injected mock error (call #{self.calls})", status_code=self.error_status_code
+            )
+
+        if self.responses:
+            return self.responses[(self.calls - self.errors - 1) % len(self.responses)]
+
+        prompt = next((msg.content for msg in reversed(messages) if msg.role == "user"), "")
+        code_blocks = [
+            block for block in _CODE_BLOCK_PATTERN.findall(prompt)
+            if not block.strip().startswith("[")
+        ]
+        return self.template.format(
+            prompt=prompt,
+            code=code_blocks[-1] if code_blocks else DEFAULT_CODE,
+            n=self.calls,
+        )
+
+    def _usage(self, messages: List[Message], content: str) -> Dict[str, int]:
+        """Approximate usage in OpenAI-style keys."""
+        prompt_tokens = sum(count_tokens(msg.content, "mock", self.model) for msg in messages)
+        completion_tokens = count_tokens(content, "mock", self.model)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _pieces(self, content: str, max_tokens: Optional[int]) -> List[str]:
+        """Split content into stream chunks (one word-ish token each)."""
+        pieces = _STREAM_PIECE_PATTERN.findall(content)
+        return pieces[:max_tokens] if max_tokens else pieces
+
+    async def generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 4096,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate a mock response after the simulated latency."""
+        await asyncio.sleep(self.ttft)
+        content = "".join(self._pieces(self._next_response(messages), max_tokens))
+
+        if self.tokens_per_second > 0:
+            await asyncio.sleep(len(self._pieces(content, None)) / self.tokens_per_second)
+
+        return LLMResponse(
+            content=content,
+            model=self.model,
+            usage=self._usage(messages, content),
+            metadata={"finish_reason": "stop"}
+        )
+
+    async def stream_generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 4096,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Stream a mock response at the configured rate."""
+        on_usage = kwargs.pop("on_usage", None)
+        await asyncio.sleep(self.ttft)
+        pieces = self._pieces(self._next_response(messages), max_tokens)
+        interval = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+
+        for i, piece in enumerate(pieces):
+            if i and interval:
+                await asyncio.sleep(interval)
+            yield piece
+
+        if on_usage is not None:
+            on_usage(self._usage(messages, "".join(pieces)))
@@ -0,0 +1,92 @@
+"""Per-call model tier selection by task type, prompt size and observed latency."""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from .telemetry import Telemetry
+
+
+STANDARD_TIER = "standard"
+
+
+@dataclass
+class ModelRoute:
+    """Where one call is sent."""
+    provider: str
+    model: Optional[str] = None  # None = the provider's configured model
+    tier: str = STANDARD_TIER
+
+
+def parse_tier_entry(entry: str) -> Tuple[str, Optional[str]]:
+    """Split ``"provider:model"`` (or just ``"provider"``) into its parts."""
+    provider, _, model = entry.partition(":")
+    return provider.strip(), model.strip() or None
+
+
+@dataclass
+class ModelRouter:
+    """Pick a provider/model tier for a tagged task.
+
+    Each task tag maps to a tier ("fast", "standard", "strong"); "standard"
+    is the current provider. Prompts too large for the fast tier are
+    promoted to "standard". Within a tier, available models are ranked by
+    their observed median time to first token; models without enough
+    samples are tried first so they get measured, in configured order.
+    """
+    tiers: Dict[str, List[str]] = field(default_factory=dict)
+    task_tiers: Dict[str, str] = field(default_factory=dict)
+    fast_max_prompt_tokens: int = 4000
+    min_samples: int = 5
+    enabled: bool = True
+
+    @classmethod
+    def from_settings(cls) -> "ModelRouter":
+        """Build the router from application settings."""
+        return cls(
+            tiers=settings.llm_model_tiers,
+            task_tiers=settings.llm_task_tiers,
+            fast_max_prompt_tokens=settings.llm_fast_tier_max_prompt_tokens,
+            min_samples=settings.llm_routing_min_samples,
+            enabled=settings.llm_model_routing_enabled,
+        )
+
+    def tier_for(self, task: Optional[str], prompt_tokens: int) -> str:
+        """Tier for a task tag and prompt size."""
+        if not self.enabled or task is None:
+            return STANDARD_TIER
+        tier = self.task_tiers.get(task, STANDARD_TIER)
+        if tier == "fast" and prompt_tokens > self.fast_max_prompt_tokens:
+            return STANDARD_TIER
+        return tier
+
+    def choose(
+        self,
+        task: Optional[str],
+        prompt_tokens: int,
+        default_provider: str,
+        available: Callable[[str], bool],
+        telemetry: Telemetry,
+        model_name: Optional[Callable[[str, Optional[str]], str]] = None,
+    ) -> ModelRoute:
+        """Route a call; falls back to the default provider when no tier model is available.
+
+        ``model_name(provider, model)`` resolves the model name telemetry is
+        recorded under (default: the configured model).
+        """
+        model_name = model_name or (lambda provider, model: model or settings.get_model_name(provider))
+        tier = self.tier_for(task, prompt_tokens)
+        candidates = [
+            parse_tier_entry(entry) for entry in self.tiers.get(tier, [])
+        ] if tier != STANDARD_TIER else []
+        candidates = [(provider, model) for provider, model in candidates if available(provider)]
+        if not candidates:
+            return ModelRoute(default_provider)
+
+        def observed_ttft(candidate: Tuple[str, Optional[str]]) -> float:
+            provider, model = candidate
+            p50 = telemetry.percentile(provider, model_name(provider, model), "ttft", 0.5, self.min_samples)
+            return -1.0 if p50 is None else p50
+
+        # min() keeps the first of equals, so unmeasured models go in configured order
+        provider, model = min(candidates, key=observed_ttft)
+        return ModelRoute(provider, model, tier)
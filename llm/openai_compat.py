@@ -0,0 +1,156 @@
+"""Shared transport for OpenAI-compatible providers (OpenAI, Groq, DeepInfra)."""
+import asyncio
+import importlib.util
+from typing import AsyncGenerator, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from config import settings
+from .base import BaseLLM, Message, LLMResponse
+
+
+# One pooled client per event loop: httpx connections are bound to the loop they were opened on
+_http_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the pooled HTTP client of the running event loop.
+
+    One client per loop is shared by every OpenAI-compatible provider so
+    keep-alive connections (and their TLS sessions) are reused across
+    requests and LLMManager instances. Connections are pooled per host.
+    Clients of loops that have since closed are dropped.
+    """
+    loop = asyncio.get_running_loop()
+    for stale in [other for other in _http_clients if other.is_closed()]:
+        del _http_clients[stale]
+
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=settings.llm_http2 and http2_available(),
+            limits=httpx.Limits(
+                max_connections=settings.llm_http_max_connections,
+                max_keepalive_connections=settings.llm_http_max_keepalive,
+                keepalive_expiry=settings.llm_http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.llm_http_timeout, connect=settings.llm_http_connect_timeout),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running loop's HTTP client (e.g. on application shutdown)."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+class OpenAICompatibleLLM(BaseLLM):
+    """Base class for providers that speak the OpenAI chat completions API.
+
+    Subclasses only set ``base_url`` (``None`` for api.openai.com) and their
+    default model. Providers that accept ``stream_options`` set
+    ``reports_stream_usage``; for the rest usage is not requested and
+    LLMManager estimates it.
+    """
+
+    base_url: Optional[str] = None
+
+    def __init__(self, api_key: str, model: str):
+        super().__init__(api_key, model)
+        self._client: Optional[AsyncOpenAI] = None
+        self._client_transport: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """SDK client on the running loop's pooled HTTP client."""
+        http_client = get_http_client()
+        if self._client is None or self._client_transport is not http_client:
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=http_client,
+            )
+            self._client_transport = http_client
+        return self._client
+
+    async def warmup(self) -> bool:
+        """Open a pooled connection (DNS, TCP, TLS) with a cheap models request."""
+        try:
+            await self.client.models.list()
+            return True
+        except Exception:
+            return False
+
+    async def generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 4096,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate a response through the chat completions API."""
+        formatted_messages = self.format_messages(messages)
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=formatted_messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+
+        return LLMResponse(
+            content=response.choices[0].message.content,
+            model=response.model,
+            usage={
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+            },
+            metadata={"finish_reason": response.choices[0].finish_reason}
+        )
+
+    async def stream_generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 4096,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Stream generate a response through the chat completions API.
+
+        When the provider reports stream usage, it arrives in a final chunk
+        without choices and is passed to ``on_usage`` when given.
+        """
+        on_usage = kwargs.pop("on_usage", None)
+        formatted_messages = self.format_messages(messages)
+        if self.reports_stream_usage:
+            kwargs["stream_options"] = {"include_usage": True}
+
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=formatted_messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **kwargs
+        )
+
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if on_usage is not None and getattr(chunk, "usage", None):
+                on_usage({
+                    "prompt_tokens": chunk.usage.prompt_tokens,
+                    "completion_tokens": chunk.usage.completion_tokens,
+                    "total_tokens": chunk.usage.total_tokens,
+                })
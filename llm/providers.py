@@ -0,0 +1,61 @@
+"""Provider registry with lazy imports.
+
+Provider modules import their SDKs (anthropic, openai, groq) at module
+level, so they are only imported here when a provider is first used.
+"""
+import importlib
+import importlib.util
+from typing import Dict, List, Tuple, Type
+
+from .base import BaseLLM
+
+
+# provider -> (module, class name, SDK package the module needs)
+PROVIDERS: Dict[str, Tuple[str, str, str]] = {
+    "claude": ("llm.claude", "ClaudeLLM", "anthropic"),
+    "openai": ("llm.openai_llm", "OpenAILLM", "openai"),
+    "groq": ("llm.groq", "GroqLLM", "openai"),
+    "deepinfra": ("llm.deepinfra", "DeepInfraLLM", "openai"),
+    "mock": ("llm.mock", "MockLLM", ""),
+}
+
+_classes: Dict[str, Type[BaseLLM]] = {}
+
+
+def is_installed(provider: str) -> bool:
+    """Check whether a provider's SDK is installed, without importing it."""
+    if provider not in PROVIDERS:
+        return False
+    sdk = PROVIDERS[provider][2]
+    return not sdk or importlib.util.find_spec(sdk) is not None
+
+
+def installed_providers() -> List[str]:
+    """List providers whose SDKs are installed."""
+    return [provider for provider in PROVIDERS if is_installed(provider)]
+
+
+def load_provider_class(provider: str) -> Type[BaseLLM]:
+    """Import and return the LLM class for a provider.
+
+    Raises:
+        ValueError: If the provider is unknown or its SDK is not installed
+    """
+    if provider in _classes:
+        return _classes[provider]
+
+    if provider not in PROVIDERS:
+        available = ", ".join(installed_providers())
+        raise ValueError(f"Provider '{provider}' not available. Available providers: {available}")
+
+    module_name, class_name, _ = PROVIDERS[provider]
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        available = ", ".join(installed_providers())
+        raise ValueError(
+            f"Provider '{provider}' not available ({e}). Available providers: {available}"
+        ) from e
+
+    _classes[provider] = getattr(module, class_name)
+    return _classes[provider]
@@ -0,0 +1,228 @@
+"""Record/replay of LLM traffic for reproducible offline runs.
+
+In record mode every provider call is passed through and its request key,
+response and latency are appended to a JSONL store (gzip-compressed when
+the path ends in ``.gz``). Streams are stored as ``[offset, chunk]`` pairs
+with their original timings. In replay mode the store is served back with
+the recorded latency multiplied by ``time_scale`` (0 = no delay).
+"""
+import asyncio
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from config import settings
+from .base import BaseLLM, Message, LLMResponse
+from .cache import make_request_key
+
+
+RECORD_MODES = ("off", "record", "replay")
+
+
+class ReplayMissError(LookupError):
+    """No recording matches the request."""
+
+
+def _request_key(
+    provider: str,
+    model: str,
+    messages: List[Message],
+    temperature: float,
+    max_tokens: Optional[int],
+    kwargs: Dict[str, Any],
+) -> str:
+    # Callbacks (on_usage) are not part of the request
+    extra = {name: value for name, value in kwargs.items() if not callable(value)}
+    return make_request_key(provider, model, temperature, max_tokens, messages, extra)
+
+
+class Recording:
+    """Append-only JSONL store of recorded request/response pairs."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._replay_index: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def _open(self, mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._entries is None:
+            self._entries = defaultdict(list)
+            if self.path.exists():
+                with self._open("r") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self._entries[entry["key"]].append(entry)
+        return self._entries
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Add an entry and append it to the store."""
+        with self._lock:
+            self._load()[entry["key"]].append(entry)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._open("a") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def next(self, key: str, kind: str) -> Dict[str, Any]:
+        """Get the next recording for a key; repeated requests replay in order and wrap around."""
+        with self._lock:
+            entries = [e for e in self._load().get(key, []) if e["kind"] == kind]
+            if not entries:
+                raise ReplayMissError(f"No recorded {kind} response for request {key[:12]}")
+            index = self._replay_index[(key, kind)]
+            self._replay_index[(key, kind)] = index + 1
+            return entries[index % len(entries)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get recording statistics."""
+        entries = self._load()
+        return {
+            "path": str(self.path),
+            "requests": len(entries),
+            "entries": sum(len(items) for items in entries.values()),
+        }
+
+
+class RecordingLLM(BaseLLM):
+    """Pass calls through to a provider and record them."""
+
+    def __init__(self, llm: BaseLLM, provider: str, recording: Recording):
+        super().__init__(llm.api_key, llm.model)
+        self.llm = llm
+        self.provider = provider
+        self.recording = recording
+        self.reports_stream_usage = llm.reports_stream_usage
+
+    def _key(self, messages, temperature, max_tokens, kwargs) -> str:
+        return _request_key(self.provider, self.model, messages, temperature, max_tokens, kwargs)
+
+    async def generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate through the provider and record the response and latency."""
+        started = time.monotonic()
+        response = await self.llm.generate(messages, temperature, max_tokens, **kwargs)
+        self.recording.append({
+            "key": self._key(messages, temperature, max_tokens, kwargs),
+            "kind": "generate",
+            "provider": self.provider,
+            "latency": round(time.monotonic() - started, 4),
+            "response": response.model_dump(),
+        })
+        return response
+
+    async def stream_generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Stream through the provider and record each chunk with its offset."""
+        key = self._key(messages, temperature, max_tokens, kwargs)
+        usage: Dict[str, int] = {}
+        on_usage = kwargs.pop("on_usage", None)
+        if on_usage is not None:
+            def on_usage_recorded(reported: Dict[str, int]) -> None:
+                usage.update(reported)
+                on_usage(reported)
+            kwargs["on_usage"] = on_usage_recorded
+
+        started = time.monotonic()
+        chunks = []
+        async for chunk in self.llm.stream_generate(messages, temperature, max_tokens, **kwargs):
+            chunks.append([round(time.monotonic() - started, 4), chunk])
+            yield chunk
+
+        # Only complete streams are recorded
+        self.recording.append({
+            "key": key,
+            "kind": "stream",
+            "provider": self.provider,
+            "latency": round(time.monotonic() - started, 4),
+            "chunks": chunks,
+            "usage": usage,
+        })
+
+    async def warmup(self) -> bool:
+        return await self.llm.warmup()
+
+
+class ReplayLLM(BaseLLM):
+    """Serve recorded responses with recorded (optionally scaled) latency."""
+
+    requires_api_key = False
+    reports_stream_usage = True
+
+    def __init__(self, provider: str, model: str, recording: Recording, time_scale: float = 1.0):
+        super().__init__("", model)
+        self.provider = provider
+        self.recording = recording
+        self.time_scale = time_scale
+
+    def _next(self, kind, messages, temperature, max_tokens, kwargs) -> Dict[str, Any]:
+        key = _request_key(self.provider, self.model, messages, temperature, max_tokens, kwargs)
+        return self.recording.next(key, kind)
+
+    async def generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Return the recorded response after the recorded latency."""
+        entry = self._next("generate", messages, temperature, max_tokens, kwargs)
+        if self.time_scale > 0:
+            await asyncio.sleep(entry["latency"] * self.time_scale)
+
+        response = LLMResponse(**entry["response"])
+        response.metadata = {**response.metadata, "replayed": True}
+        return response
+
+    async def stream_generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Yield the recorded chunks at their recorded offsets."""
+        on_usage = kwargs.pop("on_usage", None)
+        entry = self._next("stream", messages, temperature, max_tokens, kwargs)
+
+        started = time.monotonic()
+        for offset, chunk in entry["chunks"]:
+            if self.time_scale > 0:
+                delay = offset * self.time_scale - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield chunk
+
+        if on_usage is not None and entry.get("usage"):
+            on_usage(entry["usage"])
+
+
+_recordings: Dict[Path, Recording] = {}
+
+
+def get_recording(path: Optional[Path] = None) -> Recording:
+    """Get the shared Recording for a path (default: ``llm_record_path``)."""
+    path = Path(path or settings.llm_record_path)
+    if path not in _recordings:
+        _recordings[path] = Recording(path)
+    return _recordings[path]
@@ -0,0 +1,290 @@
+"""Retries with backoff and per-provider circuit breakers for LLM calls."""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from config import settings
+from .base import BaseLLM, Message, LLMResponse
+from .routing import is_retryable_error
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """The provider's circuit breaker is open; the call was not sent."""
+    status_code = 503
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait (Retry-After / retry-after-ms), if any."""
+    value = getattr(error, "retry_after", None)
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return float(milliseconds) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring Retry-After."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """Build the policy from application settings."""
+        return cls(
+            max_attempts=settings.llm_retry_max_attempts,
+            base_delay=settings.llm_retry_base_delay,
+            max_delay=settings.llm_retry_max_delay,
+        )
+
+    def delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """Seconds to wait before retry number ``attempt`` (1-based), or None to give up.
+
+        Gives up on fatal errors, after the last attempt, and when the
+        provider asks for a longer wait than ``max_delay`` (failing over to
+        another provider is better than waiting).
+        """
+        if attempt >= self.max_attempts or not is_retryable_error(error):
+            return None
+
+        # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+        jittered = self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        requested = retry_after(error)
+        if requested is None:
+            return jittered
+        if requested > self.max_delay:
+            return None
+        return max(requested, jittered)
+
+
+class CircuitBreaker:
+    """Stop sending traffic to a provider after repeated transient failures.
+
+    Closed: calls pass; ``failure_threshold`` consecutive failures open it.
+    Open: calls are rejected until ``recovery_timeout`` has passed.
+    Half-open: one trial call is let through; success closes the breaker,
+    failure opens it again.
+    """
+
+    def __init__(self, provider: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._stats = {"failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def available(self) -> bool:
+        """Whether routing should send new traffic here."""
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._trial_in_flight)
+
+    def allow(self) -> bool:
+        """Admit a call (the half-open trial call included)."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self._stats["rejected"] += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._stats["failures"] += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._trial_in_flight:
+                self._stats["opened"] += 1
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed (cancelled, fatal error)."""
+        self._trial_in_flight = False
+
+    def stats(self) -> Dict:
+        return {"state": self.state, "consecutive_failures": self.failures, **self._stats}
+
+
+class ResilientLLM(BaseLLM):
+    """Retry transient errors and guard a provider with its circuit breaker.
+
+    Streams are retried only until their first chunk; after that an error
+    propagates, since the caller has already seen part of the response.
+    Fatal errors (bad request, auth) are raised at once and do not count
+    against the breaker.
+    """
+
+    def __init__(self, llm: BaseLLM, breaker: CircuitBreaker, policy: RetryPolicy):
+        super().__init__(llm.api_key, llm.model)
+        self.llm = llm
+        self.breaker = breaker
+        self.policy = policy
+        self.reports_stream_usage = llm.reports_stream_usage
+        self.supports_batch = llm.supports_batch
+        self.retries = 0
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker open for provider: {self.breaker.provider}")
+
+    async def _backoff(self, attempt: int, error: Exception) -> None:
+        """Record a failure and sleep before the next attempt, or re-raise."""
+        if not is_retryable_error(error):
+            self.breaker.release()
+            raise error
+        self.breaker.record_failure()
+        delay = self.policy.delay(attempt, error)
+        if delay is None:
+            raise error
+        self.retries += 1
+        await asyncio.sleep(delay)
+
+    async def call(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        """Await ``attempt()`` with retries.
+
+        ``attempt`` is called afresh for every try, so per-attempt work such
+        as taking a rate-limit slot is repeated and not held while backing off.
+        """
+        attempts = 0
+        while True:
+            attempts += 1
+            self._admit()
+            try:
+                result = await attempt()
+            except Exception as e:
+                await self._backoff(attempts, e)
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            if attempts > 1 and isinstance(result, LLMResponse):
+                result.metadata = {**result.metadata, "attempts": attempts}
+            return result
+
+    async def stream(self, open_stream: Callable[[], AsyncGenerator[str, None]]) -> AsyncGenerator[str, None]:
+        """Iterate ``open_stream()``, reopening it on errors until the first chunk arrives."""
+        attempts = 0
+        while True:
+            attempts += 1
+            self._admit()
+            stream = open_stream()
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                self.breaker.record_success()
+                return
+            except Exception as e:
+                await stream.aclose()
+                await self._backoff(attempts, e)
+                continue
+            except BaseException:
+                self.breaker.release()
+                await stream.aclose()
+                raise
+            self.breaker.record_success()
+            break
+
+        try:
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate with retries."""
+        return await self.call(lambda: self.llm.generate(messages, temperature, max_tokens, **kwargs))
+
+    async def stream_generate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Stream with retries until the first chunk arrives."""
+        stream = self.stream(lambda: self.llm.stream_generate(messages, temperature, max_tokens, **kwargs))
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def generate_batch(self, message_lists, temperature=0.7, max_tokens=None, **kwargs):
+        return await self.llm.generate_batch(message_lists, temperature, max_tokens, **kwargs)
+
+    async def warmup(self) -> bool:
+        return await self.llm.warmup()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a provider."""
+    if provider not in _breakers:
+        _breakers[provider] = CircuitBreaker(
+            provider,
+            failure_threshold=settings.llm_breaker_failure_threshold,
+            recovery_timeout=settings.llm_breaker_recovery_timeout,
+        )
+    return _breakers[provider]
@@ -0,0 +1,244 @@
+"""Routing policy for provider failover and hedged requests."""
+import asyncio
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from config import settings
+
+
+# HTTP status codes worth retrying on another provider
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+# SDK exception class names (anthropic, openai, groq) raised for transport failures
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "OverloadedError", "CircuitOpenError"}
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Check whether an error is transient (rate limit, overload, 5xx, network)."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        response = getattr(error, "response", None)
+        status_code = getattr(response, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in RETRYABLE_STATUS_CODES
+
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies per provider."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[Tuple[str, str], Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.window)
+        )
+
+    def record(self, provider: str, kind: str, seconds: float) -> None:
+        """Record a latency sample ("total" or "ttft")."""
+        self._samples[(provider, kind)].append(seconds)
+
+    def percentile(self, provider: str, kind: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """Get the q-th percentile (0-1) or None without enough samples."""
+        samples = self._samples.get((provider, kind))
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+
+@dataclass
+class RoutingPolicy:
+    """Ordered fallback chain plus optional hedging."""
+    fallback_chain: List[str] = field(default_factory=list)
+    failover: bool = True
+    hedging: bool = False
+    hedge_delay: float = 8.0
+    hedge_ttft_delay: float = 3.0
+    hedge_percentile: float = 0.95
+    min_samples: int = 20
+
+    @classmethod
+    def from_settings(cls) -> "RoutingPolicy":
+        """Build the policy from application settings."""
+        return cls(
+            fallback_chain=settings.fallback_providers,
+            failover=settings.llm_failover_enabled,
+            hedging=settings.llm_hedging_enabled,
+            hedge_delay=settings.llm_hedge_delay,
+            hedge_ttft_delay=settings.llm_hedge_ttft_delay,
+            hedge_percentile=settings.llm_hedge_percentile,
+        )
+
+    def candidates(self, primary: str, available: Callable[[str], bool]) -> List[str]:
+        """Providers to try in order, starting with the primary."""
+        providers = [primary]
+        if self.failover:
+            providers += [p for p in self.fallback_chain if p != primary and available(p)]
+        return providers
+
+    def hedge_after(self, provider: str, kind: str, tracker: LatencyTracker) -> Optional[float]:
+        """Seconds to wait before starting a hedge, or None if hedging is off."""
+        if not self.hedging:
+            return None
+        observed = tracker.percentile(provider, kind, self.hedge_percentile, self.min_samples)
+        if observed is not None:
+            return observed
+        return self.hedge_ttft_delay if kind == "ttft" else self.hedge_delay
+
+
+async def _cancel_all(tasks) -> None:
+    """Cancel tasks and wait for them to finish unwinding."""
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def route_generate(
+    providers: List[str],
+    call: Callable[[str], Awaitable[Any]],
+    policy: RoutingPolicy,
+    tracker: LatencyTracker,
+) -> Tuple[str, Any]:
+    """Run ``call`` across providers with failover and optional hedging.
+
+    Returns the (provider, result) of the first successful attempt. Losing
+    attempts are cancelled. Non-retryable errors propagate immediately; if
+    every provider fails, the last error is raised.
+    """
+    queue = list(providers)
+    running: Dict[asyncio.Task, Tuple[str, float]] = {}
+    last_error: Optional[BaseException] = None
+
+    def start_next() -> None:
+        provider = queue.pop(0)
+        running[asyncio.ensure_future(call(provider))] = (provider, time.monotonic())
+
+    try:
+        while queue or running:
+            if not running:
+                start_next()
+
+            timeout = None
+            if queue and len(running) == 1:
+                provider, started = next(iter(running.values()))
+                hedge_after = policy.hedge_after(provider, "total", tracker)
+                if hedge_after is not None:
+                    timeout = max(0.0, hedge_after - (time.monotonic() - started))
+
+            done, _ = await asyncio.wait(
+                running.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                # Primary is slower than its p95: start a hedge on the next provider
+                start_next()
+                continue
+
+            for task in done:
+                provider, started = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    tracker.record(provider, "total", time.monotonic() - started)
+                    return provider, task.result()
+                if not is_retryable_error(error):
+                    raise error
+                last_error = error
+    finally:
+        await _cancel_all(list(running))
+
+    raise last_error
+
+
+async def _first_chunk(stream: AsyncGenerator[str, None]) -> Tuple[bool, Optional[str]]:
+    """Await the first chunk of a stream; (False, None) if it is empty."""
+    try:
+        return True, await stream.__anext__()
+    except StopAsyncIteration:
+        return False, None
+
+
+async def route_stream(
+    providers: List[str],
+    open_stream: Callable[[str], AsyncGenerator[str, None]],
+    policy: RoutingPolicy,
+    tracker: LatencyTracker,
+) -> AsyncGenerator[str, None]:
+    """Stream from the first provider to produce a token.
+
+    Failover and hedging only apply until the first token arrives; hedging is
+    keyed on time-to-first-token. Once a stream wins, the others are cancelled
+    and closed, and later errors propagate to the caller.
+    """
+    queue = list(providers)
+    running: Dict[asyncio.Task, Tuple[str, AsyncGenerator[str, None], float]] = {}
+    last_error: Optional[BaseException] = None
+    winner: Optional[AsyncGenerator[str, None]] = None
+    first: Tuple[bool, Optional[str]] = (False, None)
+
+    def start_next() -> None:
+        provider = queue.pop(0)
+        stream = open_stream(provider)
+        task = asyncio.ensure_future(_first_chunk(stream))
+        running[task] = (provider, stream, time.monotonic())
+
+    async def close_losers() -> None:
+        await _cancel_all(list(running))
+        for _, stream, _ in running.values():
+            await stream.aclose()
+        running.clear()
+
+    try:
+        while winner is None and (queue or running):
+            if not running:
+                start_next()
+
+            timeout = None
+            if queue and len(running) == 1:
+                provider, _, started = next(iter(running.values()))
+                hedge_after = policy.hedge_after(provider, "ttft", tracker)
+                if hedge_after is not None:
+                    timeout = max(0.0, hedge_after - (time.monotonic() - started))
+
+            done, _ = await asyncio.wait(
+                running.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                start_next()
+                continue
+
+            for task in done:
+                provider, stream, started = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    tracker.record(provider, "ttft", time.monotonic() - started)
+                    winner, first = stream, task.result()
+                    break
+                await stream.aclose()
+                if not is_retryable_error(error):
+                    raise error
+                last_error = error
+    finally:
+        await close_losers()
+
+    if winner is None:
+        raise last_error
+
+    has_chunk, chunk = first
+    if not has_chunk:
+        return
+
+    try:
+        yield chunk
+        async for chunk in winner:
+            yield chunk
+    finally:
+        await winner.aclose()
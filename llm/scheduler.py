@@ -0,0 +1,245 @@
+"""Per-provider rate scheduler with token buckets and priority queueing."""
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+from config import settings
+from utils.tokenizer import count_tokens
+from .base import Message
+
+
+# Lower rank is served first; FIFO within the same rank
+PRIORITIES = {"interactive": 0, "background": 1}
+
+DEFAULT_OUTPUT_TOKENS = 1024
+
+
+def estimate_prompt_tokens(messages: List[Message], provider: str = "") -> int:
+    """Estimate prompt size with the provider's local tokenizer (plus per-message overhead)."""
+    return sum(count_tokens(msg.content, provider) + 4 for msg in messages)
+
+
+def usage_tokens(usage: Dict[str, int]) -> Optional[int]:
+    """Total tokens from provider usage, whatever naming the provider uses."""
+    if not usage:
+        return None
+    if "total_tokens" in usage:
+        return usage["total_tokens"]
+    if "input_tokens" in usage or "output_tokens" in usage:
+        return usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+    if "prompt_tokens" in usage or "completion_tokens" in usage:
+        return usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+    return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: int):
+        self.capacity = float(rate_per_minute)
+        self.level = float(rate_per_minute)
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.capacity / 60.0)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be consumed (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.capacity
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Refund (positive) or charge (negative) tokens after the fact."""
+        self._refill()
+        self.level = min(self.capacity, self.level + delta)
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    tokens: int = field(compare=False)
+    event: asyncio.Event = field(compare=False, default_factory=asyncio.Event)
+
+
+@dataclass
+class Reservation:
+    """Admission ticket for one request."""
+    provider: str
+    estimated_tokens: int
+    priority: str
+    queue_time: float = 0.0
+    actual_tokens: Optional[int] = None
+
+
+class ProviderScheduler:
+    """Requests-per-minute, tokens-per-minute and concurrency limits for one provider."""
+
+    def __init__(self, provider: str, rpm: int = 0, tpm: int = 0, max_concurrency: int = 0):
+        self.provider = provider
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.estimate_ratio = 1.0  # actual / estimated tokens, learned from usage
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._stats = {"admitted": 0, "queued_seconds": 0.0}
+
+    def _admission_delay(self, tokens: int) -> Optional[float]:
+        """0 if the request can start now, seconds to wait, or None to wait for a release."""
+        if self.max_concurrency and self.active >= self.max_concurrency:
+            return None
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.wait_time(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.wait_time(tokens))
+        return delay
+
+    def _wake_head(self) -> None:
+        if self._queue:
+            self._queue[0].event.set()
+
+    async def acquire(self, tokens: int, priority: str = "background") -> Reservation:
+        """Wait for a slot; interactive work is admitted before background work."""
+        tokens = int(tokens * self.estimate_ratio)
+        waiter = _Waiter(PRIORITIES.get(priority, PRIORITIES["background"]), next(self._seq), tokens)
+        heapq.heappush(self._queue, waiter)
+        enqueued_at = time.monotonic()
+
+        try:
+            while True:
+                delay = None
+                if self._queue[0] is waiter:
+                    delay = self._admission_delay(tokens)
+                    if delay == 0:
+                        heapq.heappop(self._queue)
+                        break
+
+                waiter.event.clear()
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+            self._wake_head()
+            raise
+
+        if self.requests is not None:
+            self.requests.consume(1)
+        if self.tokens is not None:
+            self.tokens.consume(tokens)
+        self.active += 1
+
+        queue_time = time.monotonic() - enqueued_at
+        self._stats["admitted"] += 1
+        self._stats["queued_seconds"] += queue_time
+        self._wake_head()
+        return Reservation(self.provider, tokens, priority, queue_time)
+
+    def release(self, reservation: Reservation, actual_tokens: Optional[int] = None) -> None:
+        """Free the slot and reconcile the token budget with real usage."""
+        self.active = max(0, self.active - 1)
+
+        if actual_tokens is not None and reservation.estimated_tokens > 0:
+            if self.tokens is not None:
+                self.tokens.adjust(reservation.estimated_tokens - actual_tokens)
+            # Exponential moving average keeps estimates close to what providers bill
+            ratio = actual_tokens / reservation.estimated_tokens
+            self.estimate_ratio = 0.8 * self.estimate_ratio + 0.2 * max(0.1, min(ratio * self.estimate_ratio, 10.0))
+
+        self._wake_head()
+
+    def stats(self) -> Dict:
+        """Get current queue and budget state."""
+        return {
+            "active": self.active,
+            "queued": len(self._queue),
+            "rpm_available": round(self.requests.level, 1) if self.requests else None,
+            "tpm_available": round(self.tokens.level, 1) if self.tokens else None,
+            "estimate_ratio": round(self.estimate_ratio, 3),
+            **self._stats,
+        }
+
+
+class RateScheduler:
+    """Process-wide registry of per-provider schedulers."""
+
+    def __init__(
+        self,
+        rpm_limits: Optional[Dict[str, int]] = None,
+        tpm_limits: Optional[Dict[str, int]] = None,
+        max_concurrency: int = 0,
+    ):
+        self.rpm_limits = rpm_limits or {}
+        self.tpm_limits = tpm_limits or {}
+        self.max_concurrency = max_concurrency
+        self._providers: Dict[str, ProviderScheduler] = {}
+
+    def for_provider(self, provider: str) -> ProviderScheduler:
+        """Get or create the scheduler for a provider."""
+        if provider not in self._providers:
+            self._providers[provider] = ProviderScheduler(
+                provider,
+                rpm=self.rpm_limits.get(provider, 0),
+                tpm=self.tpm_limits.get(provider, 0),
+                max_concurrency=self.max_concurrency,
+            )
+        return self._providers[provider]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        messages: List[Message],
+        max_tokens: Optional[int],
+        priority: str = "background",
+    ) -> AsyncIterator[Reservation]:
+        """Hold a rate-limited slot for the duration of one request.
+
+        Set ``reservation.actual_tokens`` inside the block to reconcile the
+        budget with the usage the provider reported.
+        """
+        scheduler = self.for_provider(provider)
+        estimated = estimate_prompt_tokens(messages, provider) + (max_tokens or DEFAULT_OUTPUT_TOKENS)
+        reservation = await scheduler.acquire(estimated, priority)
+        try:
+            yield reservation
+        finally:
+            scheduler.release(reservation, reservation.actual_tokens)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Get stats for every provider seen so far."""
+        return {provider: s.stats() for provider, s in self._providers.items()}
+
+
+_scheduler: Optional[RateScheduler] = None
+
+
+def get_scheduler() -> RateScheduler:
+    """Get the process-wide RateScheduler shared by all LLMManager instances."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RateScheduler(
+            rpm_limits=settings.llm_rpm_limits,
+            tpm_limits=settings.llm_tpm_limits,
+            max_concurrency=settings.llm_max_concurrency,
+        )
+    return _scheduler
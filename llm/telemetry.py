@@ -0,0 +1,326 @@
+"""Per-provider latency, throughput and error telemetry.
+
+Every provider call made by LLMManager is tracked with a ``RequestSpan``:
+queue time (rate scheduler), time to first token, inter-token latency,
+total duration, tokens in/out and errors. Samples are aggregated per
+provider/model into histograms that keep cumulative bucket counts (for the
+Prometheus text format) and a rolling window of recent samples (for
+percentiles in ``stats()``).
+"""
+import bisect
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+INTER_TOKEN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# metric -> (buckets, help text)
+HISTOGRAMS = {
+    "queue_time": (LATENCY_BUCKETS, "Time spent waiting for the rate scheduler"),
+    "ttft": (LATENCY_BUCKETS, "Time to first token (or full response for non-streaming calls)"),
+    "inter_token": (INTER_TOKEN_BUCKETS, "Latency between streamed chunks"),
+    "duration": (LATENCY_BUCKETS, "Total request duration"),
+}
+
+
+class RollingHistogram:
+    """Cumulative bucket counts plus a rolling window of recent samples."""
+
+    def __init__(self, buckets: Sequence[float], window: int = 1000):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last bucket is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+        self.recent.append(value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q-th percentile (0-1) of the recent window."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4) if self.count else None,
+            "p50": self._round(self.percentile(0.5)),
+            "p95": self._round(self.percentile(0.95)),
+            "p99": self._round(self.percentile(0.99)),
+        }
+
+    @staticmethod
+    def _round(value: Optional[float]) -> Optional[float]:
+        return round(value, 4) if value is not None else None
+
+
+class ProviderMetrics:
+    """Aggregated metrics for one provider/model."""
+
+    def __init__(self, window: int = 1000):
+        self.histograms = {
+            name: RollingHistogram(buckets, window) for name, (buckets, _) in HISTOGRAMS.items()
+        }
+        self.requests = 0
+        self.streams = 0
+        self.cancelled = 0
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.generation_seconds = 0.0  # time spent producing output tokens
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "streams": self.streams,
+            "cancelled": self.cancelled,
+            "errors": dict(self.errors),
+            "error_rate": round(sum(self.errors.values()) / self.requests, 4) if self.requests else 0.0,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "output_tokens_per_second": (
+                round(self.tokens_out / self.generation_seconds, 1) if self.generation_seconds else None
+            ),
+            **{name: histogram.summary() for name, histogram in self.histograms.items()},
+        }
+
+
+def usage_in_out(usage: Dict[str, int]) -> Tuple[int, int]:
+    """Input/output tokens from provider usage, whatever naming the provider uses."""
+    tokens_in = (
+        usage.get("input_tokens", usage.get("prompt_tokens", 0))
+        + usage.get("cache_creation_input_tokens", 0)
+        + usage.get("cache_read_input_tokens", 0)
+    )
+    tokens_out = usage.get("output_tokens", usage.get("completion_tokens", 0))
+    return tokens_in, tokens_out
+
+
+class RequestSpan:
+    """Timing of one provider call; use as a context manager.
+
+    Call ``chunk()`` for every streamed chunk and ``set_usage()`` when usage
+    is reported. Leaving the block with an exception records an error;
+    cancellation (hedging losers, abandoned streams) is counted separately.
+    """
+
+    def __init__(self, telemetry: "Telemetry", provider: str, model: str, queue_time: float, stream: bool):
+        self.telemetry = telemetry
+        self.provider = provider
+        self.model = model
+        self.queue_time = queue_time
+        self.stream = stream
+        self.started = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self.last_token_at: Optional[float] = None
+        self.inter_token: List[float] = []
+        self.usage: Dict[str, int] = {}
+
+    def chunk(self) -> None:
+        now = time.monotonic()
+        if self.first_token_at is None:
+            self.first_token_at = now
+        else:
+            self.inter_token.append(now - self.last_token_at)
+        self.last_token_at = now
+
+    def set_usage(self, usage: Dict[str, int]) -> None:
+        self.usage = dict(usage or {})
+
+    def __enter__(self) -> "RequestSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            outcome = "ok"
+        elif exc_type in (GeneratorExit,) or exc_type.__name__ == "CancelledError":
+            outcome = "cancelled"
+        else:
+            outcome = exc_type.__name__
+        self.telemetry.record(self, time.monotonic(), outcome)
+        return False
+
+
+class Telemetry:
+    """Process-wide metrics registry keyed by (provider, model)."""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._metrics: Dict[Tuple[str, str], ProviderMetrics] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def span(self, provider: str, model: str, queue_time: float = 0.0, stream: bool = False) -> RequestSpan:
+        """Start tracking one provider call."""
+        return RequestSpan(self, provider, model, queue_time, stream)
+
+    def record(self, span: RequestSpan, finished_at: float, outcome: str) -> None:
+        """Aggregate a finished span."""
+        with self._lock:
+            key = (span.provider, span.model)
+            if key not in self._metrics:
+                self._metrics[key] = ProviderMetrics(self.window)
+            metrics = self._metrics[key]
+
+            metrics.requests += 1
+            metrics.streams += span.stream
+            metrics.histograms["queue_time"].observe(span.queue_time)
+
+            if outcome == "cancelled":
+                metrics.cancelled += 1
+                return
+            if outcome != "ok":
+                metrics.errors[outcome] += 1
+                return
+
+            duration = finished_at - span.started
+            first_token_at = span.first_token_at if span.stream else finished_at
+            if first_token_at is not None:
+                metrics.histograms["ttft"].observe(first_token_at - span.started)
+            for gap in span.inter_token:
+                metrics.histograms["inter_token"].observe(gap)
+            metrics.histograms["duration"].observe(duration)
+
+            tokens_in, tokens_out = usage_in_out(span.usage)
+            metrics.tokens_in += tokens_in
+            metrics.tokens_out += tokens_out
+            if span.stream and span.first_token_at is not None:
+                metrics.generation_seconds += finished_at - span.first_token_at
+            elif not span.stream:
+                metrics.generation_seconds += duration
+
+    def stats(self, provider: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Get aggregated stats as {"provider/model": {...}}, optionally for one provider."""
+        with self._lock:
+            return {
+                f"{p}/{m}": metrics.stats()
+                for (p, m), metrics in self._metrics.items()
+                if provider is None or p == provider
+            }
+
+    def percentile(
+        self, provider: str, model: str, metric: str, q: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """q-th percentile of a histogram for one provider/model, or None without enough samples."""
+        with self._lock:
+            metrics = self._metrics.get((provider, model))
+            if metrics is None or len(metrics.histograms[metric].recent) < min_samples:
+                return None
+            return metrics.histograms[metric].percentile(q)
+
+    def reset(self) -> None:
+        """Drop all collected metrics."""
+        with self._lock:
+            self._metrics.clear()
+
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            items = sorted(self._metrics.items())
+
+            for name, (buckets, help_text) in HISTOGRAMS.items():
+                metric = f"llm_{name}_seconds"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for (provider, model), metrics in items:
+                    histogram = metrics.histograms[name]
+                    labels = _labels(provider=provider, model=model)
+                    cumulative = 0
+                    for bound, count in zip(list(buckets) + ["+Inf"], histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.total:.6f}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+            lines += ["# HELP llm_requests_total Provider calls", "# TYPE llm_requests_total counter"]
+            for (provider, model), metrics in items:
+                lines.append(f"llm_requests_total{{{_labels(provider=provider, model=model)}}} {metrics.requests}")
+
+            lines += ["# HELP llm_errors_total Failed provider calls", "# TYPE llm_errors_total counter"]
+            for (provider, model), metrics in items:
+                for error, count in sorted(metrics.errors.items()):
+                    labels = _labels(provider=provider, model=model, error=error)
+                    lines.append(f"llm_errors_total{{{labels}}} {count}")
+
+            lines += ["# HELP llm_tokens_total Tokens processed", "# TYPE llm_tokens_total counter"]
+            for (provider, model), metrics in items:
+                for direction, count in (("in", metrics.tokens_in), ("out", metrics.tokens_out)):
+                    labels = _labels(provider=provider, model=model, direction=direction)
+                    lines.append(f"llm_tokens_total{{{labels}}} {count}")
+
+        return "\n".join(lines) + "\n"
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``/metrics`` (Prometheus text) and ``/stats`` (JSON) from a daemon thread."""
+        if self._server is not None:
+            return self._server
+
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics"):
+                    body = telemetry.prometheus_text().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path.startswith("/stats"):
+                    body = json.dumps(telemetry.stats(), indent=2).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def stop_http_server(self) -> None:
+        """Stop the metrics endpoint if it is running."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _labels(**labels: str) -> str:
+    escaped = {
+        name: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for name, value in labels.items()
+    }
+    return ",".join(f'{name}="{value}"' for name, value in escaped.items())
+
+
+_telemetry: Optional[Telemetry] = None
+
+
+def get_telemetry() -> Telemetry:
+    """Get the process-wide Telemetry shared by all LLMManager instances.
+
+    Starts the metrics endpoint on first use when ``llm_metrics_port`` is set.
+    """
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = Telemetry(settings.llm_telemetry_window)
+        if settings.llm_metrics_port:
+            _telemetry.start_http_server(settings.llm_metrics_port, settings.llm_metrics_host)
+    return _telemetry
@@ -1,10 +1,23 @@
 """RAG module for document processing and retrieval."""
-from .document_processor import DocumentProcessor
-from .vectorstore import VectorStore
-from .retriever import Retriever
-
-__all__ = [
-    "DocumentProcessor",
-    "VectorStore",
-    "Retriever",
-]
+import importlib
+
+# Submodules are imported on first use, so that importing one module (e.g.
+# rag.extractors in an ingestion worker) does not load chromadb and the models
+_EXPORTS = {
+    "DocumentProcessor": ".document_processor",
+    "VectorStore": ".vectorstore",
+    "Retriever": ".retriever",
+    "get_model_registry": ".models",
+    "start_warmup": ".models",
+    "warmup_models": ".models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,93 @@
 """Document processor for handling various document types."""
-import io
+import asyncio
+from bisect import bisect_right
 from pathlib import Path
-from typing import List, Dict, Optional
-import aiofiles
-from pypdf import PdfReader
-from docx import Document
+from typing import Iterator, List, Dict, Optional
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from config import settings
+from .extractors import CODE_EXTENSIONS, TEXT_EXTENSIONS, extract_text, iter_pdf_pages
+
+
+class IncrementalChunker:
+    """Split text that arrives page by page into overlapping chunks.
+
+    Between calls only the unfinished tail (the last, possibly incomplete,
+    chunk plus text not yet split) is kept, so memory stays proportional to
+    a few pages however long the document is. Each chunk records the page
+    it starts on and, when it spans pages, the page it ends on. Chunks are
+    emitted before the document's length is known, so ``total_chunks`` is
+    left to the caller.
+    """
+
+    def __init__(self, text_splitter: RecursiveCharacterTextSplitter, chunk_size: int, metadata: Dict):
+        self.text_splitter = text_splitter
+        self.chunk_size = chunk_size
+        self.metadata = metadata
+        self._buffer = ""
+        self._offsets: List[int] = []  # buffer offset where each page starts
+        self._pages: List[int] = []
+        self._index = 0
+
+    def feed(self, page: int, text: str) -> List[Dict]:
+        """Add a page; returns the chunks that are now complete."""
+        self._offsets.append(len(self._buffer))
+        self._pages.append(page)
+        self._buffer += text + "\n"
+        # Re-split only once there is more than a chunk to emit
+        if len(self._buffer) < 2 * self.chunk_size:
+            return []
+        return self._split(final=False)
+
+    def close(self) -> List[Dict]:
+        """Emit the remaining chunks."""
+        documents = self._split(final=True)
+        self._buffer = ""
+        self._offsets, self._pages = [], []
+        return documents
+
+    def _split(self, final: bool) -> List[Dict]:
+        chunks = self.text_splitter.split_text(self._buffer)
+        if not chunks:
+            return []
+
+        # Locate chunks in the buffer (the splitter only strips whitespace)
+        starts = []
+        position = 0
+        for chunk in chunks:
+            start = self._buffer.find(chunk, position)
+            start = start if start >= 0 else position
+            starts.append(start)
+            position = start + 1
+
+        emit = len(chunks) if final else len(chunks) - 1
+        documents = [self._document(chunks[i], starts[i]) for i in range(emit)]
+
+        if not final:
+            # Keep the last chunk unsplit; it may continue on the next page
+            tail = starts[-1]
+            first = max(0, bisect_right(self._offsets, tail) - 1)
+            self._offsets = [0] + [offset - tail for offset in self._offsets[first + 1:]]
+            self._pages = self._pages[first:]
+            self._buffer = self._buffer[tail:]
+        return documents
+
+    def _document(self, chunk: str, start: int) -> Dict:
+        first = self._pages[max(0, bisect_right(self._offsets, start) - 1)]
+        last = self._pages[max(0, bisect_right(self._offsets, start + len(chunk) - 1) - 1)]
+        metadata = {**self.metadata, "chunk_id": self._index, "page": first}
+        if last != first:
+            metadata["page_end"] = last
+        self._index += 1
+        return {"content": chunk, "metadata": metadata}
 
 
 class DocumentProcessor:
     """Processor for handling and chunking documents."""
 
+    TEXT_EXTENSIONS = TEXT_EXTENSIONS
+    CODE_EXTENSIONS = CODE_EXTENSIONS
+    SUPPORTED_EXTENSIONS = ['.pdf', '.docx', '.doc'] + TEXT_EXTENSIONS + CODE_EXTENSIONS
+
     def __init__(self):
         self.chunk_size = settings.chunk_size
         self.chunk_overlap = settings.chunk_overlap
@@ -27,20 +103,38 @@ class DocumentProcessor:
 
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
+        if path.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type: {path.suffix}")
+
+        # PDF/DOCX parsing is blocking; keep it off the event loop
+        documents = await asyncio.to_thread(lambda: list(self.iter_documents(file_path)))
+        # Paged documents are chunked as they stream and learn their total only now
+        for doc in documents:
+            doc["metadata"]["total_chunks"] = len(documents)
+        return documents
 
-        # Read file content based on type
-        if path.suffix.lower() == '.pdf':
-            content = await self._read_pdf(file_path)
-        elif path.suffix.lower() in ['.docx', '.doc']:
-            content = await self._read_docx(file_path)
-        elif path.suffix.lower() in ['.txt', '.md']:
-            content = await self._read_text(file_path)
-        elif path.suffix.lower() in ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go', '.rs']:
-            content = await self._read_text(file_path)
+    def iter_documents(self, file_path: str) -> Iterator[Dict[str, str]]:
+        """Yield a file's chunked documents (blocking); PDFs are read page by page."""
+        if Path(file_path).suffix.lower() == '.pdf':
+            chunker = self.chunker(file_path)
+            for page, text in iter_pdf_pages(file_path):
+                yield from chunker.feed(page, text)
+            yield from chunker.close()
         else:
-            raise ValueError(f"Unsupported file type: {path.suffix}")
+            yield from self.split_document(file_path, extract_text(file_path))
 
-        # Split into chunks
+    def chunker(self, file_path: str) -> IncrementalChunker:
+        """Incremental chunker for a paged document."""
+        path = Path(file_path)
+        return IncrementalChunker(
+            self.text_splitter,
+            self.chunk_size,
+            {"source": str(path), "file_type": path.suffix},
+        )
+
+    def split_document(self, file_path: str, content: str) -> List[Dict[str, str]]:
+        """Split a file's extracted text into documents with metadata."""
+        path = Path(file_path)
         chunks = self.text_splitter.split_text(content)
 
         # Create documents with metadata
@@ -58,38 +152,6 @@ class DocumentProcessor:
 
         return documents
 
-    async def _read_pdf(self, file_path: str) -> str:
-        """Read PDF file and extract text."""
-        try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            raise ValueError(f"Error reading PDF: {e}")
-
-    async def _read_docx(self, file_path: str) -> str:
-        """Read DOCX file and extract text."""
-        try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        except Exception as e:
-            raise ValueError(f"Error reading DOCX: {e}")
-
-    async def _read_text(self, file_path: str) -> str:
-        """Read text file."""
-        try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                return await f.read()
-        except UnicodeDecodeError:
-            # Try with different encoding
-            async with aiofiles.open(file_path, 'r', encoding='latin-1') as f:
-                return await f.read()
-
     def chunk_text(self, text: str, metadata: Optional[Dict] = None) -> List[Dict[str, str]]:
         """Chunk text into smaller pieces."""
         chunks = self.text_splitter.split_text(text)
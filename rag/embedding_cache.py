@@ -0,0 +1,130 @@
+"""Persistent embedding cache keyed by embedding model and chunk content hash."""
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from config import settings
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a chunk's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Embeddings stored once per (model, content hash), shared across collections.
+
+    Per model, vectors are appended to ``vectors.f16`` (float16 rows read
+    back through a memmap) and their content hashes to ``index.txt``, one per
+    line in row order; ``meta.json`` records the vector width. Both data
+    files are append-only, so a crash can at worst leave a trailing row
+    without its hash; it is dropped on load. The cache is safe for threads
+    but not for several processes writing at once.
+    """
+
+    def __init__(self, directory: Path, model_name: str):
+        self.model_name = model_name
+        self.directory = Path(directory) / re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / "vectors.f16"
+        self.index_path = self.directory / "index.txt"
+        self.meta_path = self.directory / "meta.json"
+
+        self.dim: int = 0
+        self.rows: Dict[str, int] = {}
+        self._vectors = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.meta_path.exists() or not self.index_path.exists() or not self.vectors_path.exists():
+            return
+        self.dim = json.loads(self.meta_path.read_text())["dim"]
+        hashes = self.index_path.read_text().split()
+        row_bytes = self.dim * np.dtype(np.float16).itemsize
+        count = min(len(hashes), self.vectors_path.stat().st_size // row_bytes)
+        # Drop a partially written tail so later appends stay row-aligned
+        if count * row_bytes != self.vectors_path.stat().st_size:
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(count * row_bytes)
+        if count != len(hashes):
+            self.index_path.write_text("".join(f"{h}\n" for h in hashes[:count]))
+        self.rows = {h: row for row, h in enumerate(hashes[:count])}
+        self._open(count)
+
+    def _open(self, count: int) -> None:
+        self._vectors = np.memmap(
+            self.vectors_path, dtype=np.float16, mode="r", shape=(count, self.dim)
+        ) if count else None
+
+    def encode(self, texts: List[str], encoder: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Embeddings for ``texts``, calling ``encoder`` only for unseen content.
+
+        Returns float32 rows in input order. Cached and freshly computed
+        vectors both go through float16, so the same content always yields
+        the same vector.
+        """
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        hashes = [content_hash(text) for text in texts]
+
+        with self._lock:
+            missing: Dict[str, str] = {}
+            for h, text in zip(hashes, texts):
+                if h not in self.rows and h not in missing:
+                    missing[h] = text
+            self.misses += len(missing)
+            self.hits += sum(1 for h in hashes if h in self.rows)
+
+        if missing:
+            fresh = np.asarray(encoder(list(missing.values())), dtype=np.float16)
+            self._append(list(missing.keys()), fresh)
+
+        with self._lock:
+            return np.asarray(self._vectors[[self.rows[h] for h in hashes]], dtype=np.float32)
+
+    def _append(self, hashes: List[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            if not self.dim:
+                self.dim = vectors.shape[1]
+                self.meta_path.write_text(json.dumps({"model": self.model_name, "dim": self.dim}))
+            keep = [i for i, h in enumerate(hashes) if h not in self.rows]  # another thread may have added them
+            if not keep:
+                return
+            start = len(self.rows)
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors[keep]).tobytes())
+            with open(self.index_path, "a") as f:
+                f.write("".join(f"{hashes[i]}\n" for i in keep))
+            for offset, i in enumerate(keep):
+                self.rows[hashes[i]] = start + offset
+            self._open(len(self.rows))
+
+    def stats(self) -> Dict:
+        """Cache size and hit counts."""
+        return {
+            "model": self.model_name,
+            "entries": len(self.rows),
+            "dim": self.dim,
+            "bytes": self.vectors_path.stat().st_size if self.vectors_path.exists() else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str) -> EmbeddingCache:
+    """Get the process-wide embedding cache for a model."""
+    with _caches_lock:
+        if model_name not in _caches:
+            _caches[model_name] = EmbeddingCache(settings.embedding_cache_path, model_name)
+        return _caches[model_name]
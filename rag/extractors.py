@@ -0,0 +1,79 @@
+"""Text extraction from document files.
+
+Kept apart from the chunking and storage modules (and their imports) so
+ingestion worker processes load only the parsers they need.
+"""
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from pypdf import PdfReader
+from docx import Document
+
+TEXT_EXTENSIONS = ['.txt', '.md']
+CODE_EXTENSIONS = ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go', '.rs']
+
+
+def extract_text(file_path: str) -> str:
+    """Extract a file's text (blocking).
+
+    A module-level function so it can run in a process pool.
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix == '.pdf':
+        return _read_pdf(file_path)
+    if suffix in ['.docx', '.doc']:
+        return _read_docx(file_path)
+    if suffix in TEXT_EXTENSIONS or suffix in CODE_EXTENSIONS:
+        return _read_text(file_path)
+    raise ValueError(f"Unsupported file type: {suffix}")
+
+
+def _read_pdf(file_path: str) -> str:
+    """Read PDF file and extract text."""
+    return "\n".join(text for _, text in iter_pdf_pages(file_path))
+
+
+def pdf_page_count(file_path: str) -> int:
+    """Number of pages in a PDF."""
+    try:
+        return len(PdfReader(file_path).pages)
+    except Exception as e:
+        raise ValueError(f"Error reading PDF: {e}")
+
+
+def iter_pdf_pages(file_path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """Yield (1-based page number, text) for pages ``start``..``stop``, one at a time."""
+    try:
+        reader = PdfReader(file_path)
+        pages = reader.pages
+        for index in range(start, len(pages) if stop is None else min(stop, len(pages))):
+            yield index + 1, pages[index].extract_text() or ""
+    except Exception as e:
+        raise ValueError(f"Error reading PDF: {e}")
+
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Text of a page range; a module-level function so it can run in a process pool."""
+    return list(iter_pdf_pages(file_path, start, stop))
+
+
+def _read_docx(file_path: str) -> str:
+    """Read DOCX file and extract text."""
+    try:
+        doc = Document(file_path)
+        text = ""
+        for paragraph in doc.paragraphs:
+            text += paragraph.text + "\n"
+        return text
+    except Exception as e:
+        raise ValueError(f"Error reading DOCX: {e}")
+
+
+def _read_text(file_path: str) -> str:
+    """Read text file."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except UnicodeDecodeError:
+        # Try with different encoding
+        with open(file_path, 'r', encoding='latin-1') as f:
+            return f.read()
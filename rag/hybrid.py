@@ -0,0 +1,174 @@
+"""Lexical (BM25) index and rank fusion for hybrid retrieval."""
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+WORD_PATTERN = re.compile(r"\w+")
+SUBWORD_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|\b)|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms, keeping code identifiers whole and split.
+
+    ``getUserName`` yields ``getusername``, ``get``, ``user`` and ``name``;
+    ``max_retries`` yields ``max_retries``, ``max`` and ``retries``, so
+    exact identifiers and their parts both match. Punctuation is dropped.
+    """
+    terms = []
+    for word in WORD_PATTERN.findall(text):
+        terms.append(word.lower())
+        parts = [part.lower() for piece in word.split("_") for part in SUBWORD_PATTERN.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+class LexicalIndex:
+    """In-memory BM25 inverted index over a collection's chunks.
+
+    Holds term frequencies and the metadata fields used for filtering, not
+    the chunk text. Updates are incremental and thread-safe.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.loaded = False
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}  # distinct terms per chunk, for removal
+        self._metadata: Dict[str, Dict] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, ids: Sequence[str], contents: Sequence[str], metadatas: Sequence[Dict]) -> None:
+        """Index chunks, replacing any with the same ID."""
+        with self._lock:
+            self.remove(ids)
+            for doc_id, content, metadata in zip(ids, contents, metadatas):
+                terms = Counter(tokenize(content))
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[doc_id] = tf
+                length = sum(terms.values())
+                self._terms[doc_id] = list(terms)
+                self._lengths[doc_id] = length
+                self._total_length += length
+                self._metadata[doc_id] = {
+                    key: value for key, value in (metadata or {}).items()
+                    if key in ("source", "file_type")
+                }
+
+    def remove(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id in ids:
+                length = self._lengths.pop(doc_id, None)
+                if length is None:
+                    continue
+                self._total_length -= length
+                self._metadata.pop(doc_id, None)
+                for term in self._terms.pop(doc_id):
+                    posting = self._postings[term]
+                    del posting[doc_id]
+                    if not posting:
+                        del self._postings[term]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._terms.clear()
+            self._metadata.clear()
+            self._total_length = 0
+
+    def load(self, fetch: Callable[[], Tuple[List[str], List[str], List[Dict]]]) -> None:
+        """Build the index once from ``fetch()`` -> (ids, contents, metadatas)."""
+        with self._lock:
+            if self.loaded:
+                return
+            ids, contents, metadatas = fetch()
+            self.add(ids, contents, metadatas)
+            self.loaded = True
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 5,
+        filter_metadata: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        """Top (id, BM25 score) pairs for the query, best first."""
+        with self._lock:
+            count = len(self._lengths)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            if filter_metadata:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if all(self._metadata[doc_id].get(k) == v for k, v in filter_metadata.items())
+                }
+            return heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60
+) -> List[Tuple[str, float]]:
+    """Fuse ranked ID lists: score(d) = sum of weight / (k + rank), rank from 1."""
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def fuse_results(
+    result_lists: Sequence[List[Dict]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60,
+    n_results: int = 5
+) -> List[Dict]:
+    """Fuse ranked result lists (dicts with an ``id``) with RRF.
+
+    A result found by several retrievers keeps the fields from the first
+    list that has it; ``score`` becomes the fused score.
+    """
+    by_id: Dict[str, Dict] = {}
+    for results in reversed(result_lists):
+        by_id.update({result["id"]: result for result in results})
+
+    fused = reciprocal_rank_fusion(
+        [[result["id"] for result in results] for results in result_lists],
+        weights=weights,
+        k=k,
+    )
+    return [{**by_id[doc_id], "score": score} for doc_id, score in fused[:n_results]]
+
+
+_indexes: Dict[str, LexicalIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(collection_name: str) -> LexicalIndex:
+    """Get the process-wide lexical index for a collection."""
+    with _indexes_lock:
+        if collection_name not in _indexes:
+            _indexes[collection_name] = LexicalIndex()
+        return _indexes[collection_name]
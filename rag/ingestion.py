@@ -0,0 +1,378 @@
+"""Parallel document ingestion: parse in a process pool, chunk, embed in batches."""
+import asyncio
+import atexit
+import inspect
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+from utils.request_context import RequestContext
+from .document_processor import DocumentProcessor, IncrementalChunker
+from .extractors import CODE_EXTENSIONS, TEXT_EXTENSIONS, extract_pdf_pages, extract_text, pdf_page_count
+from .manifest import SourceManifest, file_hash
+from .vectorstore import VectorStore, chunk_ids
+
+_DONE = object()  # end-of-stream marker passed between stages
+PDF_PAGES_PER_TASK = 16  # PDF pages extracted per process-pool task
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """The process-wide pool PDF/DOCX parsing runs in, started on first use.
+
+    Workers are spawned rather than forked: this process runs threads (the
+    event loop, model warmup, Chroma) whose locks a forked child could
+    inherit held. A spawned worker pays for a fresh interpreter, so the pool
+    lives as long as the process and workers start only when needed.
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=settings.ingest_workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _parse_pool
+
+
+def _discard_parse_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died, so later files get a fresh one."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_parse_pool() -> None:
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _feed_pages(chunker: IncrementalChunker, pages: List, last: bool) -> List[Dict]:
+    documents = []
+    for page, text in pages:
+        documents.extend(chunker.feed(page, text))
+    if last:
+        documents.extend(chunker.close())
+    return documents
+
+
+@dataclass
+class IngestJob:
+    """A source that needs (re-)indexing."""
+    source: str  # name the file is indexed under
+    path: str  # where its bytes are read from
+    stat: os.stat_result
+    digest: str
+    previous: Optional[Dict]  # manifest entry of the indexed version, if any
+
+    @property
+    def status(self) -> str:
+        return "updated" if self.previous is not None else "added"
+
+
+@dataclass
+class IngestProgress:
+    """Progress after a file finished (indexed, skipped or failed)."""
+    done: int
+    total: int
+    source: str
+    status: str  # "added", "updated", "unchanged" or "error"
+    chunks_added: int
+
+
+def plan_source(manifest: SourceManifest, file_path: str, source: Optional[str] = None) -> Optional[IngestJob]:
+    """The job for a file, or None if the manifest shows it unchanged (blocking).
+
+    ``source`` is the name the file is indexed under; it defaults to the path.
+    """
+    source = source or str(Path(file_path))
+    stat = os.stat(file_path)
+    if manifest.is_unchanged(source, stat):
+        return None
+
+    digest = file_hash(file_path)
+    entry = manifest.get(source)
+    if entry is not None and entry["hash"] == digest:
+        # Touched but not modified
+        manifest.set(source, stat, digest, entry["chunk_ids"])
+        return None
+    return IngestJob(source, file_path, stat, digest, entry)
+
+
+def finish_source(
+    manifest: SourceManifest,
+    vectorstore: VectorStore,
+    job: IngestJob,
+    ids: List[str]
+) -> None:
+    """Drop chunks of the previous version that are gone and record the new one.
+
+    Sources indexed before the manifest existed are cleared by metadata.
+    """
+    if job.previous is not None:
+        new_ids = set(ids)
+        vectorstore.delete_ids([i for i in job.previous["chunk_ids"] if i not in new_ids])
+    else:
+        vectorstore.delete_by_source(job.source, keep_ids=ids)
+    manifest.set(job.source, job.stat, job.digest, ids)
+
+
+class IngestionPipeline:
+    """Index many files using all cores without blocking the event loop.
+
+    Stages run concurrently and are connected by bounded queues, so a slow
+    stage applies back-pressure instead of letting parsed text pile up:
+
+    1. parse: hash check against the manifest, then text extraction: PDF
+       and DOCX parsing is CPU-bound and runs in a shared process pool (PDFs
+       a page range at a time); text and code files are read in a thread
+    2. chunk: split text into documents in a worker thread; PDF pages go
+       through an incremental chunker
+    3. embed: upsert chunks in batches of ``batch_size`` in a worker thread
+
+    Files move through the stages in pieces, so memory is bounded by the
+    queue sizes and a few pages per file rather than by file size.
+
+    A file's manifest entry is written only after all its chunks are stored,
+    so an interrupted run is resumed by running it again.
+    """
+
+    def __init__(
+        self,
+        vectorstore: VectorStore,
+        doc_processor: DocumentProcessor,
+        manifest: SourceManifest,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        self.vectorstore = vectorstore
+        self.doc_processor = doc_processor
+        self.manifest = manifest
+        self.workers = workers or settings.ingest_workers or os.cpu_count() or 1
+        self.batch_size = batch_size or settings.embedding_batch_size
+        self.queue_size = queue_size or settings.ingest_queue_size
+
+    async def run(
+        self,
+        file_paths: List[str],
+        progress: Optional[Callable[[IngestProgress], Any]] = None,
+        request_context: Optional[RequestContext] = None,
+        sources: Optional[Dict[str, str]] = None
+    ) -> Dict:
+        """Index ``file_paths``; returns counts per status and per-file errors.
+
+        ``progress`` is called (and awaited, if it returns an awaitable)
+        after each file. ``sources`` maps a path to the name it is indexed
+        under, for files (like uploads) whose path changes between runs.
+        """
+        sources = {str(Path(path)): name for path, name in (sources or {}).items()}
+        file_paths = list(dict.fromkeys(str(Path(file_path)) for file_path in file_paths))
+        summary = {"added": 0, "updated": 0, "unchanged": 0, "chunks_added": 0, "errors": []}
+        total = len(file_paths)
+        done = 0
+
+        async def report(source: str, status: str, error: Optional[Exception] = None) -> None:
+            nonlocal done
+            done += 1
+            if error is not None:
+                summary["errors"].append(f"{source}: {error}")
+            else:
+                summary[status] += 1
+            if progress is not None:
+                result = progress(IngestProgress(done, total, source, status, summary["chunks_added"]))
+                if inspect.isawaitable(result):
+                    await result
+
+        def check() -> None:
+            if request_context is not None:
+                request_context.check()
+
+        loop = asyncio.get_running_loop()
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        chunked: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def parse_file(job: IngestJob) -> None:
+            """Queue a file's text as (job, [(page, text), ...], last) pieces."""
+            suffix = Path(job.path).suffix.lower()
+            if suffix in TEXT_EXTENSIONS or suffix in CODE_EXTENSIONS:
+                # Nothing to parse; a thread is enough
+                text = await asyncio.to_thread(extract_text, job.path)
+                await parsed.put((job, [(None, text)], True))
+                return
+
+            pool = get_parse_pool()
+            try:
+                await parse_in_pool(job, pool)
+            except BrokenProcessPool:
+                _discard_parse_pool(pool)
+                raise
+
+        async def parse_in_pool(job: IngestJob, pool: ProcessPoolExecutor) -> None:
+            """Extract a PDF or DOCX in worker processes."""
+            if Path(job.path).suffix.lower() != ".pdf":
+                text = await loop.run_in_executor(pool, extract_text, job.path)
+                await parsed.put((job, [(None, text)], True))
+                return
+
+            # PDFs go a page range at a time, so a large manual is never held whole
+            page_count = await loop.run_in_executor(pool, pdf_page_count, job.path)
+            if page_count == 0:
+                await parsed.put((job, [], True))
+            for start in range(0, page_count, PDF_PAGES_PER_TASK):
+                stop = min(start + PDF_PAGES_PER_TASK, page_count)
+                pages = await loop.run_in_executor(pool, extract_pdf_pages, job.path, start, stop)
+                await parsed.put((job, pages, stop == page_count))
+
+        async def parse_one(file_path: str, slots: asyncio.Semaphore) -> None:
+            source = sources.get(file_path, file_path)
+            try:
+                try:
+                    job = await asyncio.to_thread(plan_source, self.manifest, file_path, source)
+                except Exception as e:
+                    await report(source, "error", e)
+                    return
+                if job is None:
+                    await report(source, "unchanged")
+                    return
+                try:
+                    await parse_file(job)
+                except Exception as e:
+                    # Later stages may hold part of the file; let them drop it
+                    await parsed.put((job, e, True))
+            finally:
+                # Released only once the text is queued, so a full queue stalls parsing
+                slots.release()
+
+        async def parse_stage() -> None:
+            # At most ``workers`` files in flight, plus what the queue holds
+            slots = asyncio.Semaphore(self.workers)
+            tasks = []
+            try:
+                for file_path in file_paths:
+                    check()
+                    await slots.acquire()
+                    tasks.append(asyncio.create_task(parse_one(file_path, slots)))
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            await parsed.put(_DONE)
+
+        async def chunk_stage() -> None:
+            chunkers: Dict[str, IncrementalChunker] = {}
+            broken = set()  # files whose chunking failed midway
+            while (item := await parsed.get()) is not _DONE:
+                check()
+                job, pages, last = item
+                if job.source in broken:
+                    continue
+                if isinstance(pages, Exception):
+                    chunkers.pop(job.source, None)
+                    await chunked.put(item)
+                    continue
+                try:
+                    if job.source not in chunkers and last and pages and pages[0][0] is None:
+                        documents = await asyncio.to_thread(
+                            self.doc_processor.split_document, job.source, pages[0][1]
+                        )
+                    else:
+                        chunker = chunkers.setdefault(job.source, self.doc_processor.chunker(job.source))
+                        documents = await asyncio.to_thread(_feed_pages, chunker, pages, last)
+                        if last:
+                            del chunkers[job.source]
+                except Exception as e:
+                    chunkers.pop(job.source, None)
+                    if not last:
+                        broken.add(job.source)
+                    await chunked.put((job, e, True))
+                    continue
+                await chunked.put((job, documents, last))
+            await chunked.put(_DONE)
+
+        stored: Dict[str, List[str]] = {}  # IDs already upserted per file in progress
+        streamed: Dict[str, List[Dict]] = {}  # their metadata, for chunks still missing total_chunks
+        occurrences: Dict[str, Dict[str, int]] = {}
+        failed = set()
+
+        async def fail(job: IngestJob, error: Exception) -> None:
+            """Give up on a file, removing chunks this run stored for it."""
+            failed.add(job.source)
+            occurrences.pop(job.source, None)
+            streamed.pop(job.source, None)
+            previous = set(job.previous["chunk_ids"]) if job.previous else set()
+            orphans = [i for i in stored.pop(job.source, []) if i not in previous]
+            await asyncio.to_thread(self.vectorstore.delete_ids, orphans)
+            await report(job.source, "error", error)
+
+        async def flush(batch: List) -> None:
+            batch = [piece for piece in batch if piece[0].source not in failed]
+            documents = [doc for _, docs, _, _ in batch for doc in docs]
+            ids = [i for _, _, piece_ids, _ in batch for i in piece_ids]
+            try:
+                if documents:
+                    await asyncio.to_thread(self.vectorstore.add_documents, documents, ids)
+            except Exception as e:
+                for job in {piece[0].source: piece[0] for piece in batch}.values():
+                    await fail(job, e)
+                return
+            for job, docs, piece_ids, last in batch:
+                stored.setdefault(job.source, []).extend(piece_ids)
+                if docs and "total_chunks" not in docs[0]["metadata"]:
+                    streamed.setdefault(job.source, []).extend(doc["metadata"] for doc in docs)
+                summary["chunks_added"] += len(docs)
+                if last:
+                    occurrences.pop(job.source, None)
+                    ids = stored.pop(job.source, [])
+                    metadatas = streamed.pop(job.source, None)
+                    if metadatas:
+                        # Chunks of a paged file were stored before its length was known
+                        await asyncio.to_thread(
+                            self.vectorstore.update_metadata,
+                            ids,
+                            [{**metadata, "total_chunks": len(ids)} for metadata in metadatas],
+                            self.batch_size
+                        )
+                    await asyncio.to_thread(finish_source, self.manifest, self.vectorstore, job, ids)
+                    await report(job.source, job.status)
+
+        async def embed_stage() -> None:
+            batch: List = []
+            pending = 0
+            while (item := await chunked.get()) is not _DONE:
+                check()
+                job, documents, last = item
+                if job.source in failed:
+                    continue
+                if isinstance(documents, Exception):
+                    await fail(job, documents)
+                    continue
+                # Occurrence counts carry over between pieces of the same file
+                piece_ids = chunk_ids(documents, occurrences.setdefault(job.source, {}))
+                batch.append((job, documents, piece_ids, last))
+                pending += len(documents)
+                if pending >= self.batch_size:
+                    await flush(batch)
+                    batch, pending = [], 0
+            if batch:
+                await flush(batch)
+
+        stages = [asyncio.create_task(stage()) for stage in (parse_stage, chunk_stage, embed_stage)]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            for stage in stages:
+                stage.cancel()
+
+        return summary
@@ -0,0 +1,78 @@
+"""Per-source manifest for incremental indexing."""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def file_hash(file_path: str) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SourceManifest:
+    """What was indexed from each source: mtime, size, content hash and chunk IDs.
+
+    Stored as JSON next to the vector store, one file per collection, and
+    rewritten atomically on every change. Safe to update from several threads.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"Error reading manifest {self.path}: {e}")
+
+    def get(self, source: str) -> Optional[Dict]:
+        return self.entries.get(source)
+
+    def sources(self) -> List[str]:
+        with self._lock:
+            return list(self.entries)
+
+    def is_unchanged(self, source: str, stat: os.stat_result) -> bool:
+        """Whether the file still has the mtime and size it was indexed with."""
+        entry = self.entries.get(source)
+        return (
+            entry is not None
+            and entry["mtime"] == stat.st_mtime
+            and entry["size"] == stat.st_size
+        )
+
+    def set(self, source: str, stat: os.stat_result, content_hash: str, chunk_ids: List[str]) -> None:
+        with self._lock:
+            self.entries[source] = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "hash": content_hash,
+                "chunk_ids": chunk_ids,
+            }
+            self._save()
+
+    def remove(self, source: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self.entries.pop(source, None)
+            if entry is not None:
+                self._save()
+            return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries = {}
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.entries), encoding="utf-8")
+        os.replace(tmp_path, self.path)
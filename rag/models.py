@@ -0,0 +1,128 @@
+"""Process-wide registry of lazily loaded embedding and reranking models."""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config import settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _parameter_bytes(model: Any) -> Optional[int]:
+    """Size of a torch model's parameters (CrossEncoder wraps it in ``.model``)."""
+    module = model if hasattr(model, "parameters") else getattr(model, "model", None)
+    if module is None or not hasattr(module, "parameters"):
+        return None
+    return sum(p.numel() * p.element_size() for p in module.parameters())
+
+
+def _load_sentence_transformer(name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
+def _load_cross_encoder(name: str):
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(name)
+
+
+class ModelRegistry:
+    """Load each model once per process, on first use, and share it.
+
+    Loading the same model from several threads waits for the one load in
+    progress. ``stats()`` reports load time and memory per model: parameter
+    size, and growth of the process's peak RSS during the load (Unix only).
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """The model registered under ``key``, loading it with ``loader`` if needed."""
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key in self._models:
+                return self._models[key]
+
+            rss_before = _peak_rss_bytes()
+            started = time.perf_counter()
+            model = loader()
+            load_seconds = time.perf_counter() - started
+            rss_after = _peak_rss_bytes()
+
+            self._stats[key] = {
+                "load_seconds": round(load_seconds, 3),
+                "parameter_bytes": _parameter_bytes(model),
+                "rss_growth_bytes": rss_after - rss_before if rss_before is not None else None,
+            }
+            self._models[key] = model
+            print(f"Loaded {key} in {load_seconds:.2f}s")
+            return model
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._models
+
+    def stats(self) -> Dict[str, Dict]:
+        return {key: dict(stats) for key, stats in self._stats.items()}
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry."""
+    return _registry
+
+
+def get_embedding_model(name: Optional[str] = None):
+    """The shared SentenceTransformer for ``name`` (default: settings.embedding_model)."""
+    name = name or settings.embedding_model
+    return _registry.get(f"embedding:{name}", lambda: _load_sentence_transformer(name))
+
+
+def get_cross_encoder(name: Optional[str] = None):
+    """The shared CrossEncoder for ``name`` (default: settings.rerank_model)."""
+    name = name or settings.rerank_model
+    return _registry.get(f"rerank:{name}", lambda: _load_cross_encoder(name))
+
+
+def warmup_models() -> Dict[str, Dict]:
+    """Load the configured models now (e.g. at server start) instead of on the first query.
+
+    Returns the registry stats.
+    """
+    get_embedding_model()
+    if settings.rerank_enabled:
+        get_cross_encoder()
+    return _registry.stats()
+
+
+def start_warmup() -> threading.Thread:
+    """Run ``warmup_models`` in a background thread so server start is not blocked."""
+    def run() -> None:
+        try:
+            warmup_models()
+        except Exception as e:
+            print(f"Model warmup failed: {e}")
+
+    thread = threading.Thread(target=run, name="rag-model-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,108 @@
+"""Optional cross-encoder reranking of retrieved chunks."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from .embedding_cache import content_hash
+from .models import get_cross_encoder
+
+
+class Reranker:
+    """Rescore retrieval candidates with a local cross-encoder and keep the best.
+
+    Pairs are scored in batches against a latency budget: when the budget
+    runs out before every candidate is scored (a batch that overruns it
+    included), the original order is kept.
+    Scores are cached per (query, chunk content), so repeated questions
+    cost nothing. The model comes from the shared model registry on first
+    use; its load time is not counted against the budget.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 16,
+        budget_ms: float = 300.0,
+        cache_size: int = 10000
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.budget_ms = budget_ms
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._stats = {"reranked": 0, "fallbacks": 0, "cache_hits": 0, "pairs_scored": 0}
+
+    @property
+    def model(self):
+        return get_cross_encoder(self.model_name)
+
+    def rerank(
+        self,
+        query: str,
+        results: List[Dict],
+        top_k: int,
+        budget_ms: Optional[float] = None
+    ) -> List[Dict]:
+        """The ``top_k`` best results by cross-encoder score (``rerank_score``)."""
+        if len(results) <= 1:
+            return results[:top_k]
+
+        model = self.model
+        deadline = time.monotonic() + (self.budget_ms if budget_ms is None else budget_ms) / 1000
+
+        keys = [(query, content_hash(result["content"])) for result in results]
+        scores: Dict[int, float] = {}
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[i] = self._cache[key]
+        self._stats["cache_hits"] += len(scores)
+
+        pending = [i for i in range(len(results)) if i not in scores]
+        for start in range(0, len(pending), self.batch_size):
+            if time.monotonic() >= deadline:
+                self._stats["fallbacks"] += 1
+                return results[:top_k]
+            batch = pending[start:start + self.batch_size]
+            batch_scores = model.predict(
+                [(query, results[i]["content"]) for i in batch],
+                batch_size=self.batch_size,
+            )
+            self._stats["pairs_scored"] += len(batch)
+            with self._cache_lock:
+                for i, score in zip(batch, batch_scores):
+                    scores[i] = float(score)
+                    self._cache[keys[i]] = float(score)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            # Scores stay cached for next time, but this answer is already late
+            if time.monotonic() > deadline:
+                self._stats["fallbacks"] += 1
+                return results[:top_k]
+
+        self._stats["reranked"] += 1
+        order = sorted(range(len(results)), key=lambda i: scores[i], reverse=True)
+        return [{**results[i], "rerank_score": scores[i]} for i in order[:top_k]]
+
+    def stats(self) -> Dict:
+        return {"model": self.model_name, **self._stats}
+
+
+_reranker: Optional[Reranker] = None
+
+
+def get_reranker() -> Reranker:
+    """Get the process-wide reranker."""
+    global _reranker
+    if _reranker is None:
+        _reranker = Reranker(
+            settings.rerank_model,
+            batch_size=settings.rerank_batch_size,
+            budget_ms=settings.rerank_budget_ms,
+            cache_size=settings.rerank_cache_size,
+        )
+    return _reranker
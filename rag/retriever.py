@@ -1,7 +1,23 @@
 """Retriever for finding relevant documents."""
-from typing import List, Dict, Optional
-from .vectorstore import VectorStore
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, Dict, Optional
+from config import settings
+from utils.request_context import RequestContext
+from utils.tokenizer import count_tokens
+from .vectorstore import VectorStore, chunk_ids
 from .document_processor import DocumentProcessor
+from .manifest import SourceManifest
+from .ingestion import IngestionPipeline, IngestProgress, finish_source, plan_source
+from .hybrid import fuse_results
+from .reranker import get_reranker
+from .models import get_model_registry
+
+IGNORE_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env', 'dist', 'build'}
+
+# Runs the vector and lexical searches of a query side by side
+_search_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-search")
 
 
 class Retriever:
@@ -10,16 +26,95 @@ class Retriever:
     def __init__(self, collection_name: str = "documents"):
         self.vectorstore = VectorStore(collection_name)
         self.doc_processor = DocumentProcessor()
+        self.manifest = SourceManifest(
+            Path(settings.vector_store_path) / f"{collection_name}_manifest.json"
+        )
+        self.reranker = get_reranker() if settings.rerank_enabled else None
 
     async def add_document(self, file_path: str) -> int:
-        """Add a document to the vector store."""
+        """Add a document to the vector store.
+
+        A file indexed before is replaced if it changed and skipped if not.
+        Returns the number of chunks added.
+        """
+        job = await asyncio.to_thread(plan_source, self.manifest, file_path)
+        if job is None:
+            return 0
+
         documents = await self.doc_processor.process_file(file_path)
-        return self.vectorstore.add_documents(documents)
+        ids = chunk_ids(documents)
+        added = await asyncio.to_thread(self.vectorstore.add_documents, documents, ids) if documents else 0
+        await asyncio.to_thread(finish_source, self.manifest, self.vectorstore, job, ids)
+        return added
 
-    async def add_documents(self, file_paths: List[str]) -> int:
-        """Add multiple documents to the vector store."""
-        documents = await self.doc_processor.process_multiple_files(file_paths)
-        return self.vectorstore.add_documents(documents)
+    async def add_documents(
+        self,
+        file_paths: List[str],
+        progress: Optional[Callable[[IngestProgress], Any]] = None,
+        request_context: Optional[RequestContext] = None
+    ) -> int:
+        """Add multiple documents through the parallel ingestion pipeline."""
+        summary = await self.ingest(file_paths, progress, request_context)
+        for error in summary["errors"]:
+            print(f"Error processing {error}")
+        return summary["chunks_added"]
+
+    async def ingest(
+        self,
+        file_paths: List[str],
+        progress: Optional[Callable[[IngestProgress], Any]] = None,
+        request_context: Optional[RequestContext] = None,
+        sources: Optional[Dict[str, str]] = None
+    ) -> Dict:
+        """Index files in parallel; returns counts per status and per-file errors.
+
+        ``sources`` maps a path to the name it is indexed under (default: the path).
+        """
+        pipeline = IngestionPipeline(self.vectorstore, self.doc_processor, self.manifest)
+        return await pipeline.run(
+            file_paths, progress=progress, request_context=request_context, sources=sources
+        )
+
+    async def sync_directory(
+        self,
+        path: str,
+        recursive: bool = True,
+        progress: Optional[Callable[[IngestProgress], Any]] = None,
+        request_context: Optional[RequestContext] = None
+    ) -> Dict:
+        """Bring the index in line with a directory.
+
+        New files are indexed, changed ones re-indexed and unchanged ones
+        skipped; sources under ``path`` whose files were deleted are dropped.
+        Only sources that are absolute paths are candidates for removal, so
+        uploads (indexed under names like ``upload:notes.pdf``) are kept.
+        """
+        root = Path(path).resolve()
+        if not root.is_dir():
+            raise NotADirectoryError(f"Not a directory: {path}")
+
+        candidates = root.rglob("*") if recursive else root.glob("*")
+        files = sorted(
+            file for file in candidates
+            if file.is_file()
+            and file.suffix.lower() in DocumentProcessor.SUPPORTED_EXTENSIONS
+            and not IGNORE_DIRS.intersection(file.relative_to(root).parts)
+        )
+
+        summary = await self.ingest([str(file) for file in files], progress, request_context)
+        seen = {str(file) for file in files}
+
+        summary["removed"] = 0
+        for source in self.manifest.sources():
+            source_path = Path(source)
+            if source in seen or not source_path.is_absolute() or not source_path.is_relative_to(root):
+                continue
+            if not recursive and source_path.parent != root:
+                continue
+            self.delete_source(source)
+            summary["removed"] += 1
+
+        return summary
 
     async def add_text(self, text: str, metadata: Optional[Dict] = None) -> int:
         """Add raw text to the vector store."""
@@ -31,9 +126,13 @@ class Retriever:
         query: str,
         n_results: int = 5,
         filter_by_source: Optional[str] = None,
-        filter_by_type: Optional[str] = None
+        filter_by_type: Optional[str] = None,
+        request_context: Optional[RequestContext] = None
     ) -> List[Dict]:
         """Retrieve relevant documents for a query."""
+        if request_context is not None:
+            request_context.check()
+
         # Build filter
         filter_metadata = {}
         if filter_by_source:
@@ -41,53 +140,105 @@ class Retriever:
         if filter_by_type:
             filter_metadata["file_type"] = filter_by_type
 
-        # Search
-        results = self.vectorstore.search(
-            query,
+        filter_metadata = filter_metadata if filter_metadata else None
+
+        if self.vectorstore.lexical_index is None:
+            return self.vectorstore.search(query, n_results=n_results, filter_metadata=filter_metadata)
+
+        # Hybrid: embedding and BM25 search concurrently, fused by rank
+        candidates = n_results * max(1, settings.hybrid_candidate_multiplier)
+        vector_future = _search_pool.submit(self.vectorstore.search, query, candidates, filter_metadata)
+        lexical_future = _search_pool.submit(self.vectorstore.lexical_search, query, candidates, filter_metadata)
+
+        vector_results = vector_future.result()
+        try:
+            lexical_results = lexical_future.result()
+        except Exception as e:
+            print(f"Lexical search failed: {e}")
+            lexical_results = []
+
+        return fuse_results(
+            [vector_results, lexical_results],
+            weights=[settings.hybrid_vector_weight, settings.hybrid_lexical_weight],
+            k=settings.hybrid_rrf_k,
             n_results=n_results,
-            filter_metadata=filter_metadata if filter_metadata else None
         )
 
-        return results
-
     def get_context(
         self,
         query: str,
         n_results: int = 5,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        request_context: Optional[RequestContext] = None
     ) -> str:
-        """Get context string from retrieved documents."""
-        results = self.retrieve(query, n_results)
+        """Get context string from retrieved documents.
+
+        With reranking enabled, ``rerank_candidates`` chunks are retrieved and
+        the cross-encoder keeps the best ``n_results``.
+        """
+        if self.reranker is None:
+            results = self.retrieve(query, n_results, request_context=request_context)
+        else:
+            candidates = self.retrieve(
+                query, max(n_results, settings.rerank_candidates), request_context=request_context
+            )
+            results = self._rerank(query, candidates, n_results, request_context)
+        if request_context is not None:
+            request_context.check()
 
         context_parts = []
-        total_length = 0
+        total_tokens = 0
 
         for i, result in enumerate(results):
             source = result["metadata"].get("source", "unknown")
             content = result["content"]
 
             part = f"[Source {i+1}: {source}]\n{content}\n"
-            part_length = len(part)
+            part_tokens = count_tokens(part)
 
-            if total_length + part_length > max_tokens * 4:  # Rough token estimate
+            if total_tokens + part_tokens > max_tokens:
                 break
 
             context_parts.append(part)
-            total_length += part_length
+            total_tokens += part_tokens
 
         return "\n---\n".join(context_parts)
 
     def delete_source(self, source: str) -> int:
         """Delete all documents from a source."""
+        self.manifest.remove(source)
         return self.vectorstore.delete_by_source(source)
 
     def clear_all(self):
         """Clear all documents."""
         self.vectorstore.clear()
+        self.manifest.clear()
+
+    def _rerank(
+        self,
+        query: str,
+        candidates: List[Dict],
+        n_results: int,
+        request_context: Optional[RequestContext] = None
+    ) -> List[Dict]:
+        """Rerank candidates within the latency budget (and the request deadline)."""
+        budget_ms = settings.rerank_budget_ms
+        remaining = request_context.remaining() if request_context is not None else None
+        if remaining is not None:
+            budget_ms = min(budget_ms, remaining * 1000)
+        try:
+            return self.reranker.rerank(query, candidates, n_results, budget_ms=budget_ms)
+        except Exception as e:
+            print(f"Reranking failed: {e}")
+            return candidates[:n_results]
 
     def get_stats(self) -> Dict:
         """Get retriever statistics."""
-        return self.vectorstore.get_stats()
+        stats = self.vectorstore.get_stats()
+        if self.reranker is not None:
+            stats["reranker"] = self.reranker.stats()
+        stats["models"] = get_model_registry().stats()
+        return stats
 
     def list_sources(self) -> List[str]:
         """List all sources."""
@@ -3,8 +3,28 @@ from pathlib import Path
 from typing import List, Dict, Optional
 import chromadb
 from chromadb.config import Settings as ChromaSettings
-from sentence_transformers import SentenceTransformer
 from config import settings
+from .embedding_cache import content_hash, get_embedding_cache
+from .hybrid import LexicalIndex, get_lexical_index
+from .models import get_embedding_model
+
+
+def chunk_ids(documents: List[Dict], seen: Optional[Dict[str, int]] = None) -> List[str]:
+    """Stable IDs from each chunk's source and content hash.
+
+    Re-adding the same chunk yields the same ID, so inserts are idempotent.
+    A chunk repeated within one source gets an occurrence suffix; pass the
+    same ``seen`` dict when a source's chunks arrive in several calls.
+    """
+    ids = []
+    seen = {} if seen is None else seen
+    for doc in documents:
+        source = doc.get("metadata", {}).get("source", "")
+        base = f"{content_hash(source)[:12]}_{content_hash(doc['content'])[:20]}"
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        ids.append(base if occurrence == 0 else f"{base}_{occurrence}")
+    return ids
 
 
 class VectorStore:
@@ -12,7 +32,9 @@ class VectorStore:
 
     def __init__(self, collection_name: str = "documents"):
         self.collection_name = collection_name
-        self.embedding_model = SentenceTransformer(settings.embedding_model)
+        self.embedding_cache = (
+            get_embedding_cache(settings.embedding_model) if settings.embedding_cache_enabled else None
+        )
 
         # Initialize ChromaDB
         persist_directory = str(settings.vector_store_path)
@@ -31,8 +53,16 @@ class VectorStore:
             metadata={"hnsw:space": "cosine"}
         )
 
-    def add_documents(self, documents: List[Dict[str, str]]) -> int:
-        """Add documents to the vector store."""
+        # BM25 index over the same chunks, shared by stores on this collection
+        self.lexical_index = get_lexical_index(collection_name) if settings.hybrid_search_enabled else None
+
+    @property
+    def embedding_model(self):
+        """The process-wide embedding model, loaded on first use."""
+        return get_embedding_model(settings.embedding_model)
+
+    def add_documents(self, documents: List[Dict[str, str]], ids: Optional[List[str]] = None) -> int:
+        """Add or update documents; IDs default to ``chunk_ids(documents)``."""
         if not documents:
             return 0
 
@@ -40,23 +70,44 @@ class VectorStore:
         contents = [doc["content"] for doc in documents]
         metadatas = [doc.get("metadata", {}) for doc in documents]
 
-        # Generate embeddings
-        embeddings = self.embedding_model.encode(contents, convert_to_numpy=True)
+        # Generate embeddings (unchanged content comes from the cache)
+        embeddings = self._embed(contents)
 
-        # Generate IDs
-        existing_count = self.collection.count()
-        ids = [f"doc_{existing_count + i}" for i in range(len(documents))]
+        if ids is None:
+            ids = chunk_ids(documents)
 
-        # Add to collection
-        self.collection.add(
+        # Upsert so re-adding a chunk replaces it instead of duplicating it
+        self.collection.upsert(
             embeddings=embeddings.tolist(),
             documents=contents,
             metadatas=metadatas,
             ids=ids
         )
 
+        # Always index: a concurrent first load may have snapshotted the collection
+        # before this upsert, and re-adding chunks it did see is idempotent
+        if self.lexical_index is not None:
+            self.lexical_index.add(ids, contents, metadatas)
+
         return len(documents)
 
+    def update_metadata(self, ids: List[str], metadatas: List[Dict], batch_size: int = 1000) -> None:
+        """Replace the metadata of stored documents."""
+        for start in range(0, len(ids), batch_size):
+            self.collection.update(
+                ids=ids[start:start + batch_size],
+                metadatas=metadatas[start:start + batch_size]
+            )
+
+    def _embed(self, contents: List[str]):
+        """Embed document chunks, reusing cached embeddings when enabled."""
+        if self.embedding_cache is None:
+            return self.embedding_model.encode(contents, convert_to_numpy=True)
+        return self.embedding_cache.encode(
+            contents,
+            lambda texts: self.embedding_model.encode(texts, convert_to_numpy=True)
+        )
+
     def search(
         self,
         query: str,
@@ -79,6 +130,7 @@ class VectorStore:
         if results["documents"] and results["documents"][0]:
             for i in range(len(results["documents"][0])):
                 formatted_results.append({
+                    "id": results["ids"][0][i],
                     "content": results["documents"][0][i],
                     "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
                     "distance": results["distances"][0][i] if results["distances"] else 0,
@@ -86,18 +138,78 @@ class VectorStore:
 
         return formatted_results
 
-    def delete_by_source(self, source: str) -> int:
-        """Delete all documents from a specific source."""
+    def lexical_search(
+        self,
+        query: str,
+        n_results: int = 5,
+        filter_metadata: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Search by keywords (BM25); finds exact identifiers and error strings."""
+        index = self._loaded_lexical_index()
+        if index is None:
+            return []
+
+        hits = index.search(query, n_results=n_results, filter_metadata=filter_metadata)
+        if not hits:
+            return []
+        stored = self.collection.get(ids=[doc_id for doc_id, _ in hits])
+        found = {
+            doc_id: (content, metadata)
+            for doc_id, content, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"])
+        }
+
+        return [
+            {
+                "id": doc_id,
+                "content": found[doc_id][0],
+                "metadata": found[doc_id][1] or {},
+                "score": score,
+            }
+            for doc_id, score in hits
+            if doc_id in found
+        ]
+
+    def _loaded_lexical_index(self) -> Optional[LexicalIndex]:
+        """The lexical index, built from the collection on first use."""
+        if self.lexical_index is None:
+            return None
+
+        def fetch():
+            stored = self.collection.get(include=["documents", "metadatas"])
+            return stored["ids"], stored["documents"], stored["metadatas"]
+
+        self.lexical_index.load(fetch)
+        return self.lexical_index
+
+    def delete_by_source(self, source: str, keep_ids: Optional[List[str]] = None) -> int:
+        """Delete all documents from a specific source, except ``keep_ids``."""
         try:
             # Get all documents with this source
             results = self.collection.get(
                 where={"source": source}
             )
 
-            if results["ids"]:
-                self.collection.delete(ids=results["ids"])
-                return len(results["ids"])
+            keep = set(keep_ids or [])
+            ids = [i for i in results["ids"] if i not in keep]
+            if ids:
+                self.collection.delete(ids=ids)
+                if self.lexical_index is not None:
+                    self.lexical_index.remove(ids)
+                return len(ids)
+            return 0
+        except Exception as e:
+            print(f"Error deleting documents: {e}")
+            return 0
+
+    def delete_ids(self, ids: List[str]) -> int:
+        """Delete documents by ID."""
+        if not ids:
             return 0
+        try:
+            self.collection.delete(ids=ids)
+            if self.lexical_index is not None:
+                self.lexical_index.remove(ids)
+            return len(ids)
         except Exception as e:
             print(f"Error deleting documents: {e}")
             return 0
@@ -109,6 +221,8 @@ class VectorStore:
             name=self.collection_name,
             metadata={"hnsw:space": "cosine"}
         )
+        if self.lexical_index is not None:
+            self.lexical_index.clear()
 
     def get_stats(self) -> Dict:
         """Get statistics about the vector store."""
@@ -126,20 +240,24 @@ class VectorStore:
                 if "file_type" in metadata:
                     file_types.add(metadata["file_type"])
 
-            return {
+            stats = {
                 "total_documents": count,
                 "unique_sources": len(sources),
                 "file_types": list(file_types),
                 "sources": list(sources),
             }
         else:
-            return {
+            stats = {
                 "total_documents": 0,
                 "unique_sources": 0,
                 "file_types": [],
                 "sources": [],
             }
 
+        if self.embedding_cache is not None:
+            stats["embedding_cache"] = self.embedding_cache.stats()
+        return stats
+
     def list_sources(self) -> List[str]:
         """List all unique sources in the vector store."""
         try:
@@ -0,0 +1,108 @@
+"""RAG 검색 벤치마크: 벡터 / BM25 / 하이브리드(RRF) 비교
+
+디렉토리의 코드를 임시 벡터 스토어에 색인한 뒤, `def`/`class` 이름을 질의로
+삼고 그 정의가 들어 있는 청크를 정답으로 하여 recall@k와 지연 시간(p50/p95)을
+출력합니다. (chromadb, sentence-transformers 필요)
+
+사용법:
+    python tests/benchmark_retrieval.py [디렉토리] [--k 5] [--queries 100]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(ROOT))
+
+DEFINITION_PATTERN = re.compile(r"\b(?:def|class)\s+([A-Za-z_]\w{3,})")
+
+
+def build_queries(collection, limit: int, seed: int = 0) -> dict:
+    """정의 이름 -> 그 정의가 들어 있는 청크 ID 집합"""
+    stored = collection.get(include=["documents"])
+    relevant = {}
+    for doc_id, content in zip(stored["ids"], stored["documents"]):
+        for name in DEFINITION_PATTERN.findall(content):
+            relevant.setdefault(name, set()).add(doc_id)
+
+    names = sorted(relevant)
+    random.Random(seed).shuffle(names)
+    return {name: relevant[name] for name in names[:limit]}
+
+
+def measure(search, queries: dict, k: int) -> dict:
+    """검색 함수별 recall@k와 지연 시간"""
+    search(next(iter(queries)), k)  # 워밍업 (BM25 인덱스 로드 등)
+
+    hits = 0
+    latencies = []
+    for query, relevant in queries.items():
+        started = time.perf_counter()
+        results = search(query, k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if relevant.intersection(result["id"] for result in results):
+            hits += 1
+
+    latencies.sort()
+    return {
+        "recall": hits / len(queries),
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG retrieval benchmark")
+    parser.add_argument("directory", nargs="?", default=str(ROOT))
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    store_path = tempfile.mkdtemp(prefix="rag-bench-")
+    os.environ["VECTOR_STORE_PATH"] = store_path  # settings보다 먼저 설정
+
+    from rag import Retriever
+
+    try:
+        retriever = Retriever("benchmark")
+        print(f"📥 색인 중: {args.directory}")
+        started = time.perf_counter()
+        summary = asyncio.run(retriever.sync_directory(args.directory))
+        print(f"   {summary['chunks_added']}개 청크, {time.perf_counter() - started:.1f}s")
+
+        queries = build_queries(retriever.vectorstore.collection, args.queries)
+        if not queries:
+            print("❌ 질의로 쓸 정의를 찾지 못했습니다")
+            return False
+        print(f"🔍 질의 {len(queries)}개, k={args.k}\n")
+
+        store = retriever.vectorstore
+        modes = {
+            "vector": lambda q, k: store.search(q, n_results=k),
+            "bm25": lambda q, k: store.lexical_search(q, n_results=k),
+            "hybrid": lambda q, k: retriever.retrieve(q, n_results=k),
+        }
+
+        print(f"{'mode':<8} {'recall@' + str(args.k):>10} {'p50 ms':>9} {'p95 ms':>9}")
+        for name, search in modes.items():
+            result = measure(search, queries, args.k)
+            print(f"{name:<8} {result['recall']:>10.3f} {result['p50']:>9.1f} {result['p95']:>9.1f}")
+        return True
+    finally:
+        shutil.rmtree(store_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
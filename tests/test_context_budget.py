@@ -0,0 +1,92 @@
+"""토큰 카운터 / 컨텍스트 예산 테스트
+
+모델별 토크나이저 근사치와 ContextBudgeter의 예산 배분을 검증합니다.
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm import Message
+from utils.context_budget import ContextBudgeter, get_context_window
+from utils.tokenizer import ApproxTokenizer, get_tokenizer
+
+
+# ========== Test 1: 토크나이저 ==========
+def test_tokenizer():
+    """코드는 len/4보다 많이, 평문 영어는 적게 세는지 확인"""
+    print("\n📋 Test 1: 토크나이저 근사치")
+
+    tokenizer = ApproxTokenizer("openai")
+    prose = "The quick brown fox jumps over the lazy dog. " * 20
+    code = "def f(x):\n    return {'a': [x[0], x[1]]}  # ...\n" * 20
+
+    print(f"   prose: {tokenizer.count(prose)} tokens (len/4 = {len(prose) // 4})")
+    print(f"   code:  {tokenizer.count(code)} tokens (len/4 = {len(code) // 4})")
+    assert tokenizer.count(prose) < len(prose) // 4
+    assert tokenizer.count(code) > len(code) // 4
+    assert tokenizer.count("안녕하세요") >= 5, "한글은 음절당 1토큰 이상"
+
+    truncated = tokenizer.truncate(code, 50)
+    assert tokenizer.count(truncated) <= 50
+    assert get_tokenizer("claude", "claude-3-5-sonnet-20241022") is get_tokenizer(
+        "claude", "claude-3-5-sonnet-20241022"
+    ), "토크나이저는 캐시되어야 합니다"
+
+    print("   ✅ 토크나이저 동작 확인")
+    return True
+
+
+# ========== Test 2: 컨텍스트 예산 ==========
+def test_context_budgeter():
+    """작은 섹션은 그대로, 큰 섹션은 잘리고, 오래된 히스토리부터 제외되는지 확인"""
+    print("\n📋 Test 2: 컨텍스트 예산 배분")
+
+    assert get_context_window("claude-3-5-sonnet-20241022") == 200000
+    assert get_context_window("gpt-4-turbo-preview") == 128000
+
+    budgeter = ContextBudgeter(context_window=3000, reserved_output_tokens=1000, safety_margin=0)
+    history = [Message(role="user", content=f"turn {i} " + "word " * 100) for i in range(10)]
+    plan = budgeter.allocate(
+        fixed=["system prompt"],
+        sections={
+            "project_info": "small project",
+            "relevant_files": "x = 1\n" * 2000,
+            "rag_context": "",
+        },
+        history=history,
+    )
+
+    print(f"   배분: {plan.allocations}")
+    print(f"   사용: {plan.used_tokens}")
+    assert plan.sections["project_info"] == "small project"
+    assert "relevant_files" in plan.truncated
+    assert sum(plan.used_tokens.values()) <= plan.available_tokens
+    assert plan.history and plan.history[-1] is history[-1], "최근 대화는 유지되어야 합니다"
+    assert len(plan.history) < len(history)
+
+    print("   ✅ 컨텍스트 예산 동작 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "tokenizer": test_tokenizer(),
+        "context_budgeter": test_context_budgeter(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
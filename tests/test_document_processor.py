@@ -0,0 +1,177 @@
+"""문서 처리기 테스트
+
+가짜 splitter로 IncrementalChunker의 페이지 단위 청킹(페이지 번호,
+누락 없는 청크, 제한된 버퍼)과 PDF/텍스트 청크의 메타데이터 스키마
+일치(total_chunks)를 검증합니다.
+"""
+
+import asyncio
+import importlib
+import re
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(ROOT))
+
+# rag/__init__.py는 chromadb를 import하므로 패키지 초기화 없이 하위 모듈만 로드
+rag = types.ModuleType("rag")
+rag.__path__ = [str(ROOT / "rag")]
+sys.modules.setdefault("rag", rag)
+document_processor = importlib.import_module("rag.document_processor")
+
+CHUNK_SIZE = 60
+
+
+class FakeSplitter:
+    """단어 N개씩 (M개 겹치게) 자르는 가짜 splitter; 청크는 입력의 부분 문자열"""
+
+    def __init__(self, words: int = 6, overlap: int = 2):
+        self.words = words
+        self.overlap = overlap
+        self.calls = []
+
+    def split_text(self, text):
+        self.calls.append(len(text))
+        spans = [m.span() for m in re.finditer(r"\S+", text)]
+        chunks = []
+        for start in range(0, len(spans), self.words - self.overlap):
+            window = spans[start:start + self.words]
+            chunks.append(text[window[0][0]:window[-1][1]])
+            if start + self.words >= len(spans):
+                break
+        return chunks
+
+
+def page_text(page: int, words: int = 15) -> str:
+    return " ".join(f"p{page}w{i}" for i in range(words))
+
+
+def word_page(word: str) -> int:
+    return int(word[1:word.index("w")])
+
+
+def feed_all(chunker, pages):
+    documents = []
+    for page, text in pages:
+        documents.extend(chunker.feed(page, text))
+    documents.extend(chunker.close())
+    return documents
+
+
+# ========== Test 1: 페이지 단위 청킹 ==========
+def test_incremental_chunker():
+    """청크 번호, 시작/끝 페이지, 단어 누락 여부 확인"""
+    print("\n📋 Test 1: 페이지 단위 청킹")
+
+    pages = [(page, page_text(page)) for page in range(1, 9)]
+    chunker = document_processor.IncrementalChunker(FakeSplitter(), CHUNK_SIZE, {"source": "manual.pdf"})
+    documents = feed_all(chunker, pages)
+
+    assert [doc["metadata"]["chunk_id"] for doc in documents] == list(range(len(documents)))
+    for doc in documents:
+        words = doc["content"].split()
+        metadata = doc["metadata"]
+        assert metadata["source"] == "manual.pdf"
+        assert metadata["page"] == word_page(words[0]), doc
+        if word_page(words[-1]) != metadata["page"]:
+            assert metadata["page_end"] == word_page(words[-1]), doc
+        else:
+            assert "page_end" not in metadata, doc
+
+    fed = {word for _, text in pages for word in text.split()}
+    chunked = {word for doc in documents for word in doc["content"].split()}
+    assert chunked == fed, "모든 단어가 어떤 청크에든 들어가야 함"
+    assert any("page_end" in doc["metadata"] for doc in documents), "페이지를 넘는 청크 존재"
+
+    print(f"   청크 {len(documents)}개")
+    print("   ✅ 페이지 단위 청킹 확인")
+    return True
+
+
+# ========== Test 2: 버퍼 크기 제한 ==========
+def test_bounded_buffer():
+    """문서가 길어져도 남은 꼬리만 보관하는지 확인"""
+    print("\n📋 Test 2: 버퍼 크기 제한")
+
+    splitter = FakeSplitter()
+    chunker = document_processor.IncrementalChunker(splitter, CHUNK_SIZE, {})
+    longest = 0
+    for page in range(1, 201):
+        chunker.feed(page, page_text(page))
+        longest = max(longest, len(chunker._buffer))
+        assert len(chunker._pages) <= 3
+    chunker.close()
+
+    page_length = len(page_text(200)) + 1
+    assert longest < 2 * CHUNK_SIZE + page_length, longest
+    assert max(splitter.calls) < 2 * CHUNK_SIZE + page_length, "전체 문서를 한 번에 나누지 않음"
+    assert chunker._buffer == "" and chunker._pages == []
+
+    # 빈 페이지만 있으면 청크 없음
+    empty = document_processor.IncrementalChunker(FakeSplitter(), CHUNK_SIZE, {})
+    assert feed_all(empty, [(1, ""), (2, "")]) == []
+
+    print(f"   최대 버퍼 {longest}자")
+    print("   ✅ 버퍼 크기 제한 확인")
+    return True
+
+
+# ========== Test 3: 메타데이터 스키마 ==========
+def test_metadata_schema():
+    """PDF 청크도 텍스트 청크처럼 total_chunks를 갖는지 확인"""
+    print("\n📋 Test 3: 메타데이터 스키마")
+
+    processor = document_processor.DocumentProcessor()
+    processor.text_splitter = FakeSplitter()
+    processor.chunk_size = CHUNK_SIZE
+
+    pages = [(page, page_text(page)) for page in range(1, 5)]
+    original = document_processor.iter_pdf_pages
+    document_processor.iter_pdf_pages = lambda file_path: iter(pages)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf = Path(tmp) / "manual.pdf"
+            pdf.write_bytes(b"")
+            txt = Path(tmp) / "notes.txt"
+            txt.write_text("\n".join(text for _, text in pages), encoding="utf-8")
+
+            pdf_documents = asyncio.run(processor.process_file(str(pdf)))
+            txt_documents = asyncio.run(processor.process_file(str(txt)))
+    finally:
+        document_processor.iter_pdf_pages = original
+
+    assert pdf_documents and txt_documents
+    for documents in (pdf_documents, txt_documents):
+        assert all(doc["metadata"]["total_chunks"] == len(documents) for doc in documents)
+    assert set(txt_documents[0]["metadata"]) <= set(pdf_documents[0]["metadata"])
+    assert pdf_documents[0]["metadata"]["file_type"] == ".pdf"
+
+    print("   ✅ 메타데이터 스키마 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "incremental_chunker": test_incremental_chunker(),
+        "bounded_buffer": test_bounded_buffer(),
+        "metadata_schema": test_metadata_schema(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
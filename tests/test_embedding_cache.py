@@ -0,0 +1,147 @@
+"""임베딩 캐시 테스트
+
+가짜 인코더로 float16 memmap 저장, 적중/미스 집계, 재시작 후 재사용,
+잘린 꼬리(torn tail) 정리를 검증합니다.
+(sentence-transformers 없이 numpy와 rag/embedding_cache.py만 사용)
+"""
+
+import importlib.util
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(ROOT))
+
+# rag 패키지 import 시 chromadb/sentence-transformers가 필요하므로 모듈만 직접 로드
+spec = importlib.util.spec_from_file_location("embedding_cache", ROOT / "rag" / "embedding_cache.py")
+embedding_cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(embedding_cache)
+
+DIM = 4
+
+
+class FakeEncoder:
+    """텍스트마다 결정적인 벡터를 만들고 인코딩한 텍스트를 기록"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(text), ord(text[0]), 0.1, -1.5] for text in texts], dtype=np.float32)
+
+
+# ========== Test 1: 적중 / 미스 ==========
+def test_hits_and_misses():
+    """처음 보는 내용만 인코딩하고 적중/미스를 집계하는지 확인"""
+    print("\n📋 Test 1: 적중 / 미스")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = embedding_cache.EmbeddingCache(Path(tmp), "org/model")
+        encoder = FakeEncoder()
+
+        first = cache.encode(["alpha", "beta", "alpha"], encoder)
+        assert encoder.calls == [["alpha", "beta"]], "중복 내용은 한 번만 인코딩"
+        assert first.shape == (3, DIM) and first.dtype == np.float32
+        assert np.array_equal(first[0], first[2])
+
+        second = cache.encode(["beta", "gamma"], encoder)
+        assert encoder.calls[-1] == ["gamma"], "캐시된 내용은 인코딩하지 않음"
+        assert np.array_equal(second[0], first[1])
+
+        stats = cache.stats()
+        print(f"   {stats}")
+        assert stats["hits"] == 1 and stats["misses"] == 3
+        assert stats["entries"] == 3 and stats["dim"] == DIM
+        assert stats["bytes"] == 3 * DIM * 2, "float16 행으로 저장"
+        assert cache.encode([], encoder).shape == (0, DIM)
+
+    print("   ✅ 적중 / 미스 확인")
+    return True
+
+
+# ========== Test 2: 재시작 후 재사용 ==========
+def test_reload():
+    """새 인스턴스가 memmap으로 저장된 벡터를 그대로 읽는지 확인"""
+    print("\n📋 Test 2: 재시작 후 재사용")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = embedding_cache.EmbeddingCache(Path(tmp), "org/model").encode(["alpha", "beta"], FakeEncoder())
+
+        encoder = FakeEncoder()
+        cache = embedding_cache.EmbeddingCache(Path(tmp), "org/model")
+        after = cache.encode(["beta", "alpha"], encoder)
+        assert encoder.calls == [], "저장된 벡터를 재사용해야 합니다"
+        assert np.array_equal(after, before[::-1])
+        assert isinstance(cache._vectors, np.memmap)
+
+        # 모델마다 따로 저장
+        other = embedding_cache.EmbeddingCache(Path(tmp), "org/other-model")
+        other.encode(["alpha"], encoder)
+        assert encoder.calls == [["alpha"]]
+
+    print("   ✅ 재시작 후 재사용 확인")
+    return True
+
+
+# ========== Test 3: 잘린 꼬리 정리 ==========
+def test_torn_tail():
+    """중간에 끊긴 쓰기(해시 없는 행, 덜 쓴 행)를 로드 시 잘라내는지 확인"""
+    print("\n📋 Test 3: 잘린 꼬리 정리")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = embedding_cache.EmbeddingCache(Path(tmp), "org/model")
+        expected = cache.encode(["alpha", "beta"], FakeEncoder())
+        row_bytes = DIM * 2
+
+        # 해시가 기록되기 전에 끊긴 행 하나 + 덜 쓴 행
+        with open(cache.vectors_path, "ab") as f:
+            f.write(b"\x01" * row_bytes + b"\x02" * 3)
+
+        reloaded = embedding_cache.EmbeddingCache(Path(tmp), "org/model")
+        assert reloaded.stats()["entries"] == 2
+        assert cache.vectors_path.stat().st_size == 2 * row_bytes
+
+        # 벡터 없이 해시만 남은 경우
+        with open(cache.index_path, "a") as f:
+            f.write("0" * 64 + "\n")
+        reloaded = embedding_cache.EmbeddingCache(Path(tmp), "org/model")
+        assert reloaded.stats()["entries"] == 2
+        assert len(cache.index_path.read_text().split()) == 2
+
+        # 정리 후 추가한 행도 올바르게 정렬되어야 함
+        encoder = FakeEncoder()
+        vectors = reloaded.encode(["gamma", "alpha", "beta"], encoder)
+        assert encoder.calls == [["gamma"]]
+        assert np.array_equal(vectors[1:], expected)
+        assert np.array_equal(vectors[0], np.asarray(encoder(["gamma"]), dtype=np.float16)[0].astype(np.float32))
+
+    print("   ✅ 잘린 꼬리 정리 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "hits_and_misses": test_hits_and_misses(),
+        "reload": test_reload(),
+        "torn_tail": test_torn_tail(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -403,6 +403,87 @@ print(test_var)
     return True
 
 
+# ========== Test 7: 스트리밍 파싱 ==========
+print("\n\n📋 Test 7: 스트리밍 응답 파싱 및 조기 검증")
+print("=" * 70)
+
+
+async def test_streaming_fix():
+    """코드 블록이 닫히는 즉시 검증하고, 문법 오류면 스트림을 중단하는지 확인"""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("error_fixer", "agents/error_fixer.py")
+    error_fixer_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(error_fixer_module)
+
+    from utils.helpers import extract_code_blocks
+    from utils.markdown_stream import CodeBlock, MarkdownStreamParser, Section
+    from tools.executor import CodeExecutor
+
+    AutoErrorFixer = error_fixer_module.AutoErrorFixer
+
+    response = """### 1. 원인 분석
+괄호가 닫히지 않았습니다.
+
+### 2. 수정 방법
+괄호를 닫습니다.
+
+### 3. 수정된 코드
+```python
+print("hi"
+```
+
+### 4. 추가 작업
+pip install requests
+"""
+
+    print("\n1️⃣ 청크 단위 파싱...")
+    parser = MarkdownStreamParser()
+    events = []
+    for i in range(0, len(response), 3):
+        events.extend(parser.feed(response[i:i + 3]))
+    events.extend(parser.close())
+
+    sections = [e.title for e in events if isinstance(e, Section)]
+    blocks = [e for e in events if isinstance(e, CodeBlock)]
+    assert sections == ["1. 원인 분석", "2. 수정 방법", "3. 수정된 코드", "4. 추가 작업"]
+    assert [(b.language, b.code) for b in blocks] == [
+        (b["language"], b["code"]) for b in extract_code_blocks(response)
+    ]
+    assert blocks[0].section == "3. 수정된 코드"
+    print(f"   ✅ 섹션 {len(sections)}개, 코드 블록 {len(blocks)}개")
+
+    print("\n2️⃣ 문법 오류 시 스트림 조기 중단...")
+
+    class StreamingLLMManager:
+        def __init__(self):
+            self.sent = 0
+
+        async def stream_generate(self, messages):
+            for i in range(0, len(response), 3):
+                self.sent += 1
+                yield response[i:i + 3]
+
+    llm = StreamingLLMManager()
+    fixer = AutoErrorFixer(llm, None)
+    error_info = error_fixer_module.ErrorInfo(
+        "SyntaxError", "'(' was never closed", "", None, 1, None, None
+    )
+    fix = await fixer.generate_fix(
+        error_info,
+        'print("hi"',
+        validator=lambda code: CodeExecutor().validate_code(code, "python")
+    )
+
+    assert fix["validation"]["valid"] is False
+    assert fix["fixed_code"] == 'print("hi"'
+    assert fix["additional_tasks"] == [], "4번 섹션 전에 중단되어야 합니다"
+    assert llm.sent < len(range(0, len(response), 3))
+    print(f"   ✅ {llm.sent}개 청크에서 중단")
+
+    print("\n✅ 스트리밍 파싱 테스트 통과!")
+    return True
+
+
 # ========== 실행 ==========
 async def main():
     """모든 테스트 실행"""
@@ -428,6 +509,9 @@ async def main():
         # Test 6: 통합 테스트
         results["integration"] = await test_integration_mock()
 
+        # Test 7: 스트리밍 파싱
+        results["streaming_fix"] = await test_streaming_fix()
+
     except Exception as e:
         print(f"\n❌ 예외 발생: {e}")
         import traceback
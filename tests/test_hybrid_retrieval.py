@@ -0,0 +1,138 @@
+"""하이브리드 검색(BM25 + 벡터, RRF) 테스트
+
+코드 식별자/에러 문자열 토큰화, BM25 인덱스의 증분 갱신,
+RRF 결합을 검증합니다. (chromadb 없이 rag/hybrid.py만 로드)
+"""
+
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(ROOT))
+
+# rag 패키지 import 시 chromadb/sentence-transformers가 필요하므로 모듈만 직접 로드
+spec = importlib.util.spec_from_file_location("hybrid", ROOT / "rag" / "hybrid.py")
+hybrid = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hybrid)
+
+
+# ========== Test 1: 토큰화 ==========
+def test_tokenize():
+    """식별자는 통째로, 그리고 단어 단위로도 색인되는지 확인"""
+    print("\n📋 Test 1: 토큰화")
+
+    terms = hybrid.tokenize("raise KeyError in getUserName(max_retries)")
+    print(f"   {terms}")
+    for term in ("keyerror", "key", "error", "getusername", "user", "max_retries", "retries"):
+        assert term in terms, term
+    assert "(" not in terms
+
+    print("   ✅ 토큰화 확인")
+    return True
+
+
+# ========== Test 2: BM25 인덱스 ==========
+def test_lexical_index():
+    """정확한 식별자 매칭, upsert/삭제, 메타데이터 필터 확인"""
+    print("\n📋 Test 2: BM25 인덱스")
+
+    index = hybrid.LexicalIndex()
+    index.add(
+        ["a", "b", "c"],
+        [
+            "def parse_config(path): load the configuration file",
+            "The configuration is loaded at startup and cached",
+            "ConnectionResetError: [Errno 104] Connection reset by peer",
+        ],
+        [
+            {"source": "config.py", "file_type": ".py"},
+            {"source": "README.md", "file_type": ".md"},
+            {"source": "errors.md", "file_type": ".md"},
+        ],
+    )
+
+    assert index.search("parse_config")[0][0] == "a"
+    assert index.search("ConnectionResetError")[0][0] == "c"
+    assert [doc_id for doc_id, _ in index.search("configuration", filter_metadata={"file_type": ".md"})] == ["b"]
+
+    # 같은 ID로 다시 추가하면 교체
+    index.add(["a"], ["def load_settings(): pass"], [{"source": "config.py"}])
+    assert len(index) == 3
+    assert not index.search("parse_config")
+    assert index.search("load_settings")[0][0] == "a"
+
+    index.remove(["a", "missing"])
+    assert len(index) == 2 and not index.search("load_settings")
+    assert "load_settings" not in index._postings, "빈 posting은 정리되어야 합니다"
+
+    # 첫 로드가 컬렉션을 읽은 뒤 들어온 청크도 색인되어야 함 (VectorStore는 항상 add 호출)
+    index = hybrid.LexicalIndex()
+    snapshot_taken = threading.Event()
+
+    def fetch():
+        snapshot_taken.set()
+        time.sleep(0.1)
+        return ["a"], ["def parse_config(): pass"], [{}]
+
+    loader = threading.Thread(target=index.load, args=(fetch,))
+    loader.start()
+    snapshot_taken.wait()
+    index.add(["b"], ["def load_settings(): pass"], [{}])
+    index.add(["a"], ["def parse_config(): pass"], [{}])
+    loader.join()
+    assert index.loaded and len(index) == 2
+    assert index.search("load_settings")[0][0] == "b"
+
+    print("   ✅ BM25 인덱스 확인")
+    return True
+
+
+# ========== Test 3: RRF 결합 ==========
+def test_rank_fusion():
+    """양쪽 검색에 모두 나온 문서가 위로 오고, 가중치가 반영되는지 확인"""
+    print("\n📋 Test 3: RRF 결합")
+
+    vector = [{"id": "v1", "distance": 0.1}, {"id": "both", "distance": 0.2}, {"id": "v2", "distance": 0.3}]
+    lexical = [{"id": "l1", "score": 9.0}, {"id": "both", "score": 5.0}]
+
+    fused = hybrid.fuse_results([vector, lexical], n_results=3)
+    print(f"   {[r['id'] for r in fused]}")
+    assert fused[0]["id"] == "both"
+    assert fused[0]["distance"] == 0.2, "앞선 목록의 필드를 유지해야 합니다"
+    assert len(fused) == 3
+
+    lexical_heavy = hybrid.fuse_results([vector, lexical], weights=[0.2, 1.0], n_results=2)
+    assert [r["id"] for r in lexical_heavy] == ["both", "l1"]
+
+    vector_only = hybrid.fuse_results([vector, lexical], weights=[1.0, 0.0], n_results=3)
+    assert [r["id"] for r in vector_only] == ["v1", "both", "v2"]
+
+    print("   ✅ RRF 결합 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "tokenize": test_tokenize(),
+        "lexical_index": test_lexical_index(),
+        "rank_fusion": test_rank_fusion(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
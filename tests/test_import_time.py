@@ -0,0 +1,108 @@
+"""import 시간 회귀 테스트
+
+`python -X importtime` 출력을 파싱해서 `llm` 패키지를 import할 때
+프로바이더 SDK(anthropic, openai, groq)가 함께 로드되지 않는지,
+전체 import 시간이 예산 안에 있는지 확인합니다.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(ROOT))
+
+# `import llm` 누적 시간 예산 (SDK를 즉시 import하던 때는 약 1.9초)
+IMPORT_BUDGET_MS = 800
+
+PROVIDER_SDKS = ("anthropic", "openai", "groq")
+
+
+def measure_imports(statement: str) -> dict:
+    """새 인터프리터에서 statement를 실행하고 모듈별 누적 import 시간(ms)을 반환"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        timings[module.strip()] = int(cumulative) / 1000
+    return timings
+
+
+# ========== Test 1: SDK lazy import ==========
+def test_sdks_not_imported():
+    """`import llm`과 LLMManager 생성 시 SDK가 로드되지 않는지 확인"""
+    print("\n📋 Test 1: 프로바이더 SDK lazy import")
+
+    timings = measure_imports("import llm; llm.LLMManager()")
+    loaded = [sdk for sdk in PROVIDER_SDKS if sdk in timings]
+
+    print(f"   import된 SDK: {loaded or '없음'}")
+    assert not loaded, f"SDK가 import 시점에 로드됨: {loaded}"
+
+    timings = measure_imports("import llm; llm.LLMManager()._get_llm('mock')")
+    assert not [sdk for sdk in PROVIDER_SDKS if sdk in timings], "mock은 SDK가 필요 없습니다"
+
+    print("   ✅ SDK는 처음 사용할 때만 로드됩니다")
+    return True
+
+
+# ========== Test 2: import 시간 예산 ==========
+def test_import_budget():
+    """`import llm` 누적 시간이 예산 이내인지 확인 (3회 중 최솟값)"""
+    print("\n📋 Test 2: import 시간 예산")
+
+    best = min(measure_imports("import llm")["llm"] for _ in range(3))
+
+    print(f"   import llm: {best:.1f}ms (예산 {IMPORT_BUDGET_MS}ms)")
+    assert best < IMPORT_BUDGET_MS, f"import llm이 {best:.1f}ms로 예산을 초과했습니다"
+
+    print("   ✅ import 시간 예산 이내")
+    return True
+
+
+# ========== Test 3: 문서 파서 모듈 ==========
+def test_extractors_light():
+    """수집 워커가 import하는 rag.extractors가 chromadb/langchain/모델을 로드하지 않는지 확인"""
+    print("\n📋 Test 3: rag.extractors import")
+
+    timings = measure_imports("import rag.extractors")
+    heavy = [name for name in ("chromadb", "langchain", "sentence_transformers", "rag.retriever") if name in timings]
+
+    print(f"   rag.extractors: {timings['rag.extractors']:.1f}ms")
+    assert not heavy, f"워커 import에 무거운 모듈이 포함됨: {heavy}"
+
+    print("   ✅ 워커는 파서만 로드합니다")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "sdks_not_imported": test_sdks_not_imported(),
+        "import_budget": test_import_budget(),
+        "extractors_light": test_extractors_light(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
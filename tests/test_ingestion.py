@@ -0,0 +1,409 @@
+"""수집 파이프라인 테스트
+
+가짜 벡터 저장소로 업로드 파일의 재수집(건너뛰기/교체/삭제),
+디렉토리 동기화, 실패 경로(파싱 실패, 저장 실패 시 고아 청크 정리,
+청킹 중간 실패, 요청 취소)를 검증합니다.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(ROOT))
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from rag import ingestion
+from rag.document_processor import DocumentProcessor
+from rag.ingestion import IngestionPipeline
+from rag.manifest import SourceManifest
+from rag.retriever import Retriever
+from utils.request_context import RequestCancelled, RequestContext
+
+
+class StubVectorStore:
+    """청크를 딕셔너리에 보관하는 가짜 벡터 저장소"""
+
+    def __init__(self, fail_on=None):
+        self.docs = {}  # id -> (content, metadata)
+        self.fail_on = fail_on  # 이 문자열이 든 청크를 저장하려 하면 실패
+
+    def add_documents(self, documents, ids=None):
+        if self.fail_on and any(self.fail_on in doc["content"] for doc in documents):
+            raise RuntimeError("store unavailable")
+        for doc, doc_id in zip(documents, ids):
+            self.docs[doc_id] = (doc["content"], dict(doc["metadata"]))
+        return len(documents)
+
+    def update_metadata(self, ids, metadatas, batch_size=1000):
+        for doc_id, metadata in zip(ids, metadatas):
+            self.docs[doc_id] = (self.docs[doc_id][0], dict(metadata))
+
+    def delete_ids(self, ids):
+        for doc_id in ids:
+            self.docs.pop(doc_id, None)
+        return len(ids)
+
+    def delete_by_source(self, source, keep_ids=None):
+        keep = set(keep_ids or [])
+        ids = [i for i, (_, metadata) in self.docs.items() if metadata["source"] == source and i not in keep]
+        return self.delete_ids(ids)
+
+    def contents(self, source):
+        return sorted(content for content, metadata in self.docs.values() if metadata["source"] == source)
+
+
+class ExplodingSplitter(RecursiveCharacterTextSplitter):
+    """"boom"이 든 텍스트를 나누려 하면 실패하는 splitter"""
+
+    def split_text(self, text):
+        if "boom" in text:
+            raise ValueError("cannot split")
+        return super().split_text(text)
+
+
+def write_pdf(path: Path, pages) -> None:
+    """페이지마다 한 줄씩 텍스트가 있는 PDF"""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for text in pages:
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    writer.write(str(path))
+
+
+def run_pipeline(pipeline: IngestionPipeline, paths, **options) -> dict:
+    """PDF를 한 페이지씩 보내며 실행하고 진행 보고 횟수를 summary에 추가"""
+    reports = []
+    original = ingestion.PDF_PAGES_PER_TASK
+    ingestion.PDF_PAGES_PER_TASK = 1
+    try:
+        summary = asyncio.run(pipeline.run([str(path) for path in paths], progress=reports.append, **options))
+    finally:
+        ingestion.PDF_PAGES_PER_TASK = original
+    summary["reports"] = len(reports)
+    return summary
+
+
+def small_processor() -> DocumentProcessor:
+    """문단마다 청크 하나가 되도록 작게 자르는 처리기"""
+    processor = DocumentProcessor()
+    processor.chunk_size = 25
+    processor.text_splitter = RecursiveCharacterTextSplitter(chunk_size=25, chunk_overlap=0)
+    return processor
+
+
+def make_pipeline(tmp: Path, store: StubVectorStore) -> IngestionPipeline:
+    manifest = SourceManifest(tmp / "manifest.json")
+    return IngestionPipeline(store, small_processor(), manifest, workers=2, batch_size=2, queue_size=2)
+
+
+def make_retriever(tmp: Path, store: StubVectorStore) -> Retriever:
+    """Chroma 없이 가짜 저장소를 쓰는 Retriever"""
+    retriever = Retriever.__new__(Retriever)
+    retriever.vectorstore = store
+    retriever.doc_processor = small_processor()
+    retriever.manifest = SourceManifest(tmp / "manifest.json")
+    retriever.reranker = None
+    return retriever
+
+
+# ========== Test 1: 업로드 파일 재수집 ==========
+def test_reupload():
+    """매번 다른 임시 경로로 올라온 같은 파일이 이름 하나로 관리되는지 확인"""
+    print("\n📋 Test 1: 업로드 파일 재수집")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        store = StubVectorStore()
+
+        def upload(name: str, text: str) -> dict:
+            path = tmp / "uploads" / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+            return asyncio.run(make_pipeline(tmp, store).run([str(path)], sources={str(path): "upload:guide.md"}))
+
+        first = upload("1a2b.md", "alpha paragraph one\n\nbeta paragraph two\n\ngamma paragraph three")
+        assert first["added"] == 1 and not first["errors"], first
+        assert ingestion._parse_pool is None, "텍스트 파일은 프로세스 풀 없이 읽음"
+        assert store.contents("upload:guide.md") == ["alpha paragraph one", "beta paragraph two", "gamma paragraph three"]
+        assert {metadata["source"] for _, metadata in store.docs.values()} == {"upload:guide.md"}
+        assert SourceManifest(tmp / "manifest.json").sources() == ["upload:guide.md"]
+
+        # 같은 내용을 새 임시 경로로 다시 올리면 건너뜀
+        again = upload("3c4d.md", "alpha paragraph one\n\nbeta paragraph two\n\ngamma paragraph three")
+        assert again["unchanged"] == 1 and again["chunks_added"] == 0, again
+        assert len(store.docs) == 3
+
+        # 수정된 파일은 교체: 사라진 청크는 삭제, 새 청크는 추가
+        changed = upload("5e6f.md", "alpha paragraph one\n\ndelta paragraph four")
+        assert changed["updated"] == 1, changed
+        assert store.contents("upload:guide.md") == ["alpha paragraph one", "delta paragraph four"]
+        assert len(store.docs) == 2, "중복 청크 없음"
+        manifest = SourceManifest(tmp / "manifest.json")
+        assert manifest.sources() == ["upload:guide.md"]
+        assert sorted(manifest.get("upload:guide.md")["chunk_ids"]) == sorted(store.docs)
+
+    print("   ✅ 업로드 파일 재수집 확인")
+    return True
+
+
+# ========== Test 2: 디렉토리 동기화 ==========
+def test_sync_directory():
+    """추가/변경/변경 없음/삭제된 파일과 무시할 파일 처리 확인"""
+    print("\n📋 Test 2: 디렉토리 동기화")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp).resolve()
+        docs = tmp / "docs"
+        (docs / "sub").mkdir(parents=True)
+        (docs / "node_modules").mkdir()
+        (docs / "a.txt").write_text("first file text", encoding="utf-8")
+        (docs / "sub" / "b.md").write_text("second file text", encoding="utf-8")
+        (docs / "node_modules" / "c.md").write_text("ignored", encoding="utf-8")
+        (docs / "d.bin").write_text("unsupported", encoding="utf-8")
+
+        store = StubVectorStore()
+        retriever = make_retriever(tmp, store)
+
+        summary = asyncio.run(retriever.sync_directory(str(docs)))
+        assert (summary["added"], summary["removed"]) == (2, 0), summary
+        assert len(store.docs) == 2
+
+        summary = asyncio.run(retriever.sync_directory(str(docs)))
+        assert (summary["added"], summary["unchanged"]) == (0, 2), summary
+
+        (docs / "a.txt").write_text("first file, edited text", encoding="utf-8")
+        summary = asyncio.run(retriever.sync_directory(str(docs)))
+        assert (summary["updated"], summary["unchanged"]) == (1, 1), summary
+        assert store.contents(str(docs / "a.txt")) == ["first file, edited text"]
+
+        (docs / "sub" / "b.md").unlink()
+        summary = asyncio.run(retriever.sync_directory(str(docs)))
+        assert (summary["unchanged"], summary["removed"]) == (1, 1), summary
+        assert store.contents(str(docs / "sub" / "b.md")) == []
+        assert retriever.manifest.sources() == [str(docs / "a.txt")]
+
+        # 하위 디렉토리만 동기화하면 다른 소스는 건드리지 않음
+        (docs / "sub" / "e.md").write_text("third file text", encoding="utf-8")
+        summary = asyncio.run(retriever.sync_directory(str(docs / "sub")))
+        assert (summary["added"], summary["removed"]) == (1, 0), summary
+        assert len(store.docs) == 2
+
+    print("   ✅ 디렉토리 동기화 확인")
+    return True
+
+
+# ========== Test 2-1: 동기화와 업로드 ==========
+def test_sync_keeps_uploads():
+    """현재 디렉토리를 동기화해도 업로드한 문서는 삭제하지 않는지 확인"""
+    print("\n📋 Test 2-1: 동기화와 업로드")
+
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp).resolve()
+        (tmp / "uploads").mkdir()
+        (tmp / "docs").mkdir()
+        upload = tmp / "uploads" / "9f8e.md"
+        upload.write_text("uploaded notes", encoding="utf-8")
+        (tmp / "docs" / "a.txt").write_text("synced file", encoding="utf-8")
+
+        store = StubVectorStore()
+        retriever = make_retriever(tmp, store)
+        asyncio.run(retriever.ingest([str(upload)], sources={str(upload): "upload:notes.md"}))
+
+        try:
+            os.chdir(tmp / "docs")
+            summary = asyncio.run(retriever.sync_directory("."))
+        finally:
+            os.chdir(cwd)
+        assert (summary["added"], summary["removed"]) == (1, 0), summary
+        assert store.contents("upload:notes.md") == ["uploaded notes"]
+        assert sorted(retriever.manifest.sources()) == sorted(["upload:notes.md", str(tmp / "docs" / "a.txt")])
+
+        # 파일을 지우고 다시 동기화하면 동기화한 파일만 삭제
+        (tmp / "docs" / "a.txt").unlink()
+        summary = asyncio.run(retriever.sync_directory(str(tmp / "docs")))
+        assert summary["removed"] == 1, summary
+        assert retriever.manifest.sources() == ["upload:notes.md"]
+
+    print("   ✅ 동기화와 업로드 확인")
+    return True
+
+
+# ========== Test 3: 파싱 실패 / PDF 메타데이터 ==========
+def test_parse_failure():
+    """깨진 파일은 오류로 보고하고 나머지는 색인하는지 확인"""
+    print("\n📋 Test 3: 파싱 실패")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "corrupt.pdf").write_bytes(b"not a pdf")
+        write_pdf(tmp / "manual.pdf", [f"manual page {page}" for page in range(1, 6)])
+        (tmp / "notes.txt").write_text("plain notes", encoding="utf-8")
+
+        store = StubVectorStore()
+        summary = run_pipeline(make_pipeline(tmp, store), [tmp / "corrupt.pdf", tmp / "manual.pdf", tmp / "notes.txt"])
+        assert summary["added"] == 2 and summary["reports"] == 3, summary
+        assert len(summary["errors"]) == 1 and "corrupt.pdf" in summary["errors"][0], summary
+        assert str(tmp / "corrupt.pdf") not in SourceManifest(tmp / "manifest.json").sources()
+
+        # 프로세스 풀은 실행마다 새로 만들지 않고 재사용
+        pool = ingestion._parse_pool
+        assert pool is not None
+        run_pipeline(make_pipeline(tmp, StubVectorStore()), [tmp / "manual.pdf"])
+        assert ingestion._parse_pool is pool
+
+        # 페이지 단위로 저장된 PDF 청크도 total_chunks를 가짐
+        manual = [metadata for _, metadata in store.docs.values() if metadata["source"] == str(tmp / "manual.pdf")]
+        assert len(manual) == 5
+        assert sorted(metadata["chunk_id"] for metadata in manual) == list(range(5))
+        assert all(metadata["total_chunks"] == 5 and "page" in metadata for metadata in manual), manual
+
+    print("   ✅ 파싱 실패 확인")
+    return True
+
+
+# ========== Test 4: 저장 실패 시 고아 청크 정리 ==========
+def test_store_failure():
+    """저장이 중간에 실패하면 이번 실행이 넣은 청크만 지우고 이전 버전은 남기는지 확인"""
+    print("\n📋 Test 4: 저장 실패")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf = tmp / "manual.pdf"
+        write_pdf(pdf, [f"page {page} original" for page in range(1, 7)])
+        store = StubVectorStore()
+        assert run_pipeline(make_pipeline(tmp, store), [pdf])["added"] == 1
+        before = {doc_id: content for doc_id, (content, _) in store.docs.items()}
+        entry = SourceManifest(tmp / "manifest.json").get(str(pdf))
+
+        # 앞 페이지는 그대로, 뒤 페이지는 수정; 마지막 청크 저장이 실패
+        write_pdf(pdf, [f"page {page} original" for page in range(1, 4)] + ["page 4 revised", "page 5 revised", "page 6 boom"])
+        store.fail_on = "boom"
+        summary = run_pipeline(make_pipeline(tmp, store), [pdf])
+        assert len(summary["errors"]) == 1 and summary["reports"] == 1, summary
+        assert summary["chunks_added"] > 0, "실패 전에 일부 청크가 저장되어 있어야 함"
+
+        after = {doc_id: content for doc_id, (content, _) in store.docs.items()}
+        assert after == before, "새로 넣은 청크는 지우고 이전 버전 청크는 유지"
+        assert SourceManifest(tmp / "manifest.json").get(str(pdf)) == entry
+
+        # 저장소가 돌아오면 다시 실행해 수정본으로 교체
+        store.fail_on = None
+        assert run_pipeline(make_pipeline(tmp, store), [pdf])["updated"] == 1
+        assert "page 6 boom" in store.contents(str(pdf)) and "page 4 original" not in store.contents(str(pdf))
+
+    print("   ✅ 저장 실패 확인")
+    return True
+
+
+# ========== Test 5: 청킹 중간 실패 ==========
+def test_chunk_failure():
+    """청킹이 중간에 실패한 파일은 한 번만 보고하고 남은 조각은 버리는지 확인"""
+    print("\n📋 Test 5: 청킹 중간 실패")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pages = [f"page {page} text here" for page in range(1, 10)]
+        pages[4] = "page 5 boom here"
+        write_pdf(tmp / "broken.pdf", pages)
+        (tmp / "notes.txt").write_text("plain notes", encoding="utf-8")
+
+        store = StubVectorStore()
+        pipeline = make_pipeline(tmp, store)
+        pipeline.doc_processor.text_splitter = ExplodingSplitter(chunk_size=25, chunk_overlap=0)
+        summary = run_pipeline(pipeline, [tmp / "broken.pdf", tmp / "notes.txt"])
+
+        assert summary["added"] == 1 and summary["reports"] == 2, summary
+        assert len(summary["errors"]) == 1 and "cannot split" in summary["errors"][0], summary
+        assert summary["chunks_added"] > 1, "실패 전 페이지의 청크가 저장되어 있어야 함"
+        assert store.contents(str(tmp / "broken.pdf")) == [], "저장된 앞 페이지 청크도 삭제"
+        assert store.contents(str(tmp / "notes.txt")) == ["plain notes"]
+        assert SourceManifest(tmp / "manifest.json").sources() == [str(tmp / "notes.txt")]
+
+    print("   ✅ 청킹 중간 실패 확인")
+    return True
+
+
+# ========== Test 6: 요청 취소 ==========
+def test_abort():
+    """취소하면 중단되고, 다시 실행하면 남은 파일부터 이어서 색인하는지 확인"""
+    print("\n📋 Test 6: 요청 취소")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = []
+        for i in range(6):
+            path = tmp / f"file{i}.txt"
+            path.write_text(f"file {i} text", encoding="utf-8")
+            paths.append(path)
+
+        store = StubVectorStore()
+        context = RequestContext()
+        pipeline = make_pipeline(tmp, store)
+
+        def cancel_after_first(progress):
+            context.cancel("stopped by user")
+
+        try:
+            asyncio.run(pipeline.run([str(path) for path in paths], progress=cancel_after_first, request_context=context))
+            raise AssertionError("취소되면 RequestCancelled가 나야 함")
+        except RequestCancelled:
+            pass
+
+        manifest = SourceManifest(tmp / "manifest.json")
+        indexed = manifest.sources()
+        assert len(indexed) < len(paths), indexed
+        for source in indexed:
+            assert set(manifest.get(source)["chunk_ids"]) <= set(store.docs), "기록된 파일은 청크가 모두 저장됨"
+
+        summary = run_pipeline(make_pipeline(tmp, store), paths)
+        assert summary["unchanged"] == len(indexed) and summary["added"] == len(paths) - len(indexed), summary
+        assert len(store.docs) == len(paths)
+
+    print(f"   취소 전 색인 {len(indexed)}개")
+    print("   ✅ 요청 취소 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "reupload": test_reupload(),
+        "sync_directory": test_sync_directory(),
+        "sync_keeps_uploads": test_sync_keeps_uploads(),
+        "parse_failure": test_parse_failure(),
+        "store_failure": test_store_failure(),
+        "chunk_failure": test_chunk_failure(),
+        "abort": test_abort(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,674 @@
+"""LLMManager 기능 테스트
+
+실제 API 호출 없이 가짜 LLM 프로바이더로 LLMManager의 동작을 검증합니다.
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm import BaseLLM, LLMManager, LLMResponse, Message, MockLLM
+from llm.cache import ResponseCache
+from llm.scheduler import ProviderScheduler
+
+
+class FakeLLM(BaseLLM):
+    """호출 횟수를 기록하는 가짜 LLM"""
+
+    def __init__(self, model: str = "fake-model", reply: str = "응답", delay: float = 0.0):
+        super().__init__(api_key="test", model=model)
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+
+    async def generate(self, messages, temperature=0.7, max_tokens=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return LLMResponse(content=f"{self.reply} #{self.calls}", model=self.model)
+
+    async def stream_generate(self, messages, temperature=0.7, max_tokens=None, **kwargs):
+        self.calls += 1
+        for token in self.reply.split():
+            await asyncio.sleep(self.delay)
+            yield token + " "
+
+
+class FailingLLM(FakeLLM):
+    """항상 일시적 에러(529 Overloaded)를 내는 가짜 LLM"""
+
+    class OverloadedError(Exception):
+        status_code = 529
+
+    async def generate(self, messages, temperature=0.7, max_tokens=None, **kwargs):
+        self.calls += 1
+        raise self.OverloadedError("overloaded")
+
+    async def stream_generate(self, messages, temperature=0.7, max_tokens=None, **kwargs):
+        self.calls += 1
+        raise self.OverloadedError("overloaded")
+        yield ""
+
+
+def make_manager(tmp_dir: str, **cache_options) -> LLMManager:
+    """캐시 경로를 임시 디렉토리로 바꾼 LLMManager 생성"""
+    manager = LLMManager()
+    manager.current_provider = "claude"
+    manager.response_cache = ResponseCache(Path(tmp_dir) / "cache.sqlite3", **cache_options)
+    return manager
+
+
+# ========== Test 1: 응답 캐시 ==========
+def test_response_cache():
+    """temperature 0 요청은 캐시되고, 0보다 크면 우회되는지 확인"""
+    print("\n📋 Test 1: 응답 캐시 (hit / miss / bypass)")
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = make_manager(tmp)
+            fake = FakeLLM()
+            manager._llm_cache["claude"] = fake
+            messages = [Message(role="user", content="안녕하세요")]
+
+            first = await manager.generate(messages, temperature=0)
+            second = await manager.generate(
+                [Message(role="user", content="안녕하세요  \r\n")], temperature=0
+            )
+            assert fake.calls == 1, "정규화된 동일 요청은 캐시에서 응답해야 합니다"
+            assert second.content == first.content
+            assert second.metadata.get("cached") is True
+
+            await manager.generate(messages, temperature=0.7)
+            await manager.generate(messages, temperature=0.7)
+            assert fake.calls == 3, "temperature > 0 요청은 기본적으로 캐시를 우회합니다"
+
+            await manager.generate(messages, temperature=0.7, use_cache=True)
+            await manager.generate(messages, temperature=0.7, use_cache=True)
+            assert fake.calls == 4, "use_cache=True면 temperature > 0도 캐시합니다"
+
+            stats = manager.get_provider_info()["cache"]
+            print(f"   캐시 통계: {stats}")
+            assert stats["hits"] == 2
+            assert stats["bypassed"] == 2
+
+    asyncio.run(run())
+    print("   ✅ 응답 캐시 동작 확인")
+    return True
+
+
+def test_cache_eviction():
+    """LRU 제거와 TTL 만료 확인"""
+    print("\n📋 Test 2: 캐시 LRU / TTL")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp) / "cache.sqlite3", max_entries=2, ttl_seconds=3600)
+        for key in ("a", "b"):
+            cache.set(key, LLMResponse(content=key, model="m"))
+        assert cache.get("a") is not None  # a를 최근 사용으로 갱신
+        cache.set("c", LLMResponse(content="c", model="m"))
+
+        assert cache.get("b") is None, "가장 오래 사용되지 않은 항목이 제거되어야 합니다"
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+        cache.ttl_seconds = 1
+        cache.set("d", LLMResponse(content="d", model="m"))
+        time.sleep(1.1)
+        assert cache.get("d") is None, "TTL이 지난 항목은 만료되어야 합니다"
+
+    print("   ✅ LRU / TTL 동작 확인")
+    return True
+
+
+# ========== Test 3: 페일오버 / 헤징 ==========
+def test_failover_and_hedging():
+    """1순위 프로바이더 실패 시 다음 프로바이더로 넘어가고, 느리면 헤징하는지 확인"""
+    print("\n📋 Test 3: 페일오버 / 헤징")
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = make_manager(tmp)
+            manager.routing_policy.fallback_chain = ["claude", "openai"]
+            manager._llm_cache["claude"] = FailingLLM()
+            manager._llm_cache["openai"] = FakeLLM(reply="fallback")
+            messages = [Message(role="user", content="hi")]
+
+            response = await manager.generate(messages)
+            assert response.metadata["provider"] == "openai"
+
+            chunks = [c async for c in manager.stream_generate(messages)]
+            assert "".join(chunks).strip() == "fallback"
+
+            # 헤징: claude가 느리면 openai를 추가로 시작하고 먼저 끝난 쪽을 사용
+            slow = FakeLLM(reply="slow", delay=1.0)
+            manager._llm_cache["claude"] = slow
+            manager.routing_policy.hedging = True
+            manager.routing_policy.hedge_delay = 0.05
+            manager.routing_policy.hedge_ttft_delay = 0.05
+
+            started = time.monotonic()
+            response = await manager.generate(messages)
+            assert response.metadata["provider"] == "openai"
+            assert time.monotonic() - started < 0.5, "느린 요청은 취소되어야 합니다"
+
+            chunks = [c async for c in manager.stream_generate(messages)]
+            assert "".join(chunks).strip() == "fallback"
+
+    asyncio.run(run())
+    print("   ✅ 페일오버 / 헤징 동작 확인")
+    return True
+
+
+# ========== Test 4: 레이트 스케줄러 ==========
+def test_rate_scheduler():
+    """동시성 제한, 우선순위(interactive 우선), 사용량 기반 토큰 정산 확인"""
+    print("\n📋 Test 4: 레이트 스케줄러")
+
+    async def run():
+        scheduler = ProviderScheduler("claude", rpm=600, tpm=10000, max_concurrency=1)
+        order = []
+
+        first = await scheduler.acquire(1000, "background")
+
+        async def job(name, priority):
+            reservation = await scheduler.acquire(100, priority)
+            order.append(name)
+            scheduler.release(reservation, actual_tokens=100)
+
+        background = asyncio.create_task(job("background", "background"))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(job("interactive", "interactive"))
+        await asyncio.sleep(0.05)
+        assert order == [], "동시성 한도에 도달하면 대기해야 합니다"
+
+        level_before = scheduler.tokens.level
+        scheduler.release(first, actual_tokens=200)
+        assert scheduler.tokens.level > level_before, "추정치보다 적게 쓰면 예산을 돌려받아야 합니다"
+
+        await asyncio.gather(background, interactive)
+        assert order == ["interactive", "background"], f"interactive가 먼저여야 합니다: {order}"
+        print(f"   스케줄러 상태: {scheduler.stats()}")
+
+    asyncio.run(run())
+    print("   ✅ 레이트 스케줄러 동작 확인")
+    return True
+
+
+# ========== Test 5: generate_many ==========
+def test_generate_many():
+    """순서 보존, 항목별 에러, 전체 deadline 확인"""
+    print("\n📋 Test 5: generate_many")
+
+    class BatchLLM(FakeLLM):
+        supports_batch = True
+        batch_cancelled = False
+
+        async def generate_batch(self, batch, temperature=0.7, max_tokens=None, **kwargs):
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.batch_cancelled = True
+                raise
+            return [LLMResponse(content=f"batch {i}", model=self.model) for i in range(len(batch))]
+
+    class EchoLLM(FakeLLM):
+        async def generate(self, messages, temperature=0.7, max_tokens=None, **kwargs):
+            text = messages[-1].content
+            if text == "fail":
+                raise ValueError("bad request")
+            await asyncio.sleep(float(text))
+            return LLMResponse(content=text, model=self.model)
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = make_manager(tmp)
+            manager._llm_cache["claude"] = EchoLLM()
+            batch = [[Message(role="user", content=c)] for c in ("0.03", "0.01", "fail", "5")]
+
+            started = time.monotonic()
+            results = await manager.generate_many(batch, concurrency=4, timeout=0.3)
+            assert time.monotonic() - started < 1.0
+
+            assert [r.content for r in results[:2]] == ["0.03", "0.01"], "입력 순서를 유지해야 합니다"
+            assert isinstance(results[2], ValueError)
+            assert isinstance(results[3], asyncio.TimeoutError)
+
+            # 배치 API: 시간 초과 시 원격 배치를 취소하고 항목별 TimeoutError
+            batch_llm = BatchLLM(delay=5)
+            manager._llm_cache["claude"] = batch_llm
+            results = await manager.generate_many(batch, timeout=0.1, use_batch_api=True)
+            assert [type(r) for r in results] == [asyncio.TimeoutError] * len(batch)
+            assert batch_llm.batch_cancelled, "남은 배치 작업은 취소되어야 합니다"
+
+            manager._llm_cache["claude"] = BatchLLM()
+            results = await manager.generate_many(batch, timeout=1, use_batch_api=True)
+            assert [r.content for r in results] == ["batch 0", "batch 1", "batch 2", "batch 3"]
+
+    asyncio.run(run())
+    print("   ✅ generate_many 동작 확인")
+    return True
+
+
+# ========== Test 6: 프롬프트 캐싱 ==========
+def test_prompt_cache_breakpoints():
+    """cache=True 메시지에 cache_control이 붙고, 최대 4개까지만 유지되는지 확인"""
+    print("\n📋 Test 6: 프롬프트 캐싱 breakpoint")
+
+    from llm.claude import ClaudeLLM
+
+    llm = ClaudeLLM(api_key="test")
+    messages = [
+        Message(role="system", content="system prompt", cache=True),
+        Message(role="system", content="project context", cache=True),
+    ] + [
+        Message(role="user" if i % 2 == 0 else "assistant", content=f"turn {i}", cache=True)
+        for i in range(4)
+    ] + [Message(role="user", content="question")]
+
+    system_blocks, chat_messages = llm._split_messages(messages)
+
+    assert [block["text"] for block in system_blocks] == ["system prompt", "project context"]
+    breakpoints = sum("cache_control" in block for block in system_blocks) + sum(
+        isinstance(msg["content"], list) for msg in chat_messages
+    )
+    assert breakpoints == 4, "breakpoint는 최대 4개"
+    assert isinstance(chat_messages[-2]["content"], list), "마지막 히스토리에 breakpoint"
+    assert chat_messages[-1] == {"role": "user", "content": "question"}
+
+    print("   ✅ 프롬프트 캐싱 breakpoint 확인")
+    return True
+
+
+# ========== Test 7: Mock 프로바이더 ==========
+def test_mock_provider():
+    """MockLLM의 지연/스트리밍/에러 주입과 ErrorFixer 형식 응답 확인"""
+    print("\n📋 Test 7: Mock 프로바이더")
+
+    from agents.error_fixer import AutoErrorFixer
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = make_manager(tmp)
+            manager.switch_provider("mock")
+            manager._llm_cache["mock"] = MockLLM(ttft=0.05, tokens_per_second=200)
+
+            code = "x = undefined_variable"
+            fixer = AutoErrorFixer(manager, None)
+            try:
+                exec(code, {})
+            except NameError as e:
+                error_info = await fixer.analyze_error(e, code)
+            fix = await fixer.generate_fix(error_info, code)
+            assert fix["fixed_code"] == code, "ErrorFixer가 코드 블록을 파싱해야 합니다"
+
+            started = time.monotonic()
+            first_chunk_at = None
+            chunks = []
+            async for chunk in manager.stream_generate([Message(role="user", content="hi")]):
+                first_chunk_at = first_chunk_at or time.monotonic() - started
+                chunks.append(chunk)
+            assert 0.04 < first_chunk_at < 0.5, f"TTFT {first_chunk_at:.3f}s"
+            assert len(chunks) > 10
+
+            scripted = MockLLM(ttft=0, responses=["a", "b"], error_rate=0.5, seed=1)
+            outcomes = []
+            for _ in range(6):
+                try:
+                    outcomes.append((await scripted.generate([])).content)
+                except Exception as e:
+                    outcomes.append(getattr(e, "status_code", None))
+            rerun = MockLLM(ttft=0, responses=["a", "b"], error_rate=0.5, seed=1)
+            replay = []
+            for _ in range(6):
+                try:
+                    replay.append((await rerun.generate([])).content)
+                except Exception as e:
+                    replay.append(getattr(e, "status_code", None))
+            print(f"   outcomes: {outcomes}")
+            assert outcomes == replay, "시드가 같으면 결과도 같아야 합니다"
+            assert 529 in outcomes and ("a" in outcomes or "b" in outcomes)
+
+            # 주입된 에러가 실제(유료) 프로바이더로 페일오버되면 안 됨
+            manager.routing_policy.fallback_chain = ["claude", "openai"]
+            real = FakeLLM(reply="real")
+            manager._llm_cache["claude"] = manager._llm_cache["openai"] = real
+            manager._llm_cache["mock"] = MockLLM(ttft=0, error_rate=1.0)
+            assert manager._candidates("mock") == ["mock"]
+            try:
+                await manager.generate([Message(role="user", content="hi")])
+                assert False, "Mock 에러가 그대로 전달되어야 합니다"
+            except AssertionError:
+                raise
+            except Exception as e:
+                assert getattr(e, "status_code", None) == 529
+            assert real.calls == 0
+
+    asyncio.run(run())
+    print("   ✅ Mock 프로바이더 동작 확인")
+    return True
+
+
+# ========== Test 8: 요청 병합 (single-flight) ==========
+def test_request_coalescing():
+    """동일한 동시 요청이 한 번의 호출을 공유하고, 스트림은 모두에게 전달되는지 확인"""
+    print("\n📋 Test 8: 동일 요청 병합")
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            fake = FakeLLM(reply="shared analysis result", delay=0.05)
+            managers = [make_manager(tmp), make_manager(tmp)]
+            for manager in managers:
+                manager._llm_cache["claude"] = fake
+            messages = [Message(role="user", content="Analyze this project")]
+
+            responses = await asyncio.gather(*(
+                managers[i % 2].generate(messages, use_cache=False) for i in range(5)
+            ))
+            assert fake.calls == 1, f"호출은 1번이어야 합니다 (실제 {fake.calls})"
+            assert len({r.content for r in responses}) == 1
+            assert sum(bool(r.metadata.get("coalesced")) for r in responses) == 4
+
+            async def collect(manager, stop_after=None):
+                chunks = []
+                async for chunk in manager.stream_generate(messages):
+                    chunks.append(chunk)
+                    if stop_after and len(chunks) >= stop_after:
+                        break
+                return "".join(chunks)
+
+            fake.calls = 0
+            texts = await asyncio.gather(
+                collect(managers[0]), collect(managers[1]), collect(managers[0], stop_after=1)
+            )
+            assert fake.calls == 1, f"스트림도 1번만 호출되어야 합니다 (실제 {fake.calls})"
+            assert texts[0] == texts[1] == "shared analysis result "
+            assert managers[0].coalescer.stats()["streams_in_flight"] == 0
+
+            # 모든 구독자가 떠나면 upstream 스트림도 취소됨
+            fake.calls = 0
+            assert await collect(managers[0], stop_after=1) == "shared "
+            await asyncio.sleep(0.01)
+            assert managers[0].coalescer.stats()["streams_in_flight"] == 0
+
+    asyncio.run(run())
+    print("   ✅ 동일 요청 병합 동작 확인")
+    return True
+
+
+# ========== Test 9: 녹화/재생 ==========
+def test_record_replay():
+    """녹화한 응답과 스트림 타이밍이 재생 시 그대로(또는 배율 적용해) 나오는지 확인"""
+    print("\n📋 Test 9: 녹화/재생")
+
+    from llm.recorder import Recording, RecordingLLM, ReplayLLM, ReplayMissError
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "recordings.jsonl.gz"
+            messages = [Message(role="user", content="explain the planner")]
+
+            recorder = RecordingLLM(MockLLM(ttft=0.05, tokens_per_second=100), "mock", Recording(path))
+            recorded = await recorder.generate(messages, temperature=0)
+            recorded_chunks = [chunk async for chunk in recorder.stream_generate(messages, temperature=0)]
+
+            replay = ReplayLLM("mock", "mock-model", Recording(path), time_scale=1.0)
+            started = time.monotonic()
+            replayed = await replay.generate(messages, temperature=0)
+            generate_time = time.monotonic() - started
+            assert replayed.content == recorded.content and replayed.metadata["replayed"]
+            assert generate_time >= 0.05, "녹화된 지연을 재현해야 합니다"
+
+            started = time.monotonic()
+            first_chunk_at = None
+            chunks = []
+            async for chunk in replay.stream_generate(messages, temperature=0):
+                first_chunk_at = first_chunk_at or time.monotonic() - started
+                chunks.append(chunk)
+            assert chunks == recorded_chunks
+            assert first_chunk_at >= 0.04, f"TTFT {first_chunk_at:.3f}s"
+
+            fast = ReplayLLM("mock", "mock-model", Recording(path), time_scale=0)
+            started = time.monotonic()
+            await fast.generate(messages, temperature=0)
+            assert time.monotonic() - started < 0.02
+
+            try:
+                await fast.generate([Message(role="user", content="not recorded")])
+                assert False, "녹화되지 않은 요청은 에러여야 합니다"
+            except ReplayMissError:
+                pass
+
+            # 녹화/재생 중에는 응답 캐시와 요청 병합을 쓰지 않음
+            from config import settings
+            saved = settings.llm_record_mode, settings.llm_record_path
+            settings.llm_record_mode, settings.llm_record_path = "replay", path
+            try:
+                manager = LLMManager()
+                assert manager.response_cache is None and manager.coalescer is None
+            finally:
+                settings.llm_record_mode, settings.llm_record_path = saved
+
+    asyncio.run(run())
+    print("   ✅ 녹화/재생 동작 확인")
+    return True
+
+
+# ========== Test 10: 지연/처리량 텔레메트리 ==========
+def test_telemetry():
+    """프로바이더별 TTFT, 토큰 간 지연, 토큰 수, 에러가 집계되는지 확인"""
+    print("\n📋 Test 10: 텔레메트리")
+
+    from llm.telemetry import Telemetry
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = make_manager(tmp)
+            manager.telemetry = Telemetry()
+            manager.coalescer = None
+            manager.switch_provider("mock")
+            manager._llm_cache["mock"] = MockLLM(ttft=0.05, tokens_per_second=200)
+            manager._llm_cache["claude"] = FailingLLM()
+            messages = [Message(role="user", content="hi")]
+
+            async for _ in manager.stream_generate(messages):
+                pass
+            await manager.generate(messages, use_cache=False)
+            try:
+                await manager.generate(messages, provider="claude", use_cache=False)
+            except Exception:
+                pass
+
+            stats = manager.get_stats()["mock/mock-model"]
+            print(f"   ttft: {stats['ttft']}, tokens/s: {stats['output_tokens_per_second']}")
+            assert stats["requests"] == 2 and stats["streams"] == 1
+            assert stats["ttft"]["count"] == 2 and stats["ttft"]["p50"] >= 0.04
+            assert stats["inter_token"]["count"] > 10 and stats["inter_token"]["p50"] < 0.05
+            assert stats["tokens_in"] > 0 and stats["tokens_out"] > 0
+            assert manager.get_stats("claude")["claude/fake-model"]["errors"] == {"OverloadedError": 1}
+
+            text = manager.get_metrics_text()
+            assert 'llm_ttft_seconds_count{provider="mock",model="mock-model"} 2' in text
+            assert 'llm_errors_total{provider="claude",model="fake-model",error="OverloadedError"} 1' in text
+
+    asyncio.run(run())
+    print("   ✅ 텔레메트리 집계 확인")
+    return True
+
+
+# ========== Test 11: 모델 티어 라우팅 ==========
+def test_model_routing():
+    """작업 태그/프롬프트 크기/관측 지연에 따라 모델 티어가 선택되는지 확인"""
+    print("\n📋 Test 11: 모델 티어 라우팅")
+
+    from llm.model_router import ModelRouter
+    from llm.telemetry import Telemetry
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = make_manager(tmp)
+            manager.telemetry = Telemetry()
+            manager.model_router = ModelRouter(
+                tiers={"fast": ["groq", "deepinfra"], "strong": ["openai"]},
+                task_tiers={"commit_message": "fast", "analysis": "strong"},
+                fast_max_prompt_tokens=100,
+                min_samples=2,
+            )
+            manager._llm_cache["claude"] = FakeLLM(model="standard-model", reply="standard")
+            manager._llm_cache["groq"] = FakeLLM(model="groq-model", reply="groq", delay=0.05)
+            manager._llm_cache["deepinfra"] = FakeLLM(model="deepinfra-model", reply="deepinfra")
+            manager._llm_cache["openai"] = FakeLLM(model="strong-model", reply="strong")
+            short = [Message(role="user", content="write a commit message")]
+
+            async def served(messages, **kwargs):
+                response = await manager.generate(messages, use_cache=False, **kwargs)
+                return response.metadata["provider"], response.metadata["tier"]
+
+            assert await served(short) == ("claude", "standard"), "태그 없으면 현재 프로바이더"
+            assert await served(short, task="analysis") == ("openai", "strong")
+            long_prompt = [Message(role="user", content="diff line\n" * 200)]
+            assert await served(long_prompt, task="commit_message") == ("claude", "standard"), \
+                "큰 프롬프트는 fast 티어에서 승격되어야 합니다"
+            assert await served(short, task="commit_message", provider="openai") == ("openai", "standard")
+
+            # 측정 전에는 설정 순서, 측정 후에는 TTFT 중앙값이 낮은 모델
+            first = [await served(short, task="commit_message") for _ in range(2)]
+            assert first == [("groq", "fast")] * 2
+            routed = [await served(short, task="commit_message") for _ in range(3)]
+            print(f"   routed: {routed}")
+            assert routed == [("deepinfra", "fast")] * 3, "관측 지연이 낮은 모델을 골라야 합니다"
+
+    asyncio.run(run())
+    print("   ✅ 모델 티어 라우팅 확인")
+    return True
+
+
+# ========== Test 12: 재시도 / 서킷 브레이커 ==========
+def test_retry_and_circuit_breaker():
+    """일시적 에러 재시도(지터, Retry-After)와 서킷 브레이커 기반 라우팅 확인"""
+    print("\n📋 Test 12: 재시도 / 서킷 브레이커")
+
+    import random
+    from llm import resilience
+    from llm.resilience import CircuitBreaker, CircuitOpenError, ResilientLLM, RetryPolicy
+
+    class RateLimited(Exception):
+        status_code = 429
+
+        def __init__(self, retry_after: str):
+            super().__init__("rate limited")
+            self.response = type("Response", (), {"headers": {"retry-after": retry_after}})()
+
+    class BadRequest(Exception):
+        status_code = 400
+
+    class FlakyLLM(FakeLLM):
+        """처음 n번은 529 에러를 내는 가짜 LLM"""
+
+        def __init__(self, failures: int):
+            super().__init__()
+            self.failures = failures
+
+        async def generate(self, messages, temperature=0.7, max_tokens=None, **kwargs):
+            if self.calls < self.failures:
+                self.calls += 1
+                raise FailingLLM.OverloadedError("overloaded")
+            return await super().generate(messages, temperature, max_tokens, **kwargs)
+
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=5.0, rng=random.Random(0))
+    delays = [policy.delay(1, FailingLLM.OverloadedError()) for _ in range(50)]
+    assert all(0 <= d <= 2.0 for d in delays) and len(set(delays)) > 1, "full jitter 범위"
+    assert policy.delay(1, RateLimited("3")) >= 3, "Retry-After를 지켜야 합니다"
+    assert policy.delay(1, RateLimited("60")) is None, "너무 긴 Retry-After는 페일오버"
+    assert policy.delay(1, BadRequest()) is None, "치명적 에러는 재시도하지 않음"
+    assert policy.delay(3, FailingLLM.OverloadedError()) is None, "최대 시도 횟수"
+
+    async def run():
+        fast = RetryPolicy(max_attempts=3, base_delay=0.01)
+        flaky = FlakyLLM(failures=2)
+        response = await ResilientLLM(flaky, CircuitBreaker("flaky"), fast).generate([])
+        assert response.metadata["attempts"] == 3
+
+        # 재시도마다 레이트 슬롯을 새로 받고, 백오프 중에는 슬롯을 잡고 있지 않음
+        from llm.scheduler import RateScheduler
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = make_manager(tmp)
+            manager.scheduler = RateScheduler(max_concurrency=1)
+            manager.routing_policy.failover = False
+            manager._llm_cache["claude"] = ResilientLLM(FlakyLLM(failures=2), CircuitBreaker("slots"), fast)
+            response = await manager.generate([Message(role="user", content="hi")], use_cache=False)
+            assert response.metadata["attempts"] == 3
+            slots = manager.scheduler.for_provider("claude").stats()
+            assert slots["admitted"] == 3 and slots["active"] == 0, slots
+
+        breaker = CircuitBreaker("claude", failure_threshold=2, recovery_timeout=0.2)
+        resilience._breakers["claude"] = breaker
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                manager = make_manager(tmp)
+                failing = FlakyLLM(failures=2)
+                fallback = FakeLLM(reply="fallback")
+                manager._llm_cache["claude"] = ResilientLLM(failing, breaker, fast)
+                manager._llm_cache["openai"] = fallback
+                messages = [Message(role="user", content="hi")]
+
+                response = await manager.generate(messages, use_cache=False)
+                assert response.metadata["provider"] == "openai"
+                assert breaker.state == "open" and failing.calls == 2
+
+                # 브레이커가 열리면 트래픽을 보내지 않고 정상 프로바이더를 먼저 시도
+                assert manager._candidates("claude")[0] == "openai"
+                await manager.generate(messages, use_cache=False)
+                assert failing.calls == 2, "열린 브레이커로는 호출하지 않아야 합니다"
+                try:
+                    await manager._llm_cache["claude"].generate(messages)
+                    assert False
+                except CircuitOpenError:
+                    pass
+
+                # 복구 시간이 지나면 한 번의 시험 호출 허용
+                await asyncio.sleep(0.25)
+                assert breaker.state == "half_open" and manager._is_available("claude")
+                assert (await manager.generate(messages, use_cache=False)).metadata["provider"] == "claude"
+                assert breaker.state == "closed"
+                print(f"   breaker: {breaker.stats()}")
+        finally:
+            resilience._breakers.pop("claude", None)
+
+    asyncio.run(run())
+    print("   ✅ 재시도 / 서킷 브레이커 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "response_cache": test_response_cache(),
+        "cache_eviction": test_cache_eviction(),
+        "failover_and_hedging": test_failover_and_hedging(),
+        "rate_scheduler": test_rate_scheduler(),
+        "generate_many": test_generate_many(),
+        "prompt_cache_breakpoints": test_prompt_cache_breakpoints(),
+        "mock_provider": test_mock_provider(),
+        "request_coalescing": test_request_coalescing(),
+        "record_replay": test_record_replay(),
+        "telemetry": test_telemetry(),
+        "model_routing": test_model_routing(),
+        "retry_and_circuit_breaker": test_retry_and_circuit_breaker(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
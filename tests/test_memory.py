@@ -0,0 +1,122 @@
+"""대화 메모리 테스트
+
+최근 N턴 유지, 오래된 대화의 백그라운드 요약, SessionManager 저장/복원을 검증합니다.
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.memory import ConversationMemory
+from llm import LLMManager, MockLLM
+from utils.session_manager import SessionManager
+
+
+def make_memory(**kwargs) -> ConversationMemory:
+    """요약에 MockLLM을 쓰는 메모리 생성"""
+    manager = LLMManager()
+    manager.response_cache = None
+    manager.current_provider = "mock"
+    manager._llm_cache["mock"] = MockLLM(ttft=0.01, tokens_per_second=0, template="요약 #{n}")
+    return ConversationMemory(manager, **kwargs)
+
+
+# ========== Test 1: 롤링 요약 ==========
+def test_rolling_summary():
+    """대화가 길어져도 프롬프트 크기가 일정하게 유지되는지 확인"""
+    print("\n📋 Test 1: 롤링 요약")
+
+    async def run():
+        memory = make_memory(max_recent_turns=3, summary_max_tokens=200)
+        sizes = []
+        for i in range(20):
+            memory.add_turn(f"질문 {i} " + "word " * 50, f"답변 {i} " + "code " * 80)
+            await memory.wait_idle()
+            sizes.append(memory.token_count())
+
+        messages = memory.get_messages()
+        print(f"   메시지 수: {len(messages)}, 토큰 추이: {sizes[2]} → {sizes[-1]}")
+        assert len(messages) == 3 * 2 + 1, "요약 1개 + 최근 3턴"
+        assert messages[0].role == "system" and "요약" in messages[0].content
+        assert messages[-1].content.startswith("답변 19")
+        assert sizes[-1] <= sizes[5] * 1.2, "프롬프트 크기는 거의 일정해야 합니다"
+
+    asyncio.run(run())
+    print("   ✅ 롤링 요약 동작 확인")
+    return True
+
+
+# ========== Test 2: 요약 실패 시 fallback ==========
+def test_summary_fallback():
+    """LLM 요약이 실패해도 토큰 예산 안에서 최신 내용을 유지하는지 확인"""
+    print("\n📋 Test 2: 요약 실패 fallback")
+
+    async def run():
+        memory = make_memory(max_recent_turns=1, summary_max_tokens=50)
+        memory.llm_manager._llm_cache["mock"] = MockLLM(ttft=0, error_rate=1.0)
+        memory.llm_manager.routing_policy.failover = False
+        for i in range(5):
+            memory.add_turn(f"question {i}", f"answer {i} " + "x " * 20)
+        await memory.wait_idle()
+
+        assert memory.summary and "answer 3" in memory.summary
+        assert memory.token_count() < 150
+
+    asyncio.run(run())
+    print("   ✅ fallback 동작 확인")
+    return True
+
+
+# ========== Test 3: 세션 저장/복원 ==========
+def test_session_persistence():
+    """요약과 최근 대화가 SessionManager로 저장/복원되는지 확인"""
+    print("\n📋 Test 3: 세션 저장/복원")
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            session_manager = SessionManager(cache_dir=str(Path(tmp) / "cache"))
+            memory = make_memory(max_recent_turns=2)
+            for i in range(4):
+                memory.add_turn(f"q{i}", f"a{i}")
+            await memory.wait_idle()
+
+            await session_manager.save_session(
+                tmp, history=memory.to_history(), summary=memory.summary
+            )
+            session = await session_manager.load_session(tmp)
+
+            restored = make_memory(max_recent_turns=2)
+            restored.restore(session["history"], session["summary"])
+            assert [m.content for m in restored.get_messages()] == [
+                m.content for m in memory.get_messages()
+            ]
+
+    asyncio.run(run())
+    print("   ✅ 세션 저장/복원 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "rolling_summary": test_rolling_summary(),
+        "summary_fallback": test_summary_fallback(),
+        "session_persistence": test_session_persistence(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,77 @@
+"""임베딩 모델 레지스트리 테스트
+
+모델이 프로세스당 한 번만, 처음 사용할 때 로드되고
+여러 스레드가 같은 인스턴스를 공유하는지 검증합니다.
+(sentence-transformers 없이 rag/models.py만 로드)
+"""
+
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(ROOT))
+
+spec = importlib.util.spec_from_file_location("models", ROOT / "rag" / "models.py")
+models = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(models)
+
+
+# ========== Test 1: 한 번만 로드 ==========
+def test_load_once():
+    """동시에 요청해도 로더가 한 번만 호출되고 같은 모델을 공유하는지 확인"""
+    print("\n📋 Test 1: 한 번만 로드")
+
+    registry = models.ModelRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    assert not registry.is_loaded("embedding:test"), "생성 시점에는 로드하지 않아야 합니다"
+
+    loaded = []
+    threads = [
+        threading.Thread(target=lambda: loaded.append(registry.get("embedding:test", loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1, f"로더 호출 {len(calls)}회"
+    assert len({id(model) for model in loaded}) == 1, "모든 스레드가 같은 인스턴스를 받아야 합니다"
+
+    stats = registry.stats()["embedding:test"]
+    print(f"   {stats}")
+    assert stats["load_seconds"] >= 0.1
+
+    print("   ✅ 한 번만 로드 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "load_once": test_load_once(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,156 @@
+"""요청 컨텍스트(데드라인/취소) 테스트
+
+사용자가 요청을 중단하거나 제한 시간을 넘기면 파일 검색, LLM 스트림,
+서브프로세스가 즉시 중단되고 자원이 해제되는지 검증합니다.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm import LLMManager, Message, MockLLM
+from llm.telemetry import Telemetry
+from tools.executor import CodeExecutor
+from tools.file_analyzer import FileAnalyzer
+from utils.request_context import DeadlineExceeded, RequestCancelled, RequestContext
+
+
+def make_manager() -> LLMManager:
+    """느린 MockLLM을 쓰는 LLMManager 생성"""
+    manager = LLMManager()
+    manager.response_cache = None
+    manager.coalescer = None
+    manager.telemetry = Telemetry()
+    manager.current_provider = "mock"
+    manager._llm_cache["mock"] = MockLLM(ttft=0.05, tokens_per_second=20)
+    return manager
+
+
+# ========== Test 1: 스트림 취소 ==========
+def test_stream_cancel():
+    """다른 스레드에서 취소하면 스트림이 즉시 닫히고 슬롯이 반환되는지 확인"""
+    print("\n📋 Test 1: 스트림 취소")
+
+    async def run():
+        manager = make_manager()
+        request_context = RequestContext()
+        chunks = []
+
+        # UI 콜백처럼 다른 스레드에서 취소
+        threading.Timer(0.3, request_context.cancel).start()
+        started = time.monotonic()
+        try:
+            async for chunk in manager.stream_generate(
+                [Message(role="user", content="hi")], request_context=request_context
+            ):
+                chunks.append(chunk)
+            assert False, "취소되어야 합니다"
+        except RequestCancelled:
+            pass
+
+        elapsed = time.monotonic() - started
+        print(f"   취소까지 {elapsed:.2f}s, 받은 청크 {len(chunks)}개")
+        assert elapsed < 0.5 and chunks, "취소 직후 중단되어야 합니다"
+        assert manager.scheduler.for_provider("mock").stats()["active"] == 0, "슬롯이 반환되어야 합니다"
+        assert manager.get_stats()["mock/mock-model"]["cancelled"] == 1
+
+    asyncio.run(run())
+    print("   ✅ 스트림 취소 확인")
+    return True
+
+
+# ========== Test 2: 데드라인 ==========
+def test_deadline():
+    """데드라인이 지나면 generate와 파일 검색이 중단되는지 확인"""
+    print("\n📋 Test 2: 데드라인")
+
+    async def run():
+        manager = make_manager()
+        request_context = RequestContext(timeout=0.2)
+        started = time.monotonic()
+        try:
+            await manager.generate(
+                [Message(role="user", content="long answer")], request_context=request_context
+            )
+            assert False, "데드라인 초과여야 합니다"
+        except DeadlineExceeded:
+            pass
+        assert time.monotonic() - started < 0.4
+
+        # 이미 만료된 컨텍스트로는 새 단계가 시작되지 않음
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "a.py").write_text("needle = 1\n")
+            analyzer = FileAnalyzer(tmp)
+            assert await analyzer.search_in_files("needle") != []
+            try:
+                await analyzer.search_in_files("needle", request_context=request_context)
+                assert False, "파일 검색도 중단되어야 합니다"
+            except DeadlineExceeded:
+                pass
+
+    asyncio.run(run())
+    print("   ✅ 데드라인 확인")
+    return True
+
+
+# ========== Test 3: 서브프로세스 정리 ==========
+def test_subprocess_cleanup():
+    """취소된 요청의 실행 중인 서브프로세스가 종료되는지 확인"""
+    print("\n📋 Test 3: 서브프로세스 정리")
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            pid_file = Path(tmp) / "pid"
+            code = (
+                "import os, time\n"
+                f"open({str(pid_file)!r}, 'w').write(str(os.getpid()))\n"
+                "time.sleep(30)\n"
+            )
+            request_context = RequestContext()
+            asyncio.get_running_loop().call_later(0.5, request_context.cancel)
+            try:
+                await request_context.run(CodeExecutor().execute_python(code))
+                assert False, "취소되어야 합니다"
+            except RequestCancelled:
+                pass
+
+            pid = int(pid_file.read_text())
+            try:
+                os.kill(pid, 0)
+                alive = True
+            except ProcessLookupError:
+                alive = False
+            assert not alive, "서브프로세스가 종료되어야 합니다"
+
+    asyncio.run(run())
+    print("   ✅ 서브프로세스 정리 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "stream_cancel": test_stream_cancel(),
+        "deadline": test_deadline(),
+        "subprocess_cleanup": test_subprocess_cleanup(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
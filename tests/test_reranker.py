@@ -0,0 +1,130 @@
+"""크로스 인코더 재정렬 테스트
+
+가짜 모델로 점수 순 재정렬, (질의, 청크) 점수 캐시,
+지연 예산 초과 시 원래 순서 유지를 검증합니다.
+(sentence-transformers 없이 numpy와 rag/reranker.py만 사용)
+"""
+
+import importlib
+import sys
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.insert(0, str(ROOT))
+
+# rag/__init__.py는 chromadb를 import하므로 패키지 초기화 없이 하위 모듈만 로드
+rag = types.ModuleType("rag")
+rag.__path__ = [str(ROOT / "rag")]
+sys.modules.setdefault("rag", rag)
+reranker_module = importlib.import_module("rag.reranker")
+models = importlib.import_module("rag.models")
+
+
+class FakeCrossEncoder:
+    """본문 속 숫자를 점수로 쓰는 가짜 크로스 인코더"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.pairs = []
+
+    def predict(self, pairs, batch_size=16):
+        time.sleep(self.delay)
+        self.pairs.extend(pairs)
+        return [float(content.split()[-1]) for _, content in pairs]
+
+
+def make_reranker(name: str, model: FakeCrossEncoder, **options):
+    """가짜 모델을 공유 레지스트리에 등록한 Reranker"""
+    models.get_model_registry().get(f"rerank:{name}", lambda: model)
+    return reranker_module.Reranker(name, **options)
+
+
+def candidates(*scores):
+    return [{"id": f"c{i}", "content": f"chunk score {score}", "metadata": {}} for i, score in enumerate(scores)]
+
+
+# ========== Test 1: 재정렬 / 캐시 ==========
+def test_rerank_and_cache():
+    """점수 순으로 top_k를 고르고, 같은 질의는 캐시에서 점수를 꺼내는지 확인"""
+    print("\n📋 Test 1: 재정렬 / 캐시")
+
+    model = FakeCrossEncoder()
+    reranker = make_reranker("fake-order", model, batch_size=2, budget_ms=1000)
+    results = reranker.rerank("query", candidates(1, 5, 3, 4), top_k=2)
+    assert [r["id"] for r in results] == ["c1", "c3"]
+    assert results[0]["rerank_score"] == 5.0
+    assert len(model.pairs) == 4
+
+    again = reranker.rerank("query", candidates(1, 5, 3, 4), top_k=2)
+    assert [r["id"] for r in again] == ["c1", "c3"]
+    assert len(model.pairs) == 4, "캐시된 점수는 다시 계산하지 않음"
+
+    reranker.rerank("other query", candidates(1, 5), top_k=1)
+    assert len(model.pairs) == 6, "질의가 다르면 새로 계산"
+
+    stats = reranker.stats()
+    print(f"   {stats}")
+    assert stats["cache_hits"] == 4 and stats["pairs_scored"] == 6 and stats["reranked"] == 3
+
+    # 캐시 크기 제한
+    small = make_reranker("fake-small", FakeCrossEncoder(), cache_size=2)
+    small.rerank("query", candidates(1, 2, 3), top_k=3)
+    assert len(small._cache) == 2
+
+    print("   ✅ 재정렬 / 캐시 확인")
+    return True
+
+
+# ========== Test 2: 예산 초과 시 원래 순서 ==========
+def test_budget_fallback():
+    """배치가 예산을 넘기면 (첫 배치 포함) 검색 순서를 그대로 돌려주는지 확인"""
+    print("\n📋 Test 2: 예산 초과")
+
+    slow = make_reranker("fake-slow", FakeCrossEncoder(delay=0.05), batch_size=16, budget_ms=10)
+    results = slow.rerank("query", candidates(1, 5, 3), top_k=2)
+    assert [r["id"] for r in results] == ["c0", "c1"], "한 배치가 예산을 넘겨도 원래 순서"
+    assert "rerank_score" not in results[0]
+    assert slow.stats()["fallbacks"] == 1
+
+    # 넘긴 배치의 점수는 캐시되어 다음 요청은 예산 안에 끝남
+    results = slow.rerank("query", candidates(1, 5, 3), top_k=2)
+    assert [r["id"] for r in results] == ["c1", "c2"]
+
+    # 남은 배치가 있는데 예산이 끝나면 중단
+    model = FakeCrossEncoder(delay=0.02)
+    batched = make_reranker("fake-batched", model, batch_size=1, budget_ms=30)
+    results = batched.rerank("query", candidates(1, 5, 3, 4, 2), top_k=2)
+    assert [r["id"] for r in results] == ["c0", "c1"]
+    assert len(model.pairs) < 5, "예산이 끝나면 나머지 배치는 보내지 않음"
+
+    # 호출 시 예산 지정 (요청 마감 시간 반영)
+    results = make_reranker("fake-zero", FakeCrossEncoder()).rerank("query", candidates(1, 5), top_k=1, budget_ms=0)
+    assert results[0]["id"] == "c0"
+
+    print("   ✅ 예산 초과 확인")
+    return True
+
+
+# ========== 실행 ==========
+def main():
+    """모든 테스트 실행"""
+    results = {
+        "rerank_and_cache": test_rerank_and_cache(),
+        "budget_fallback": test_budget_fallback(),
+    }
+
+    print("\n" + "=" * 70)
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
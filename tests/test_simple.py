@@ -166,6 +166,29 @@ try:
         progress_bar = planner.format_progress_bar(plan, width=40)
         print(f"   {progress_bar}")
 
+        # 6. 병렬 실행: 느린 작업이 끝나기 전에 다른 작업의 후속 작업이 시작되어야 함
+        print("\n6. execute_plan() 슬라이딩 윈도우 테스트...")
+        plan = planner.create_plan(
+            "parallel_plan",
+            "병렬 작업",
+            [
+                {"id": "slow", "description": "느린 작업"},
+                {"id": "fast", "description": "빠른 작업"},
+                {"id": "after_fast", "description": "후속 작업", "dependencies": ["fast"]}
+            ]
+        )
+        finished = []
+
+        async def executor(task):
+            await asyncio.sleep(0.3 if task.id == "slow" else 0.01)
+            finished.append(task.id)
+            return task.id
+
+        result = await planner.execute_plan(plan, executor, concurrency=2)
+        print(f"   완료 순서: {finished}")
+        assert result["success"]
+        assert finished == ["fast", "after_fast", "slow"], finished
+
         print("\n✅ TODO 계획 시스템 테스트 완료!")
         return True
 
@@ -86,6 +86,12 @@ class CodeExecutor:
                     "status": "timeout",
                     "error": f"Execution timed out after {self.timeout} seconds",
                 }
+            except BaseException:
+                # Cancelled or aborted request: don't leave the process running
+                if process.returncode is None:
+                    process.kill()
+                    await asyncio.shield(process.wait())
+                raise
         except Exception as e:
             return {
                 "status": "error",
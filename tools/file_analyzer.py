@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import List, Dict, Optional
 import aiofiles
 from config import settings
+from utils.request_context import RequestContext, run_in_context
 
 
 class FileAnalyzer:
@@ -50,9 +51,13 @@ class FileAnalyzer:
         self,
         directory: Optional[str] = None,
         recursive: bool = True,
-        max_depth: int = 5
+        max_depth: int = 5,
+        request_context: Optional[RequestContext] = None
     ) -> List[Dict[str, str]]:
-        """Scan directory and return list of supported files."""
+        """Scan directory and return list of supported files.
+
+        With a ``request_context`` the scan stops at cancellation or the deadline.
+        """
         dir_path = Path(directory) if directory else self.project_path
 
         if not dir_path.exists() or not dir_path.is_dir():
@@ -69,6 +74,8 @@ class FileAnalyzer:
             """Recursively scan directory."""
             if depth > max_depth or should_ignore(current_path):
                 return
+            if request_context is not None:
+                request_context.check()
 
             try:
                 for item in current_path.iterdir():
@@ -142,15 +149,19 @@ class FileAnalyzer:
         self,
         pattern: str,
         directory: Optional[str] = None,
-        case_sensitive: bool = False
+        case_sensitive: bool = False,
+        request_context: Optional[RequestContext] = None
     ) -> List[Dict]:
-        """Search for pattern in files."""
-        files = await self.scan_directory(directory)
+        """Search for pattern in files.
+
+        With a ``request_context`` the search stops at cancellation or the deadline.
+        """
+        files = await self.scan_directory(directory, request_context=request_context)
         results = []
 
         for file_info in files[:settings.max_context_files]:
             try:
-                file_data = await self.read_file(file_info["path"])
+                file_data = await run_in_context(request_context, self.read_file(file_info["path"]))
                 content = file_data.get("content", "")
 
                 if file_data.get("is_binary"):
@@ -180,9 +191,13 @@ class FileAnalyzer:
 
         return results
 
-    async def analyze_codebase(self, directory: Optional[str] = None) -> Dict:
+    async def analyze_codebase(
+        self,
+        directory: Optional[str] = None,
+        request_context: Optional[RequestContext] = None
+    ) -> Dict:
         """Analyze codebase and return summary statistics."""
-        files = await self.scan_directory(directory)
+        files = await self.scan_directory(directory, request_context=request_context)
 
         stats = {
             "total_files": len(files),
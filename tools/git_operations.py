@@ -6,11 +6,30 @@ from typing import Dict, List, Optional
 from git import Repo, InvalidGitRepositoryError, GitCommandError
 
 
+COMMIT_MESSAGE_PROMPT = """Write a conventional commit message (type: summary) for these changes.
+Reply with the message only, one line, at most 72 characters.
+
+Files:
+{stat}
+
+Diff:
+{diff}"""
+
+# Diff characters sent when generating a commit message
+COMMIT_DIFF_CHARS = 6000
+
+
 class GitOperations:
     """Tools for Git version control operations."""
 
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", llm_manager=None):
+        """
+        Args:
+            repo_path: Path to the repository
+            llm_manager: Optional LLMManager used to write commit messages
+        """
         self.repo_path = Path(repo_path)
+        self.llm_manager = llm_manager
         self._repo = None
 
     @property
@@ -435,12 +454,23 @@ class GitOperations:
         """
         Generate a conventional commit message based on changes.
 
+        Uses the LLM (routed to a fast model tier) when an LLM manager is
+        set, and falls back to file-name heuristics otherwise or on failure.
+
         Args:
             status: Git status dictionary
 
         Returns:
             Generated commit message
         """
+        if self.llm_manager is not None:
+            try:
+                message = await self._generate_commit_message_llm(status)
+                if message:
+                    return message
+            except Exception:
+                pass
+
         # Analyze changed files
         all_files = (
             status.get("modified_files", []) +
@@ -475,6 +505,32 @@ class GitOperations:
 
         return f"{commit_type}: {file_desc}"
 
+    async def _generate_commit_message_llm(self, status: Dict) -> str:
+        """Ask the LLM for a one-line commit message."""
+        from llm import Message
+
+        repo = self.repo
+        # git diff runs a subprocess; keep it off the event loop
+        has_head = repo.head.is_valid()
+        stat = await asyncio.to_thread(repo.git.diff, "HEAD", "--stat") if has_head else ""
+        untracked = status.get("untracked_files", [])
+        if untracked:
+            stat += "\n" + "\n".join(f" {f} (new)" for f in untracked)
+        diff = await asyncio.to_thread(repo.git.diff, "HEAD") if has_head else ""
+
+        prompt = COMMIT_MESSAGE_PROMPT.format(
+            stat=stat.strip() or "(none)",
+            diff=diff[:COMMIT_DIFF_CHARS] or "(new files only)",
+        )
+        response = await self.llm_manager.generate(
+            [Message(role="user", content=prompt)],
+            temperature=0.0,
+            max_tokens=60,
+            task="commit_message",
+        )
+        lines = response.content.strip().strip("`").strip().splitlines()
+        return lines[0].strip() if lines else ""
+
 
 # Global instance
 git_ops = GitOperations()
@@ -5,6 +5,7 @@ from duckduckgo_search import AsyncDDGS
 import aiohttp
 from bs4 import BeautifulSoup
 from config import settings
+from utils.request_context import RequestContext, run_in_context
 
 
 class WebSearchTool:
@@ -14,7 +15,12 @@ class WebSearchTool:
         self.max_results = settings.max_search_results
         self.enabled = settings.enable_web_search
 
-    async def search(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, str]]:
+    async def search(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+        request_context: Optional[RequestContext] = None
+    ) -> List[Dict[str, str]]:
         """Search the web using DuckDuckGo."""
         if not self.enabled:
             return []
@@ -24,7 +30,9 @@ class WebSearchTool:
 
         try:
             async with AsyncDDGS() as ddgs:
-                search_results = await ddgs.text(query, max_results=max_results)
+                search_results = await run_in_context(
+                    request_context, ddgs.text(query, max_results=max_results)
+                )
 
                 for result in search_results:
                     results.append({
@@ -37,8 +45,20 @@ class WebSearchTool:
 
         return results
 
-    async def fetch_page_content(self, url: str, max_length: int = 10000) -> Dict[str, str]:
-        """Fetch and extract main content from a web page."""
+    async def fetch_page_content(
+        self,
+        url: str,
+        max_length: int = 10000,
+        request_context: Optional[RequestContext] = None
+    ) -> Dict[str, str]:
+        """Fetch and extract main content from a web page.
+
+        With a ``request_context`` the fetch is aborted (and its connection
+        closed) on cancellation or at the deadline.
+        """
+        return await run_in_context(request_context, self._fetch_page_content(url, max_length))
+
+    async def _fetch_page_content(self, url: str, max_length: int) -> Dict[str, str]:
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
@@ -77,7 +97,12 @@ class WebSearchTool:
         except Exception as e:
             return {"url": url, "error": str(e)}
 
-    async def search_documentation(self, query: str, doc_site: Optional[str] = None) -> List[Dict]:
+    async def search_documentation(
+        self,
+        query: str,
+        doc_site: Optional[str] = None,
+        request_context: Optional[RequestContext] = None
+    ) -> List[Dict]:
         """Search for documentation on specific sites or in general."""
         # Add documentation keywords to query
         doc_query = f"{query} documentation"
@@ -85,12 +110,12 @@ class WebSearchTool:
         if doc_site:
             doc_query = f"site:{doc_site} {query}"
 
-        results = await self.search(doc_query)
+        results = await self.search(doc_query, request_context=request_context)
 
         # Optionally fetch content from top results
         enhanced_results = []
         for result in results[:3]:  # Fetch content for top 3 results
-            content = await self.fetch_page_content(result["url"])
+            content = await self.fetch_page_content(result["url"], request_context=request_context)
             enhanced_results.append({
                 **result,
                 "content": content.get("content", ""),
@@ -0,0 +1,175 @@
+"""Context-window budgeting for prompt assembly."""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from config import settings
+from .tokenizer import Tokenizer, get_tokenizer
+
+
+# Context window sizes (tokens), matched by model name prefix
+MODEL_CONTEXT_WINDOWS = {
+    "claude-3": 200000,
+    "claude": 200000,
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "mixtral-8x7b-32768": 32768,
+    "meta-llama/Meta-Llama-3.1": 131072,
+    "llama-3.1": 131072,
+    "llama3": 8192,
+}
+
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Relative share of the remaining window per section
+DEFAULT_SECTION_WEIGHTS = {
+    "history": 3.0,
+    "relevant_files": 3.0,
+    "rag_context": 2.0,
+    "project_info": 1.0,
+    "web_results": 1.0,
+}
+
+
+def get_context_window(model: str) -> int:
+    """Get the context window for a model (longest matching prefix)."""
+    model_lower = (model or "").lower()
+    best = None
+    for prefix, window in MODEL_CONTEXT_WINDOWS.items():
+        if model_lower.startswith(prefix.lower()) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, window)
+    return best[1] if best else DEFAULT_CONTEXT_WINDOW
+
+
+@dataclass
+class BudgetPlan:
+    """Result of a budget allocation."""
+    sections: Dict[str, str]
+    history: list
+    allocations: Dict[str, int] = field(default_factory=dict)
+    used_tokens: Dict[str, int] = field(default_factory=dict)
+    available_tokens: int = 0
+    truncated: List[str] = field(default_factory=list)
+
+
+class ContextBudgeter:
+    """Allocate a model's context window across prompt segments.
+
+    The system prompt, the user's message and the reserved output tokens are
+    always kept. The rest of the window is shared between history and context
+    sections by weight; sections that need less than their share hand the
+    surplus to the others, and oversized ones are truncated.
+    """
+
+    def __init__(
+        self,
+        context_window: int,
+        reserved_output_tokens: int = 4096,
+        tokenizer: Optional[Tokenizer] = None,
+        weights: Optional[Dict[str, float]] = None,
+        safety_margin: float = 0.05,
+    ):
+        self.context_window = context_window
+        self.reserved_output_tokens = reserved_output_tokens
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.weights = weights or dict(DEFAULT_SECTION_WEIGHTS)
+        self.safety_margin = safety_margin
+
+    @classmethod
+    def for_provider(cls, provider: str, model: Optional[str] = None, **kwargs) -> "ContextBudgeter":
+        """Create a budgeter for a provider's configured (or given) model."""
+        model = model or settings.get_model_name(provider)
+        window = get_context_window(model)
+        if settings.max_context_tokens:
+            window = min(window, settings.max_context_tokens)
+        return cls(
+            context_window=window,
+            reserved_output_tokens=kwargs.pop("reserved_output_tokens", settings.reserved_output_tokens),
+            tokenizer=get_tokenizer(provider, model),
+            **kwargs
+        )
+
+    def count(self, text: str) -> int:
+        """Count tokens with this budgeter's tokenizer."""
+        return self.tokenizer.count(text)
+
+    def _distribute(self, demands: Dict[str, int], capacity: int) -> Dict[str, int]:
+        """Weighted water-filling: satisfy small demands, share the rest by weight."""
+        allocations = {name: 0 for name in demands}
+        pending = {name: demand for name, demand in demands.items() if demand > 0}
+
+        while pending and capacity > 0:
+            total_weight = sum(self.weights.get(name, 1.0) for name in pending)
+            shares = {
+                name: int(capacity * self.weights.get(name, 1.0) / total_weight)
+                for name in pending
+            }
+            satisfied = [name for name, demand in pending.items() if demand <= shares[name]]
+
+            if not satisfied:
+                for name in pending:
+                    allocations[name] = shares[name]
+                break
+
+            for name in satisfied:
+                allocations[name] = pending.pop(name)
+                capacity -= allocations[name]
+
+        return allocations
+
+    def _fit_history(self, history: Sequence, budget: int) -> list:
+        """Keep the most recent messages that fit in the budget."""
+        kept = []
+        used = 0
+        for message in reversed(history):
+            tokens = self.count(message.content) + 4
+            if used + tokens > budget:
+                break
+            kept.append(message)
+            used += tokens
+        return list(reversed(kept))
+
+    def allocate(
+        self,
+        fixed: Sequence[str],
+        sections: Dict[str, str],
+        history: Sequence = (),
+    ) -> BudgetPlan:
+        """Fit sections and history into the window left after fixed segments.
+
+        Args:
+            fixed: Segments that are always sent in full (system prompt, user message, templates)
+            sections: Named context sections that may be truncated
+            history: Conversation messages (oldest first); oldest are dropped first
+
+        Returns:
+            BudgetPlan with the (possibly truncated) sections and history
+        """
+        window = int(self.context_window * (1 - self.safety_margin))
+        fixed_tokens = sum(self.count(text) for text in fixed)
+        available = max(0, window - self.reserved_output_tokens - fixed_tokens)
+
+        demands = {name: self.count(text) for name, text in sections.items()}
+        demands["history"] = sum(self.count(m.content) + 4 for m in history)
+
+        allocations = self._distribute(demands, available)
+
+        plan = BudgetPlan(sections={}, history=[], allocations=allocations, available_tokens=available)
+        for name, text in sections.items():
+            if demands[name] > allocations[name]:
+                plan.sections[name] = self.tokenizer.truncate(text, allocations[name])
+                plan.truncated.append(name)
+            else:
+                plan.sections[name] = text
+            plan.used_tokens[name] = self.count(plan.sections[name])
+
+        plan.history = self._fit_history(history, allocations["history"])
+        if len(plan.history) < len(history):
+            plan.truncated.append("history")
+        plan.used_tokens["history"] = sum(self.count(m.content) + 4 for m in plan.history)
+
+        return plan
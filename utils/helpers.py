@@ -30,9 +30,10 @@ def truncate_text(text: str, max_length: int = 1000, suffix: str = "...") -> str
     return text[:max_length - len(suffix)] + suffix
 
 
-def count_tokens_estimate(text: str) -> int:
-    """Rough estimate of token count (4 chars ≈ 1 token)."""
-    return len(text) // 4
+def count_tokens_estimate(text: str, provider: str = "", model: str = "") -> int:
+    """Estimate token count using the provider/model tokenizer."""
+    from .tokenizer import count_tokens
+    return count_tokens(text, provider, model)
 
 
 def format_file_size(size_bytes: int) -> str:
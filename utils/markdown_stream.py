@@ -0,0 +1,98 @@
+"""Incremental parsing of streamed markdown responses."""
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$")
+FENCE = "```"
+
+
+@dataclass
+class CodeBlock:
+    """A fenced code block, emitted when its closing fence arrives."""
+    language: str
+    code: str
+    section: Optional[str] = None  # title of the enclosing heading section
+
+
+@dataclass
+class Section:
+    """A heading and its body, emitted when the next heading starts (or at the end)."""
+    title: str
+    content: str
+
+
+class MarkdownStreamParser:
+    """Turn streamed text chunks into code blocks and sections as they complete.
+
+    Text is processed a line at a time, so a fence or heading split across
+    chunks is handled. ``feed`` returns the events completed by a chunk;
+    ``close`` flushes the last section. A code block still open at the end
+    is not emitted, matching ``extract_code_blocks``.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._section_title: Optional[str] = None
+        self._section_lines: List[str] = []
+        self._code_language: Optional[str] = None  # set while inside a fence
+        self._code_lines: List[str] = []
+
+    def feed(self, chunk: str) -> List[Union[CodeBlock, Section]]:
+        """Add a chunk; returns the code blocks and sections it completed."""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split("\n")
+        events: List[Union[CodeBlock, Section]] = []
+        for line in lines:
+            self._process_line(line, events)
+        return events
+
+    def close(self) -> List[Union[CodeBlock, Section]]:
+        """Flush the remaining text at the end of the stream."""
+        events: List[Union[CodeBlock, Section]] = []
+        if self._buffer:
+            self._process_line(self._buffer, events)
+            self._buffer = ""
+        self._flush_section(events)
+        return events
+
+    def _process_line(self, line: str, events: List[Union[CodeBlock, Section]]) -> None:
+        if self._code_language is not None:
+            if FENCE in line:
+                before = line[:line.index(FENCE)]
+                if before.strip():
+                    self._code_lines.append(before)
+                self._section_lines.append(line)
+                events.append(CodeBlock(
+                    language=self._code_language or "text",
+                    code="\n".join(self._code_lines).strip(),
+                    section=self._section_title,
+                ))
+                self._code_language = None
+                self._code_lines = []
+            else:
+                self._code_lines.append(line)
+                self._section_lines.append(line)
+            return
+
+        stripped = line.strip()
+        if stripped.startswith(FENCE):
+            self._code_language = stripped[len(FENCE):].strip().split(" ")[0]
+            self._section_lines.append(line)
+            return
+
+        heading = HEADING_PATTERN.match(stripped)
+        if heading:
+            self._flush_section(events)
+            self._section_title = heading.group(1)
+            return
+
+        self._section_lines.append(line)
+
+    def _flush_section(self, events: List[Union[CodeBlock, Section]]) -> None:
+        if self._section_title is not None:
+            events.append(Section(self._section_title, "\n".join(self._section_lines).strip()))
+        self._section_title = None
+        self._section_lines = []
+
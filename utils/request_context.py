@@ -0,0 +1,148 @@
+"""Per-request deadline and cancellation token."""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestAborted(BaseException):
+    """The request was cancelled or ran past its deadline.
+
+    Derives from BaseException (like asyncio.CancelledError) so the broad
+    ``except Exception`` handlers in tools and agents do not swallow it.
+    """
+
+
+class RequestCancelled(RequestAborted):
+    """The request was cancelled (e.g. the user pressed stop)."""
+
+
+class DeadlineExceeded(RequestAborted):
+    """The request ran past its deadline."""
+
+
+class RequestContext:
+    """Deadline plus cancellation token, passed from the UI down every stage.
+
+    ``cancel()`` is thread-safe and may be called from a UI callback on
+    another thread. Synchronous loops call ``check()``; awaits run inside
+    ``scope()``, which interrupts the awaiting task as soon as the request
+    is cancelled or the deadline passes. Interrupted awaits unwind normally,
+    so streams, HTTP connections and subprocesses are released by their own
+    cleanup code.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: Seconds until the deadline (None or 0 = no deadline)
+        """
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason: Optional[str] = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the request; running scopes are interrupted."""
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a cancel callback; returns a function that unregisters it."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+        def remove() -> None:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+        return remove
+
+    def check(self) -> None:
+        """Raise if the request is cancelled or past its deadline."""
+        if self.reason is not None:
+            raise RequestCancelled(self.reason)
+        if self.expired:
+            raise DeadlineExceeded("Request deadline exceeded")
+
+    @asynccontextmanager
+    async def scope(self) -> AsyncIterator["RequestContext"]:
+        """Run the enclosed awaits until cancellation or the deadline.
+
+        Do not yield from an async generator inside a scope: the interrupt
+        targets the current task, which must be the one awaiting.
+        """
+        self.check()
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        state = {"active": True, "interrupted": False}
+
+        def interrupt() -> None:
+            if state["active"]:
+                state["interrupted"] = True
+                task.cancel()
+
+        remove = self.on_cancel(lambda: loop.call_soon_threadsafe(interrupt))
+        remaining = self.remaining()
+        try:
+            async with asyncio.timeout(remaining):
+                yield self
+        except TimeoutError:
+            if self.expired:
+                raise DeadlineExceeded("Request deadline exceeded") from None
+            raise
+        except asyncio.CancelledError:
+            if state["interrupted"] and task.uncancel() == 0:
+                raise RequestCancelled(self.reason) from None
+            raise
+        finally:
+            state["active"] = False
+            remove()
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """Await under this context."""
+        async with self.scope():
+            return await awaitable
+
+    async def iterate(self, source: AsyncGenerator[T, None]) -> AsyncGenerator[T, None]:
+        """Re-yield ``source``, aborting between or during chunks; closes ``source``."""
+        try:
+            while True:
+                async with self.scope():
+                    try:
+                        item = await source.__anext__()
+                    except StopAsyncIteration:
+                        return
+                yield item
+        finally:
+            await source.aclose()
+
+
+async def run_in_context(context: Optional[RequestContext], awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable`` under ``context`` when one is given."""
+    if context is None:
+        return await awaitable
+    return await context.run(awaitable)
@@ -74,7 +74,8 @@ class SessionManager:
         analyzed_files: Optional[List[str]] = None,
         settings: Optional[Dict[str, Any]] = None,
         history: Optional[List[Dict[str, Any]]] = None,
-        custom_data: Optional[Dict[str, Any]] = None
+        custom_data: Optional[Dict[str, Any]] = None,
+        summary: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         세션 데이터를 저장합니다.
@@ -83,8 +84,9 @@ class SessionManager:
             project_path: 프로젝트 경로
             analyzed_files: 분석된 파일 목록
             settings: 프로젝트 설정
-            history: 대화 히스토리
+            history: 대화 히스토리 (요약되지 않은 최근 대화)
             custom_data: 추가 데이터
+            summary: 이전 대화의 누적 요약
 
         Returns:
             저장 결과 딕셔너리
@@ -123,6 +125,7 @@ class SessionManager:
             history_file = cache_dir / "history.json"
             history_data = {
                 "history": history,
+                "summary": summary or "",
                 "count": len(history),
                 "saved_at": datetime.now().isoformat()
             }
@@ -179,8 +182,10 @@ class SessionManager:
                 content = await f.read()
                 history_data = json.loads(content)
                 session_data["history"] = history_data["history"]
+                session_data["summary"] = history_data.get("summary", "")
         else:
             session_data["history"] = []
+            session_data["summary"] = ""
 
         # RAG 인덱스 디렉토리 경로 추가
         rag_dir = cache_dir / "rag_index"
@@ -0,0 +1,209 @@
+"""Token counting per provider/model.
+
+``ApproxTokenizer`` is a fast local approximation tuned for code and mixed
+Korean/English text. When an exact tokenizer is available offline (tiktoken
+with cached encodings for OpenAI models), ``get_tokenizer`` uses it instead.
+"""
+import hashlib
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+# Words, short digit groups, CJK/Hangul characters, whitespace runs, symbol runs
+_PIECE_PATTERN = re.compile(
+    r"(?P<word>[A-Za-z]+)"
+    r"|(?P<digits>\d{1,3})"
+    r"|(?P<cjk>[\u1100-\u11ff\u3130-\u318f\uac00-\ud7af\u3040-\u30ff\u4e00-\u9fff])"
+    r"|(?P<space>\s+)"
+    r"|(?P<symbol>[^\sA-Za-z\d]+)"
+)
+
+# Letters per token for latin words, per model family (common words are one token)
+_FAMILY_CHARS_PER_TOKEN = {
+    "claude": 6.0,
+    "openai": 6.5,
+    "llama": 6.0,
+    "mixtral": 5.0,
+    "default": 6.0,
+}
+
+# Tokens per CJK/Hangul character, per model family
+_FAMILY_CJK_TOKENS = {
+    "claude": 1.1,
+    "openai": 1.2,
+    "llama": 1.5,
+    "mixtral": 1.6,
+    "default": 1.3,
+}
+
+
+def model_family(provider: str, model: str = "") -> str:
+    """Map a provider/model to a tokenizer family."""
+    model = (model or "").lower()
+    if provider == "claude" or "claude" in model:
+        return "claude"
+    if provider == "openai" or model.startswith(("gpt", "o1", "o3")):
+        return "openai"
+    if "mixtral" in model or "mistral" in model:
+        return "mixtral"
+    if "llama" in model:
+        return "llama"
+    return "default"
+
+
+class Tokenizer(ABC):
+    """Base class for token counters."""
+
+    name: str = "base"
+    exact: bool = False
+
+    def __init__(self, cache_size: int = 2048):
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._cache_size = cache_size
+
+    @abstractmethod
+    def _count(self, text: str) -> int:
+        """Count tokens without caching."""
+
+    def count(self, text: str) -> int:
+        """Count tokens, caching results for large repeated texts (prompts, files)."""
+        if not text:
+            return 0
+        if len(text) < 256:
+            return self._count(text)
+
+        key = hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        tokens = self._count(text)
+        self._cache[key] = tokens
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int, suffix: str = "\n... [truncated]") -> str:
+        """Cut text so that it (with suffix) fits in ``max_tokens``."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+
+        budget = max_tokens - self.count(suffix)
+        if budget <= 0:
+            return ""
+
+        # Binary search on the prefix length
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self._count(text[:mid]) <= budget:
+                low = mid
+            else:
+                high = mid - 1
+        return text[:low] + suffix
+
+
+class ApproxTokenizer(Tokenizer):
+    """Fast approximation that accounts for code symbols, indentation and CJK text."""
+
+    exact = False
+
+    def __init__(self, family: str = "default", cache_size: int = 2048):
+        super().__init__(cache_size)
+        self.family = family
+        self.name = f"approx:{family}"
+        self.chars_per_token = _FAMILY_CHARS_PER_TOKEN.get(family, _FAMILY_CHARS_PER_TOKEN["default"])
+        self.cjk_tokens = _FAMILY_CJK_TOKENS.get(family, _FAMILY_CJK_TOKENS["default"])
+
+    def _count(self, text: str) -> int:
+        tokens = 0.0
+        for match in _PIECE_PATTERN.finditer(text):
+            kind = match.lastgroup
+            piece = match.group()
+            if kind == "word":
+                tokens += math.ceil(len(piece) / self.chars_per_token)
+            elif kind == "digits":
+                tokens += 1
+            elif kind == "cjk":
+                tokens += self.cjk_tokens
+            elif kind == "space":
+                # A single space merges into the next word; newlines and
+                # indentation runs cost roughly one token each
+                if "\n" in piece:
+                    tokens += piece.count("\n") * 0.5 + 0.5
+                elif len(piece) > 1:
+                    tokens += math.ceil(len(piece) / 8)
+            else:
+                tokens += max(1, round(len(piece) * 0.6))
+        return int(math.ceil(tokens))
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact token counts for OpenAI models via tiktoken."""
+
+    exact = True
+
+    def __init__(self, encoding, cache_size: int = 2048):
+        super().__init__(cache_size)
+        self.encoding = encoding
+        self.name = f"tiktoken:{encoding.name}"
+
+    def _count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+def _load_tiktoken(model: str):
+    """Load a tiktoken encoding if tiktoken and its (cached) files are available."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    except Exception:
+        # Encoding files not cached and no network access
+        return None
+
+
+_tokenizers: Dict[Tuple[str, str, bool], Tokenizer] = {}
+
+
+def get_tokenizer(provider: str = "", model: str = "", exact: bool = True) -> Tokenizer:
+    """Get a (cached) tokenizer for a provider/model.
+
+    With ``exact=True`` an exact tokenizer is used when one can be loaded
+    offline; otherwise the family-tuned approximation is returned.
+    """
+    key = (provider, model, exact)
+    if key in _tokenizers:
+        return _tokenizers[key]
+
+    family = model_family(provider, model)
+    tokenizer: Optional[Tokenizer] = None
+
+    if exact and family == "openai":
+        encoding = _load_tiktoken(model)
+        if encoding is not None:
+            tokenizer = TiktokenTokenizer(encoding)
+
+    if tokenizer is None:
+        tokenizer = ApproxTokenizer(family)
+
+    _tokenizers[key] = tokenizer
+    return tokenizer
+
+
+def count_tokens(text: str, provider: str = "", model: str = "") -> int:
+    """Count tokens in text for a provider/model (approximate by default family)."""
+    return get_tokenizer(provider, model).count(text)